@@ -0,0 +1,10 @@
+"""
+constants.py
+------------
+Shared game-tree constants.
+
+  CHANCE  to_move of a chance node (deal or board card), distinct from
+          every seat index
+"""
+
+CHANCE = "CHANCE"
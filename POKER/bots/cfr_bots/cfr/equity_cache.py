@@ -0,0 +1,128 @@
+"""
+equity_cache.py
+---------------
+Bounded key -> value cache for equity / bucket results.
+
+  EquityCache(capacity=200_000, policy="lru")
+
+  policy "lru"   evict the least recently used entry
+  policy "lfu"   evict the least frequently used entry (ties: least recent)
+
+capacity=None keeps every entry (the old unbounded dict behaviour).
+Hit, miss and eviction counts are kept so callers can report cache
+effectiveness; stats() returns them with the current size.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict, defaultdict
+
+POLICIES = ("lru", "lfu")
+
+_MISSING = object()
+
+
+class EquityCache:
+
+    def __init__(self, capacity: int | None = 200_000, policy: str = "lru"):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown cache policy {policy!r}, choose from {POLICIES}")
+        if capacity is not None and capacity <= 0:
+            raise ValueError("capacity must be positive or None")
+
+        self.capacity = capacity
+        self.policy   = policy
+
+        self._data = OrderedDict()        # key -> value (recency order for LRU)
+        # LFU bookkeeping: key -> use count, count -> keys in recency order
+        self._counts  = {}
+        self._buckets = defaultdict(OrderedDict)
+        self._min_count = 0
+
+        self.hits      = 0
+        self.misses    = 0
+        self.evictions = 0
+
+    # ── Mapping interface ────────────────────────────────────────────────────
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        value = self._data.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._touch(key)
+        return value
+
+    def put(self, key, value) -> None:
+        if key in self._data:
+            self._data[key] = value
+            self._touch(key)
+            return
+
+        if self.capacity is not None and len(self._data) >= self.capacity:
+            self._evict()
+
+        self._data[key] = value
+        if self.policy == "lfu":
+            self._counts[key] = 1
+            self._buckets[1][key] = None
+            self._min_count = 1
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._counts.clear()
+        self._buckets.clear()
+        self._min_count = 0
+
+    # ── Statistics ───────────────────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size":      len(self._data),
+            "capacity":  self.capacity,
+            "policy":    self.policy,
+            "hits":      self.hits,
+            "misses":    self.misses,
+            "evictions": self.evictions,
+            "hit_rate":  self.hits / lookups if lookups else 0.0,
+        }
+
+    def reset_stats(self) -> None:
+        self.hits = self.misses = self.evictions = 0
+
+    # ── Eviction policy ──────────────────────────────────────────────────────
+
+    def _touch(self, key) -> None:
+        if self.policy == "lru":
+            self._data.move_to_end(key)
+            return
+
+        count = self._counts[key]
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+            if self._min_count == count:
+                self._min_count = count + 1
+        self._counts[key] = count + 1
+        self._buckets[count + 1][key] = None
+
+    def _evict(self) -> None:
+        if self.policy == "lru":
+            self._data.popitem(last=False)
+        else:
+            bucket = self._buckets[self._min_count]
+            key, _ = bucket.popitem(last=False)
+            if not bucket:
+                del self._buckets[self._min_count]
+            del self._counts[key]
+            del self._data[key]
+        self.evictions += 1
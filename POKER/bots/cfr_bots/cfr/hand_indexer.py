@@ -0,0 +1,211 @@
+"""
+hand_indexer.py
+---------------
+Perfect index of card sets under suit isomorphism.
+
+Two hands that differ only by a relabelling of suits (A♠K♠ on Q♠7♥2♦ vs
+A♥K♥ on Q♥7♣2♠) play identically, so they share one index.  Indices run
+densely over 0 .. size-1 with no gaps, which makes them usable directly as
+offsets into flat arrays (see postflop_bucket_table.py).
+
+Cards are integer codes (core.card_codes).  A hand is split into rounds
+whose order matters but whose card order within a round does not, e.g.
+
+  HandIndexer((2, 3))   hole cards + flop            1,286,792 classes
+  HandIndexer((2, 4))   hole cards + turn board     13,960,050 classes
+  HandIndexer((2, 5))   hole cards + river board   123,156,254 classes
+
+────────────────────────────────────────────────────────────────────────────────
+METHOD  (after Waugh, "A Fast and Optimal Hand Isomorphism Algorithm", 2013)
+────────────────────────────────────────────────────────────────────────────────
+  1. Per suit, the rank sets of each round give a configuration (cards per
+     round) and a suit index (combinatorial colex rank of those rank sets).
+  2. Suits are sorted by configuration; the sorted tuple of configurations
+     selects a block of indices with a precomputed offset.
+  3. Suits sharing a configuration are interchangeable, so their suit indices
+     form a multiset, ranked with combinations-with-repetition.
+  4. The block offset plus the mixed-radix combination of the group ranks is
+     the hand index.  unindex() reverses each step.
+"""
+
+from __future__ import annotations
+
+from itertools import product
+from math import comb
+
+N_RANKS = 13
+N_SUITS = 4
+
+# ── Colex ranking helpers ─────────────────────────────────────────────────────
+
+def _colex_rank(values) -> int:
+    """Rank of a strictly increasing sequence among all same-length subsets."""
+    return sum(comb(v, i + 1) for i, v in enumerate(values))
+
+def _colex_unrank(index: int, k: int) -> list:
+    """Inverse of _colex_rank for k elements."""
+    values = [0] * k
+    for i in range(k - 1, -1, -1):
+        v = i
+        while comb(v + 1, i + 1) <= index:
+            v += 1
+        values[i] = v
+        index -= comb(v, i + 1)
+    return values
+
+def _multiset_rank(values) -> int:
+    """Rank of a non-decreasing sequence among multisets of the same length."""
+    return _colex_rank([v + i for i, v in enumerate(sorted(values))])
+
+def _multiset_unrank(index: int, k: int) -> list:
+    return [v - i for i, v in enumerate(_colex_unrank(index, k))]
+
+def _multiset_size(n: int, k: int) -> int:
+    return comb(n + k - 1, k)
+
+
+class HandIndexer:
+
+    def __init__(self, rounds):
+        self.rounds   = tuple(rounds)
+        self.n_rounds = len(self.rounds)
+
+        # Every per-suit configuration: cards of that suit in each round
+        suit_configs = [
+            cfg for cfg in product(*(range(min(n, N_RANKS) + 1) for n in self.rounds))
+            if sum(cfg) <= N_RANKS
+        ]
+
+        # Every way to distribute the rounds over 4 suits, suits in descending
+        # configuration order so each isomorphism class has one key
+        self._blocks = []            # (offset, key, groups, block size)
+        self._offsets = {}
+        self._groups = {}
+        offset = 0
+        for key in product(suit_configs, repeat=N_SUITS):
+            if list(key) != sorted(key, reverse=True):
+                continue
+            if any(sum(cfg[r] for cfg in key) != self.rounds[r] for r in range(self.n_rounds)):
+                continue
+
+            groups = []              # (config, n_suits, suit index size)
+            for cfg in key:
+                if groups and groups[-1][0] == cfg:
+                    groups[-1][1] += 1
+                else:
+                    groups.append([cfg, 1, self._suit_size(cfg)])
+
+            size = 1
+            for cfg, k, n in groups:
+                size *= _multiset_size(n, k)
+
+            self._offsets[key] = offset
+            self._groups[key] = groups
+            self._blocks.append((offset, key, groups, size))
+            offset += size
+
+        self.size = offset
+
+    # ── Per-suit index ────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _suit_size(cfg) -> int:
+        size, used = 1, 0
+        for n in cfg:
+            size *= comb(N_RANKS - used, n)
+            used += n
+        return size
+
+    @staticmethod
+    def _suit_index(rank_masks) -> int:
+        """Index of one suit's per-round rank masks among its configuration."""
+        index, mult, used = 0, 1, 0
+        for mask in rank_masks:
+            # Rank positions among the ranks this suit has not used yet
+            positions, pos = [], 0
+            for r in range(N_RANKS):
+                if used >> r & 1:
+                    continue
+                if mask >> r & 1:
+                    positions.append(pos)
+                pos += 1
+            index += mult * _colex_rank(positions)
+            mult  *= comb(N_RANKS - used.bit_count(), len(positions))
+            used  |= mask
+        return index
+
+    @staticmethod
+    def _suit_unindex(index: int, cfg) -> list:
+        masks, used = [], 0
+        for n in cfg:
+            free  = [r for r in range(N_RANKS) if not used >> r & 1]
+            size  = comb(len(free), n)
+            local = index % size
+            index //= size
+            mask = 0
+            for pos in _colex_unrank(local, n):
+                mask |= 1 << free[pos]
+            masks.append(mask)
+            used |= mask
+        return masks
+
+    # ── Hand index ────────────────────────────────────────────────────────────
+
+    def index(self, rounds_cards) -> int:
+        """
+        Index of a hand given as one iterable of card codes per round,
+        e.g. indexer.index([hole_codes, board_codes]).
+        """
+        masks = [[0] * self.n_rounds for _ in range(N_SUITS)]
+        for r, cards in enumerate(rounds_cards):
+            for code in cards:
+                masks[code & 3][r] |= 1 << (code >> 2)
+
+        suits = []
+        for suit_masks in masks:
+            cfg = tuple(m.bit_count() for m in suit_masks)
+            suits.append((cfg, self._suit_index(suit_masks)))
+        suits.sort(reverse=True)
+
+        key   = tuple(cfg for cfg, _ in suits)
+        index = 0
+        mult  = 1
+        i     = 0
+        for cfg, k, n in self._groups[key]:
+            index += mult * _multiset_rank([s for _, s in suits[i:i + k]])
+            mult  *= _multiset_size(n, k)
+            i     += k
+        return self._offsets[key] + index
+
+    def unindex(self, index: int) -> list:
+        """Canonical representative of an index: one list of card codes per round."""
+        if not 0 <= index < self.size:
+            raise IndexError(f"hand index {index} out of range 0..{self.size - 1}")
+
+        # Blocks are stored in offset order
+        lo, hi = 0, len(self._blocks) - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self._blocks[mid][0] <= index:
+                lo = mid
+            else:
+                hi = mid - 1
+        offset, key, groups, _ = self._blocks[lo]
+        index -= offset
+
+        rounds_cards = [[] for _ in range(self.n_rounds)]
+        suit = 0
+        for cfg, k, n in groups:
+            size  = _multiset_size(n, k)
+            local = index % size
+            index //= size
+            for suit_index in _multiset_unrank(local, k):
+                for r, mask in enumerate(self._suit_unindex(suit_index, cfg)):
+                    for rank in range(N_RANKS):
+                        if mask >> rank & 1:
+                            rounds_cards[r].append(rank * 4 + suit)
+                suit += 1
+
+        for cards in rounds_cards:
+            cards.sort()
+        return rounds_cards
@@ -4,20 +4,34 @@ nlh_gamestate.py
 Full NLH GameState: preflop → flop → turn → river.
 
 Key design principles:
-  - Cards are identified by .id string (e.g. "SA", "H10") -- works for both
-    Card objects (core.card.Card) and (rank, suit) tuples
+  - Cards are integer codes 0-51 (core.card_codes) everywhere in the tree:
+    hole_cards, full_deck, pre_board and community_cards.  Deals from
+    PreflopAbstraction are already codes; engine Card objects are converted
+    once at the bot boundary, so no string work happens during traversal
   - full_deck is the canonical 52-card list; never mutated, never deepcopied
   - community_cards grow each street via _deal_next_street
   - action_history resets each street so _next_to_act works cleanly
-  - evaluation() uses river direct eval, flop/turn Monte Carlo, fold shortcut
+  - evaluation() uses river direct eval, exact turn/flop enumeration (cached),
+    Monte Carlo only for larger runout counts, fold shortcut
   - evaluation() returns a list of per-player payoffs [p0, p1, ...]
 """
 
 from __future__ import annotations
+from functools import lru_cache
+from itertools import combinations
+from math import comb
 from typing import List, Optional
 import random
 
+import numpy as np
+
+from core.bit_deck import BitDeck
+from core.evaluators import board_evaluator, evaluate
+from core.evaluators.batch import evaluate_batch, with_fixed
+
 from .constants import CHANCE
+from .equity_cache import EquityCache
+from .suit_isomorphism import canonicalize
 
 # ── Action constants ──────────────────────────────────────────────────────────
 
@@ -42,69 +56,112 @@ SEAT_NAMES       = {0:"UTG", 1:"UTG1", 2:"HJ", 3:"CO", 4:"BTN", 5:"SB", 6:"BB"}
 STREET_NAMES     = {0:"PRE", 1:"FLP", 2:"TRN", 3:"RVR"}
 CARDS_PER_STREET = {0: 3, 1: 1, 2: 1}   # cards dealt on transition
 
-RANK_MAP = {
-    'A':14,'K':13,'Q':12,'J':11,'T':10,'10':10,  # support both 'T' and '10'
-    '9':9,'8':8,'7':7,'6':6,'5':5,'4':4,'3':3,'2':2,
-}
-
-# ── Card identity helper ──────────────────────────────────────────────────────
-
-def _card_id(card) -> str:
+# ── Info set keys ─────────────────────────────────────────────────────────────
+#
+# Info sets are packed ints, not strings: CFR tables hash a small int and no
+# per-node string is formatted.  The low bits hold the node fields, the rest
+# the street's action history, 6 bits per action (oldest action highest):
+#
+#   bits 0-2   seat (7 = nobody to act)    bits 3-4  street
+#   bit  5     preflop layout
+#   preflop    bits 6-13 hand bucket, 14-15 action context, 16 IP, 17-18 depth
+#   postflop   bits 6-8 board bucket, 9-12 hand strength bucket
+#
+# The history code is extended by ActionHistory.push, so a child's key costs
+# one shift-or over its parent's.  Keys depend only on the node, never on
+# visit order, so saved CFR tables stay valid across runs.  describe_inf_set()
+# rebuilds the readable "UTG.3.PRE.VS_OPEN.OOP.DEPTH_MID.0R2_1C" form.
+
+_NO_SEAT      = 7
+_PREFLOP_BIT  = 1 << 5
+_HIST_SHIFT   = 19
+INF_SET_PRIVATE_MASK = 0xFF << 6
+_PF_CONTEXTS  = ("UNOPENED", "VS_OPEN", "VS_3BET")
+_POSITIONS    = ("OOP", "IP")
+_DEPTHS       = ("DEPTH_SHORT", "DEPTH_MID", "DEPTH_DEEP")
+_ACTION_INDEX = {a: i for i, a in enumerate(ALL_ACTIONS)}
+_ABBR_ACTION  = {abbr: a for a, abbr in _ACTION_ABBR.items()}
+_SEAT_INDEX   = {name: seat for seat, name in SEAT_NAMES.items()}
+_STREET_INDEX = {name: street for street, name in STREET_NAMES.items()}
+
+
+def _history_token(seat, action) -> int:
+    # Never 0, so histories of different lengths never share a code
+    return 1 + seat * len(ALL_ACTIONS) + _ACTION_INDEX[action]
+
+
+def _describe_history(code) -> str:
+    tokens = []
+    while code:
+        seat, a = divmod((code & 63) - 1, len(ALL_ACTIONS))
+        tokens.append(f"{seat}{_ACTION_ABBR[ALL_ACTIONS[a]]}")
+        code >>= 6
+    return "_".join(reversed(tokens))
+
+
+def inf_set_street(key) -> int:
+    """Street (0-3) of a packed info set key."""
+    return (key >> 3) & 3
+
+
+def describe_inf_set(key) -> str:
+    """Readable string form of a packed info set key (diagnostics / export only)."""
+    seat   = key & 7
+    sname  = "None" if seat == _NO_SEAT else SEAT_NAMES.get(seat, str(seat))
+    street = STREET_NAMES[inf_set_street(key)]
+    hist   = _describe_history(key >> _HIST_SHIFT)
+    if key & _PREFLOP_BIT:
+        hb    = (key >> 6) & 0xFF
+        pf    = _PF_CONTEXTS[(key >> 14) & 3]
+        pos   = _POSITIONS[(key >> 16) & 1]
+        depth = _DEPTHS[(key >> 17) & 3]
+        return f"{sname}.{hb}.{street}.{pf}.{pos}.{depth}.{hist}"
+    return f"{sname}.{street}.{(key >> 6) & 7}.{(key >> 9) & 15}.{hist}"
+
+
+def inf_set_private_bits(street, bucket, hole_cards, community) -> int:
     """
-    Unique string ID for a card.  Works for:
-      - core.card.Card objects  (has .id attribute)
-      - (rank, suit) tuples     e.g. ('A', 'SPADES')
+    The deal-dependent fields of a packed info set key: the preflop hand
+    bucket, or the postflop board and hand strength buckets.  Everything
+    else in a key follows from the betting, so
+    key & ~INF_SET_PRIVATE_MASK | inf_set_private_bits(...) is the same
+    node's key under another deal (best_response walks deals that way).
     """
-    if hasattr(card, 'id'):
-        return card.id
-    rank, suit = card[0], card[1]
-    return f"{suit[0]}{rank}"          # e.g. 'SA' for ('A','SPADES')
-
-def _card_val(card) -> tuple:
-    """(int_rank, suit_str) -- works for Card objects and tuples."""
-    if hasattr(card, 'value'):
-        return (RANK_MAP.get(card.value, 0), card.suit)
-    return (RANK_MAP.get(card[0], 0), card[1])
+    if street == 0:
+        return bucket << 6
+    hsb = _hand_strength_bucket(hole_cards, community)
+    return _board_bucket(community) << 6 | hsb << 9
+
+
+def inf_set_key_from_str(inf_set) -> int:
+    """Inverse of describe_inf_set, for CFR tables saved with string keys."""
+    parts = inf_set.split(".")
+    seat  = _SEAT_INDEX.get(parts[0], _NO_SEAT)
+    code  = 0
+    for token in filter(None, parts[-1].split("_")):
+        code = (code << 6) | _history_token(int(token[0]), _ABBR_ACTION[token[1:]])
+    key = code << _HIST_SHIFT | seat
+    if len(parts) == 7:
+        _, hb, street, pf, pos, depth, _ = parts
+        return (key | _STREET_INDEX[street] << 3 | _PREFLOP_BIT | int(hb) << 6
+                | _PF_CONTEXTS.index(pf) << 14 | _POSITIONS.index(pos) << 16
+                | _DEPTHS.index(depth) << 17)
+    _, street, bb, hsb, _ = parts
+    return key | _STREET_INDEX[street] << 3 | int(bb) << 6 | int(hsb) << 9
+
+# ── Hand evaluation ───────────────────────────────────────────────────────────
+
+def _eval7(cards) -> int:
+    """
+    Strength of the best hand in 5-7 cards (higher = better), scored by the
+    shared core.evaluators backend.
+    """
+    return evaluate(cards)
 
-# ── Standalone hand evaluator ─────────────────────────────────────────────────
-
-def _eval5(cards) -> tuple:
-    from collections import Counter
-    vals   = sorted([_card_val(c)[0] for c in cards], reverse=True)
-    suits  = [_card_val(c)[1] for c in cards]
-    vc     = Counter(vals)
-    groups = sorted(vc.items(), key=lambda x: (-x[1], -x[0]))
-
-    flush    = len(set(suits)) == 1
-    uvals    = sorted(set(vals), reverse=True)
-    straight = False
-    s_high   = 0
-    for i in range(len(uvals) - 4):
-        if uvals[i] - uvals[i+4] == 4:
-            straight = True; s_high = uvals[i]; break
-    if not straight and {14,2,3,4,5}.issubset(set(vals)):
-        straight = True; s_high = 5
-
-    if straight and flush:                  return (9, s_high)
-    if groups[0][1] == 4:                   return (8, groups[0][0], groups[1][0])
-    if groups[0][1]==3 and groups[1][1]==2: return (7, groups[0][0], groups[1][0])
-    if flush:                               return (6,) + tuple(vals)
-    if straight:                            return (5, s_high)
-    if groups[0][1] == 3:                   return (4, groups[0][0]) + tuple(v for v,_ in groups[1:])
-    if groups[0][1]==2 and groups[1][1]==2:
-        hi = max(groups[0][0], groups[1][0])
-        lo = min(groups[0][0], groups[1][0])
-        return (3, hi, lo, groups[2][0])
-    if groups[0][1] == 2:                   return (2, groups[0][0]) + tuple(v for v,_ in groups[1:])
-    return (1,) + tuple(vals)
-
-def _eval7(cards) -> tuple:
-    from itertools import combinations
-    best = None
-    for combo in combinations(cards, 5):
-        v = _eval5(combo)
-        if best is None or v > best: best = v
-    return best
+@lru_cache(maxsize=4096)
+def _board_scorer(board_key):
+    """Shared-board evaluator, reused by every terminal state on that board."""
+    return board_evaluator(board_key)
 
 # ── Equity functions ──────────────────────────────────────────────────────────
 
@@ -116,13 +173,37 @@ def _river_equity(p0_cards, p1_cards, community) -> float:
     if v0 == v1: return 0.5
     return 0.0
 
-def _mc_equity(p0_cards, p1_cards, community, full_deck, pre_board=None, n=5000) -> float:
+# Enumerate every runout instead of sampling when there are at most this many.
+# Covers the turn (44-45 runouts) and a heads-up flop (C(45,2) = 990).
+EXACT_RUNOUT_LIMIT = 1000
+
+@lru_cache(maxsize=65536)
+def _exact_equity(p0_key, p1_key, board_key) -> float:
+    """
+    Exact P0 equity over every runout from the rest of the 52-card deck, all
+    scored in one batch.  Arguments are the suit-canonical code tuples from
+    canonicalize(), so every suit relabelling of a spot shares one entry.
+    """
+    needed  = 5 - len(board_key)
+    runouts = np.array(list(combinations(BitDeck.without(p0_key, p1_key, board_key), needed)),
+                       dtype=np.int64)
+    boards  = with_fixed(board_key, runouts)
+    v0      = evaluate_batch(with_fixed(p0_key, boards))
+    v1      = evaluate_batch(with_fixed(p1_key, boards))
+    wins    = (v0 > v1).sum() + 0.5 * (v0 == v1).sum()
+    return float(wins) / len(runouts)
+
+def _mc_equity(p0_cards, p1_cards, community, pre_board=None, n=5000) -> float:
     """
     Equity for flop/turn showdown.
 
     If pre_board is provided (fixed 5-card runout), use it directly --
     no simulation needed, result is deterministic and fast.
 
+    If the remaining runouts number at most EXACT_RUNOUT_LIMIT, enumerate
+    them all -- exact, deterministic and cached per suit-canonical
+    (hole cards, board).
+
     Otherwise, Monte Carlo over remaining unknown cards.
     """
     needed = 5 - len(community)
@@ -134,25 +215,24 @@ def _mc_equity(p0_cards, p1_cards, community, full_deck, pre_board=None, n=5000)
         full_board = list(pre_board[:5])
         return _river_equity(p0_cards, p1_cards, full_board)
 
-    # Slow path: Monte Carlo over remaining deck
-    used = set()
-    for c in list(p0_cards) + list(p1_cards) + list(community):
-        used.add(_card_id(c))
-
-    remaining = [c for c in full_deck if _card_id(c) not in used]
-    if needed > len(remaining):
+    # Cards still unseen: the 52 codes with the dead ones masked out
+    remaining = BitDeck.without(p0_cards, p1_cards, community)
+    n_remaining = len(remaining)
+    if needed > n_remaining:
         raise ValueError(
-            f"MC equity: need {needed} cards but only {len(remaining)} available"
+            f"MC equity: need {needed} cards but only {n_remaining} available"
         )
 
-    wins = 0.0
-    for _ in range(n):
-        board = list(community) + random.sample(remaining, needed)
-        v0    = _eval7(list(p0_cards) + board)
-        v1    = _eval7(list(p1_cards) + board)
-        if v0 > v1:  wins += 1.0
-        elif v0==v1: wins += 0.5
-    return wins / n
+    # Exact path: few enough runouts to score them all
+    if comb(n_remaining, needed) <= EXACT_RUNOUT_LIMIT:
+        return _exact_equity(*canonicalize([p0_cards, p1_cards, community]))
+
+    # Slow path: Monte Carlo over remaining deck, all runouts scored in one batch
+    boards = with_fixed(community, remaining.sample_batch(n, needed))
+    v0     = evaluate_batch(with_fixed(p0_cards, boards))
+    v1     = evaluate_batch(with_fixed(p1_cards, boards))
+    wins   = (v0 > v1).sum() + 0.5 * (v0 == v1).sum()
+    return float(wins) / n
 
 # ── Preflop Abstraction Helper ──────────────────────────────────────────────────────
 
@@ -171,9 +251,14 @@ def _preflop_action_context(state) -> str:
 
 def _board_bucket(community) -> int:
     if not community: return 7
+    # Texture ignores suit identity, so suit relabellings share one cache entry
+    return _board_bucket_canonical(canonicalize([community])[0])
+
+@lru_cache(maxsize=65536)
+def _board_bucket_canonical(board) -> int:
     from collections import Counter
-    vals  = [_card_val(c)[0] for c in community]
-    suits = [_card_val(c)[1] for c in community]
+    vals  = [(c >> 2) + 2 for c in board]
+    suits = [c & 3 for c in board]
     vc, sc = Counter(vals), Counter(suits)
 
     if max(vc.values()) >= 2: return 0   # paired
@@ -189,13 +274,15 @@ def _board_bucket(community) -> int:
     return 6
 
 
-def _hand_strength_bucket(hole_cards, community, full_deck) -> int:
+def _hand_strength_bucket(hole_cards, community) -> int:
     """
     Postflop hand strength bucket (0=strongest, 11=weakest).
 
-    Uses postflop_equity_bucket() from preflop_abstraction — MC equity
-    vs a random opponent, result is cached by (hole_key, board_key) so
-    each unique (hand, board) pair is only computed once per training run.
+    Reads the precomputed memory-mapped table from postflop_bucket_table
+    when that street's file exists (O(1), shared by every process).
+    Otherwise uses postflop_equity_bucket() from preflop_abstraction — MC
+    equity vs a random opponent, result is cached by (hole_key, board_key)
+    so each unique (hand, board) pair is only computed once per training run.
 
     Returns 6 (neutral mid-bucket) when hole_cards or community are absent
     so the infoset key degrades gracefully on preflop nodes (where this is
@@ -204,8 +291,13 @@ def _hand_strength_bucket(hole_cards, community, full_deck) -> int:
     if not hole_cards or not community:
         return 6
     try:
+        from .postflop_bucket_table import lookup_bucket
+        bucket = lookup_bucket(hole_cards, community)
+        if bucket is not None:
+            return bucket
+
         from .preflop_abstraction import postflop_equity_bucket
-        return postflop_equity_bucket(hole_cards, community, full_deck)
+        return postflop_equity_bucket(hole_cards, community)
     except Exception:
         return 6
 
@@ -231,20 +323,171 @@ def _effective_stack_bucket(state, seat: int) -> str:
     else:
         return "DEPTH_DEEP"
 
+# ── Compact node state ────────────────────────────────────────────────────────
+#
+# A 6-max tree holds millions of nodes, so per-node state is kept small:
+#   - per-deal constants live once in a shared DealContext
+#   - stacks / bets are tuples, folded seats a SeatMask bit set
+#   - action_history is a persistent linked list; each child adds one node
+#     to its parent's history instead of copying the whole list
+#   - every class uses __slots__ (no per-instance __dict__)
+
+class DealContext:
+    """Per-deal constants shared by every node in one deal's subtree."""
+
+    __slots__ = ('hands', 'hole_cards', 'full_deck', 'pre_board',
+                 'equity_p0', 'wallet', 'buyin', 'n_players')
+
+    def __init__(self, hands, hole_cards, full_deck, pre_board, equity_p0,
+                 wallet, buyin, n_players):
+        self.hands      = hands
+        self.hole_cards = hole_cards
+        self.full_deck  = full_deck
+        self.pre_board  = pre_board
+        self.equity_p0  = equity_p0
+        self.wallet     = wallet
+        self.buyin      = buyin
+        self.n_players  = n_players
+
+
+class SeatMask(int):
+    """
+    Immutable set of seat indices packed into an int (bit i = seat i).
+    Supports the set operations the tree and encoder use: `in`, len(),
+    iteration and truthiness.  with_seat() returns a new mask.
+    """
+
+    __slots__ = ()
+
+    def __contains__(self, seat):
+        return (self >> seat) & 1 == 1
+
+    def __len__(self):
+        return self.bit_count()
+
+    def __iter__(self):
+        mask, seat = int(self), 0
+        while mask:
+            if mask & 1:
+                yield seat
+            mask >>= 1
+            seat += 1
+
+    def with_seat(self, seat):
+        return SeatMask(self | (1 << seat))
+
+    def __repr__(self):
+        return "{" + ", ".join(str(seat) for seat in self) + "}"
+
+    @classmethod
+    def of(cls, seats):
+        mask = 0
+        for seat in seats:
+            mask |= 1 << seat
+        return cls(mask)
+
+NO_SEATS = SeatMask(0)
+
+
+class ActionHistory:
+    """
+    Persistent (seat, action) list for one street.  push() returns a new
+    history sharing this one as its tail, so a child costs one node, not a
+    copy.  Iterates oldest first, like the list it replaces.
+
+      seats  bitmask of seats that have acted (for _next_to_act)
+      code   the packed history used in info set keys (6 bits per action)
+    """
+
+    __slots__ = ('seat', 'action', 'prev', 'length', 'seats', 'code')
+
+    def __init__(self, seat=None, action=None, prev=None):
+        self.seat   = seat
+        self.action = action
+        self.prev   = prev
+        if prev is None:
+            self.length, self.seats, self.code = 0, 0, 0
+        else:
+            self.length = prev.length + 1
+            self.seats  = prev.seats | (1 << seat)
+            self.code   = (prev.code << 6) | _history_token(seat, action)
+
+    def push(self, seat, action):
+        return ActionHistory(seat, action, self)
+
+    def __len__(self):
+        return self.length
+
+    def __reversed__(self):
+        node = self
+        while node.length:
+            yield (node.seat, node.action)
+            node = node.prev
+
+    def __iter__(self):
+        return iter(list(reversed(self))[::-1])
+
+    def __getitem__(self, i):
+        return list(self)[i]
+
+    def __repr__(self):
+        return f"ActionHistory({list(self)})"
+
+    @classmethod
+    def of(cls, entries):
+        history = EMPTY_HISTORY
+        for seat, action in entries:
+            history = history.push(seat, action)
+        return history
+
+EMPTY_HISTORY = ActionHistory()
+
+
+class _DealFields:
+    """Read-only access to the shared DealContext under the old attribute names."""
+
+    __slots__ = ()
+
+    hands      = property(lambda self: self.ctx.hands)
+    hole_cards = property(lambda self: self.ctx.hole_cards)
+    full_deck  = property(lambda self: self.ctx.full_deck)
+    pre_board  = property(lambda self: self.ctx.pre_board)
+    equity_p0  = property(lambda self: self.ctx.equity_p0)
+    wallet     = property(lambda self: self.ctx.wallet)
+    buyin      = property(lambda self: self.ctx.buyin)
+    n_players  = property(lambda self: self.ctx.n_players)
+
 # ── Chance node ───────────────────────────────────────────────────────────────
 
+TREE_CACHE_POLICIES = ("all", "iteration", "lru", "none")
+
 class NLHChanceNode:
     """
     Root chance node. Each child is an NLHGameState for one deal.
 
     Each deal dict must have:
       'buckets'   : tuple of int bucket IDs per player
-      'hole_cards': tuple of (card, card) per player
-      'full_deck' : list of all 52 card objects (never mutated)
+      'hole_cards': tuple of (code, code) per player
+      'full_deck' : list of all 52 card codes (never mutated)
+      'board'     : optional pre-dealt 5-card runout, as codes
       'equity_p0' : float (precomputed preflop equity, optional)
+
+    tree_cache decides how long deal subtrees (and every child memoized
+    below them) stay reachable:
+      "all"        keep every deal ever played (unbounded)
+      "iteration"  keep them until new_iteration() is called
+      "lru"        keep the max_cached_deals most recently played deals
+      "none"       rebuild the deal root on every play(); each subtree
+                   lives only as long as the caller holds it
     """
 
-    def __init__(self, hand_deals, wallet, buyin, n_players=6):
+    def __init__(self, hand_deals, wallet, buyin, n_players=6,
+                 tree_cache="all", max_cached_deals=None):
+        if tree_cache not in TREE_CACHE_POLICIES:
+            raise ValueError(f"Unknown tree cache policy {tree_cache!r}, choose from {TREE_CACHE_POLICIES}")
+        if tree_cache == "lru" and not max_cached_deals:
+            raise ValueError("tree_cache='lru' needs a positive max_cached_deals")
+
         self.to_move      = CHANCE
         self.parent       = None
         self.actions      = list(range(len(hand_deals)))
@@ -252,7 +495,10 @@ class NLHChanceNode:
         self.wallet       = wallet
         self.buyin        = buyin
         self.n_players    = n_players
-        self.children     = {}
+        self.tree_cache   = tree_cache
+        self.children     = EquityCache(
+            capacity=max_cached_deals if tree_cache == "lru" else None, policy="lru",
+        )
         self._chance_prob = 1.0 / len(self.actions)
 
     def is_terminal(self): return False
@@ -261,68 +507,75 @@ class NLHChanceNode:
     def inf_set(self):     return "."
 
     def play(self, action):
-        if action not in self.children:
-            deal = self.hand_deals[action]
-            if not isinstance(deal, dict):
-                raise ValueError("hand_deals must contain dicts with 'buckets', 'hole_cards', 'full_deck'")
-
-            full_deck = deal.get('full_deck')
-            if full_deck is None or len(full_deck) != 52:
-                raise RuntimeError(
-                    f"Deal {action}: full_deck must be 52 cards, got "
-                    f"{0 if full_deck is None else len(full_deck)}"
-                )
-
-            self.children[action] = NLHGameState(
-                parent     = self,
-                hands      = deal['buckets'],
-                hole_cards = deal['hole_cards'],
-                full_deck  = full_deck,
-                pre_board  = deal.get('board'),
-                equity_p0  = deal.get('equity_p0', 0.5),
-                wallet     = self.wallet,
-                buyin      = self.buyin,
-                n_players  = self.n_players,
-                street     = 0,
+        state = self.children.get(action)
+        if state is None:
+            state = self._deal_root(action)
+            if self.tree_cache != "none":
+                self.children.put(action, state)
+        return state
+
+    def _deal_root(self, action):
+        deal = self.hand_deals[action]
+        if not isinstance(deal, dict):
+            raise ValueError("hand_deals must contain dicts with 'buckets', 'hole_cards', 'full_deck'")
+
+        full_deck = deal.get('full_deck')
+        if full_deck is None or len(full_deck) != 52:
+            raise RuntimeError(
+                f"Deal {action}: full_deck must be 52 cards, got "
+                f"{0 if full_deck is None else len(full_deck)}"
             )
-        return self.children[action]
+
+        return NLHGameState(
+            parent     = self,
+            hands      = deal['buckets'],
+            hole_cards = deal['hole_cards'],
+            full_deck  = full_deck,
+            pre_board  = deal.get('board'),
+            equity_p0  = deal.get('equity_p0', 0.5),
+            wallet     = self.wallet,
+            buyin      = self.buyin,
+            n_players  = self.n_players,
+            street     = 0,
+        )
 
     def sample_one(self):
         return self.play(random.choice(self.actions))
 
+    def new_iteration(self):
+        """Drop cached deal subtrees under the "iteration" policy (no-op otherwise)."""
+        if self.tree_cache == "iteration":
+            self.children.clear()
+
+    def cache_stats(self) -> dict:
+        """Cached deal count and hit/eviction counters (see EquityCache.stats)."""
+        return self.children.stats()
+
 
 # ── Street chance node ────────────────────────────────────────────────────────
 
-class StreetChanceNode:
+class StreetChanceNode(_DealFields):
     """
     Chance node for community card deals at street transitions.
     Uses pre_board for deterministic CFR, or random sample as fallback.
     """
 
+    __slots__ = ('ctx', 'next_street', 'community_cards', 'stacks', 'pot',
+                 'folded', 'last_raise_size', 'all_in_runout', '_cache')
+
     CARDS_PER_STREET = {0: 3, 1: 1, 2: 1}
+    to_move = CHANCE
+    actions = []
 
-    def __init__(self, parent, next_street, hands, hole_cards, full_deck,
-                 pre_board, equity_p0, wallet, buyin, n_players,
-                 community_cards, stacks, pot, folded, last_raise_size, 
-                 current_bet, n_raises, all_in_runout=False):
-        self.to_move         = CHANCE
-        self.parent          = parent
+    def __init__(self, ctx, next_street, community_cards, stacks, pot, folded,
+                 last_raise_size, all_in_runout=False):
+        self.ctx             = ctx
         self.next_street     = next_street
-        self.hands           = hands
-        self.hole_cards      = hole_cards
-        self.full_deck       = full_deck
-        self.pre_board       = pre_board
-        self.equity_p0       = equity_p0
-        self.wallet          = wallet
-        self.buyin           = buyin
-        self.n_players       = n_players
         self.community_cards = community_cards
         self.stacks          = stacks
         self.pot             = pot
         self.folded          = folded
         self.last_raise_size = last_raise_size
-        self.current_bet     = current_bet
-        self.n_raises        = n_raises
         self.all_in_runout   = all_in_runout
         self._cache          = {}
 
@@ -330,72 +583,48 @@ class StreetChanceNode:
     def is_chance(self):    return True
     def chance_prob(self):  return 1.0
     def inf_set(self):      return "."
-    actions = []
 
     def sample_one(self):
-        n = self.CARDS_PER_STREET[self.next_street - 1]
+        ctx = self.ctx
+        n   = self.CARDS_PER_STREET[self.next_street - 1]
 
-        if self.pre_board is not None:
+        if ctx.pre_board is not None:
             start = len(self.community_cards)
-            drawn = self.pre_board[start: start + n]
+            drawn = list(ctx.pre_board[start: start + n])
         else:
-            used = set()
-            for hc in self.hole_cards:
-                for c in hc: used.add(_card_id(c))
-            for c in self.community_cards:
-                used.add(_card_id(c))
-            available = [c for c in self.full_deck if _card_id(c) not in used]
-            drawn = random.sample(available, n)
+            drawn = BitDeck.without(self.community_cards, *ctx.hole_cards).sample(n)
 
-        new_community = list(self.community_cards) + drawn
-        board_key     = tuple(_card_id(c) for c in drawn)
+        new_community = tuple(self.community_cards) + tuple(drawn)
+        # Runouts that differ only by suits no hole card or board card
+        # distinguishes lead to identical subtrees, so they share one child
+        board_key     = canonicalize(list(ctx.hole_cards) + [self.community_cards, drawn])
 
         if board_key not in self._cache:
+            no_bets = (0.0,) * ctx.n_players
             if self.all_in_runout:
                 if self.next_street >= 3 and len(new_community) >= 5:
-                    result = NLHGameState(
-                        parent=self, hands=self.hands, hole_cards=self.hole_cards,
-                        full_deck=self.full_deck, pre_board=self.pre_board,
-                        equity_p0=self.equity_p0, wallet=self.wallet,
-                        buyin=self.buyin, n_players=self.n_players,
-                        street=3, community_cards=new_community,
-                        stacks=list(self.stacks), pot=self.pot,
-                        bets=[0.0]*self.n_players, folded=set(self.folded),
-                        action_history=[], current_bet=0.0, last_raise_size=0.0, n_raises=0,
-                        to_move=None,
+                    result = NLHGameState._node(
+                        ctx, 3, new_community, self.stacks, self.pot, no_bets,
+                        self.folded, EMPTY_HISTORY, 0.0, 0.0, 0, None,
                     )
                 else:
                     result = StreetChanceNode(
-                        parent=self, next_street=self.next_street + 1,
-                        hands=self.hands, hole_cards=self.hole_cards,
-                        full_deck=self.full_deck, pre_board=self.pre_board,
-                        equity_p0=self.equity_p0, wallet=self.wallet,
-                        buyin=self.buyin, n_players=self.n_players,
-                        community_cards=new_community,
-                        stacks=list(self.stacks), pot=self.pot,
-                        folded=set(self.folded), current_bet=0.0,
-                        last_raise_size=self.last_raise_size, n_raises=0,
+                        ctx, self.next_street + 1, new_community, self.stacks,
+                        self.pot, self.folded, self.last_raise_size,
                         all_in_runout=True,
                     )
             else:
-                sb_seat = self.n_players - 2
+                sb_seat = ctx.n_players - 2
                 first   = None
-                for offset in range(self.n_players):
-                    c = (sb_seat + offset) % self.n_players
+                for offset in range(ctx.n_players):
+                    c = (sb_seat + offset) % ctx.n_players
                     if c not in self.folded and self.stacks[c] > 0:
                         first = c
                         break
 
-                result = NLHGameState(
-                    parent=self, hands=self.hands, hole_cards=self.hole_cards,
-                    full_deck=self.full_deck, pre_board=self.pre_board,
-                    equity_p0=self.equity_p0, wallet=self.wallet,
-                    buyin=self.buyin, n_players=self.n_players,
-                    street=self.next_street, community_cards=new_community,
-                    stacks=list(self.stacks), pot=self.pot,
-                    bets=[0.0]*self.n_players, folded=set(self.folded),
-                    action_history=[], current_bet=0.0, last_raise_size=self.buyin, n_raises=0,
-                    to_move=first,
+                result = NLHGameState._node(
+                    ctx, self.next_street, new_community, self.stacks, self.pot,
+                    no_bets, self.folded, EMPTY_HISTORY, 0.0, ctx.buyin, 0, first,
                 )
 
             self._cache[board_key] = result
@@ -403,19 +632,108 @@ class StreetChanceNode:
         return self._cache[board_key]
 
 
+# ── Betting ───────────────────────────────────────────────────────────────────
+
+def _apply_bet(action, seat, stacks, bets, pot, cb, lr, raises, buyin):
+    """
+    Chip movement for one non-fold action.  Updates stacks and bets (lists)
+    in place and returns the new (pot, current_bet, last_raise_size, n_raises).
+    Shared by the immutable tree and the in-place engine so both follow
+    the same betting rules.
+    """
+    if action == CHECK:
+        # Explicit no-op pass action when not facing a bet
+        pass
+
+    elif action == CALL:
+        owed = max(cb - bets[seat], 0.0)
+        paid = min(owed, stacks[seat])
+        stacks[seat] -= paid
+        bets[seat]   += paid
+        pot          += paid
+
+    elif action in (RAISE_2, RAISE_4):
+        min_raise_size = max(lr, buyin)
+        min_raise_to   = cb + min_raise_size
+
+        if action == RAISE_2:
+            # Smallest legal raise
+            target = min_raise_to
+        else:
+            # Larger raise tier
+            target = cb + 3 * min_raise_size
+
+        target = min(target, bets[seat] + stacks[seat])
+
+
+        # If player cannot make a full legal raise, treat as a call/all-in-call.
+        if target < min_raise_to:
+            owed = max(cb - bets[seat], 0.0)
+            paid = min(owed, stacks[seat])
+            stacks[seat] -= paid
+            bets[seat]   += paid
+            pot          += paid
+        else:
+            inc = target - bets[seat]
+            stacks[seat] -= inc
+            bets[seat]   += inc
+            pot          += inc
+
+            old_cb = cb
+            cb     = bets[seat]
+            lr     = cb - old_cb
+            raises += 1
+
+    elif action == ALLIN:
+        total_commit = bets[seat] + stacks[seat]
+
+        # Case 1: all-in does not exceed current bet -> it's just a call for less / call all-in
+        if total_commit <= cb:
+            paid = stacks[seat]
+            stacks[seat] = 0.0
+            bets[seat]  += paid
+            pot         += paid
+
+        else:
+            raise_size      = total_commit - cb
+            min_raise_size  = max(lr, buyin)
+
+            paid = stacks[seat]
+            stacks[seat] = 0.0
+            bets[seat]   = total_commit
+            pot         += paid
+
+            # Only reopen betting if this is a full legal raise
+            if raise_size >= min_raise_size:
+                old_cb = cb
+                cb     = total_commit
+                lr     = cb - old_cb
+                raises += 1
+            # else: short all-in overcall; do not change current_bet / last_raise_size
+
+    return pot, cb, lr, raises
+
+
 # ── Game state ────────────────────────────────────────────────────────────────
 
-class NLHGameState:
+class NLHGameState(_DealFields):
     """
     Multi-street NLH game state for CFR.
 
     Immutable design: play(action) returns a new child state.
-    Children are cached lazily in _children_cache.
+    Children are cached lazily in _children_cache (created on first play).
 
-    action_history is reset to [] at each street transition so
+    action_history is reset to empty at each street transition so
     _next_to_act can tell whether each player has acted this street.
+
+    Nodes hold no parent pointer; per-deal fields (hands, hole_cards,
+    wallet, ...) are read through the shared DealContext.
     """
 
+    __slots__ = ('ctx', 'street', 'community_cards', 'stacks', 'pot', 'bets',
+                 'folded', 'action_history', 'current_bet', 'last_raise_size',
+                 'n_raises', 'to_move', 'actions', '_children_cache', '_inf_set_key')
+
     MAX_RAISES = 2
 
     def __init__(
@@ -437,28 +755,19 @@ class NLHGameState:
         folded          = None,
         action_history  = None,
         current_bet     = 0.0,
-        last_raise_size = 0.0, 
+        last_raise_size = 0.0,
         n_raises        = 0,
         to_move         = None,
     ):
-        self.parent          = parent
-        self.hands           = hands
-        self.hole_cards      = hole_cards
-        self.full_deck       = full_deck
-        self.pre_board       = pre_board
-        self.equity_p0       = equity_p0
-        self.wallet          = wallet
-        self.buyin           = buyin
-        self.n_players       = n_players
-        self.street          = street
-        self.community_cards = community_cards if community_cards is not None else []
+        ctx = DealContext(hands, hole_cards, full_deck, pre_board, equity_p0,
+                          wallet, buyin, n_players)
 
         # ── Fresh game: post blinds ───────────────────────────────────────
         if stacks is None:
             sb      = buyin * 0.5
             stacks  = [float(wallet)] * n_players
             bets    = [0.0]           * n_players
-            folded  = set()
+            folded  = ()
 
             sb_seat = n_players - 2
             bb_seat = n_players - 1
@@ -472,22 +781,42 @@ class NLHGameState:
             current_bet    = bb_post
             last_raise_size= bb_post
             n_raises       = 0
-            action_history = []
+            action_history = ()
             to_move        = 0 if n_players > 2 else sb_seat
 
-        self.stacks         = stacks
-        self.pot            = pot
-        self.bets           = bets
-        self.folded         = folded
-        self.action_history = action_history
-        self.current_bet    = current_bet
-        self.last_raise_size= last_raise_size
-        self.n_raises       = n_raises
-        self.to_move        = to_move
+        self._init_node(
+            ctx, street, tuple(community_cards or ()), tuple(stacks), pot,
+            tuple(bets), SeatMask.of(folded or ()), ActionHistory.of(action_history or ()),
+            current_bet, last_raise_size, n_raises, to_move,
+        )
+
+    @classmethod
+    def _node(cls, ctx, street, community_cards, stacks, pot, bets, folded,
+              action_history, current_bet, last_raise_size, n_raises, to_move):
+        """Build a node from already-compact fields (skips __init__'s conversions)."""
+        state = cls.__new__(cls)
+        state._init_node(ctx, street, community_cards, stacks, pot, bets, folded,
+                         action_history, current_bet, last_raise_size, n_raises, to_move)
+        return state
+
+    def _init_node(self, ctx, street, community_cards, stacks, pot, bets, folded,
+                   action_history, current_bet, last_raise_size, n_raises, to_move):
+        self.ctx             = ctx
+        self.street          = street
+        self.community_cards = community_cards
+        self.stacks          = stacks
+        self.pot             = pot
+        self.bets            = bets
+        self.folded          = folded
+        self.action_history  = action_history
+        self.current_bet     = current_bet
+        self.last_raise_size = last_raise_size
+        self.n_raises        = n_raises
+        self.to_move         = to_move
 
         self.actions         = self._legal_actions()
-        self._children_cache = {}
-        self._inf_set_str    = self._build_inf_set()
+        self._children_cache = None
+        self._inf_set_key    = None
 
     # ── Flags ─────────────────────────────────────────────────────────────────
 
@@ -586,158 +915,63 @@ class NLHGameState:
     def play(self, action):
         if self.is_terminal():
             raise RuntimeError("play() on terminal state")
-        if action not in self._children_cache:
-            self._children_cache[action] = self._make_child(action)
-        return self._children_cache[action]
+        children = self._children_cache
+        if children is None:
+            children = self._children_cache = {}
+        if action not in children:
+            children[action] = self._make_child(action)
+        return children[action]
     
     def _advance_street(self, stacks, pot, bets, folded, next_street, all_in=False):
         return StreetChanceNode(
-            parent=self,
-            next_street=next_street,
-            hands=self.hands,
-            hole_cards=self.hole_cards,
-            full_deck=self.full_deck,
-            pre_board=self.pre_board,
-            equity_p0=self.equity_p0,
-            wallet=self.wallet,
-            buyin=self.buyin,
-            n_players=self.n_players,
-            community_cards=self.community_cards,
-            stacks=stacks,
-            pot=pot,
-            folded=folded,
-            last_raise_size=self.buyin,
-            current_bet=0.0,
-            n_raises=0,
-            all_in_runout=all_in,
+            self.ctx, next_street, self.community_cards, stacks, pot, folded,
+            last_raise_size=self.buyin, all_in_runout=all_in,
         )
     
 
     def _make_child(self, action):
         seat    = self.to_move
+        ctx     = self.ctx
         stacks  = list(self.stacks)
         bets    = list(self.bets)
-        folded  = set(self.folded)
+        folded  = self.folded
         pot     = self.pot
         cb      = self.current_bet
         lr      = self.last_raise_size
         raises  = self.n_raises
-        history = list(self.action_history) + [(seat, action)]
+        history = self.action_history.push(seat, action)
 
         if action == FOLD:
-            folded.add(seat)
-
-        elif action == CHECK:
-            # Explicit no-op pass action when not facing a bet
-            pass
-
-        elif action == CALL:
-            owed = max(cb - bets[seat], 0.0)
-            paid = min(owed, stacks[seat])
-            stacks[seat] -= paid
-            bets[seat]   += paid
-            pot          += paid
-
-        elif action in (RAISE_2, RAISE_4):
-            min_raise_size = max(lr, self.buyin)
-            min_raise_to   = cb + min_raise_size
-
-            if action == RAISE_2:
-                # Smallest legal raise
-                target = min_raise_to
-            else:
-                # Larger raise tier
-                target = cb + 3 * min_raise_size
-
-            target = min(target, bets[seat] + stacks[seat])
-
-
-            # If player cannot make a full legal raise, treat as a call/all-in-call.
-            if target < min_raise_to:
-                owed = max(cb - bets[seat], 0.0)
-                paid = min(owed, stacks[seat])
-                stacks[seat] -= paid
-                bets[seat]   += paid
-                pot          += paid
-            else:
-                inc = target - bets[seat]
-                stacks[seat] -= inc
-                bets[seat]   += inc
-                pot          += inc
-
-                old_cb = cb
-                cb     = bets[seat]
-                lr     = cb - old_cb
-                raises += 1
-
-        elif action == ALLIN:
-            total_commit = bets[seat] + stacks[seat]
-
-            # Case 1: all-in does not exceed current bet -> it's just a call for less / call all-in
-            if total_commit <= cb:
-                paid = stacks[seat]
-                stacks[seat] = 0.0
-                bets[seat]  += paid
-                pot         += paid
-
-            else:
-                raise_size      = total_commit - cb
-                min_raise_size  = max(lr, self.buyin)
-
-                paid = stacks[seat]
-                stacks[seat] = 0.0
-                bets[seat]   = total_commit
-                pot         += paid
-
-                # Only reopen betting if this is a full legal raise
-                if raise_size >= min_raise_size:
-                    old_cb = cb
-                    cb     = total_commit
-                    lr     = cb - old_cb
-                    raises += 1
-                # else: short all-in overcall; do not change current_bet / last_raise_size
+            folded = folded.with_seat(seat)
+        else:
+            pot, cb, lr, raises = _apply_bet(action, seat, stacks, bets,
+                                             pot, cb, lr, raises, ctx.buyin)
 
         next_seat = self._next_to_act(seat, folded, stacks, bets, cb, history, raises)
+        stacks    = tuple(stacks)
+        bets      = tuple(bets)
 
         if next_seat is not None:
-            return NLHGameState(
-                parent=self, hands=self.hands, hole_cards=self.hole_cards,
-                full_deck=self.full_deck, pre_board=self.pre_board,
-                equity_p0=self.equity_p0, wallet=self.wallet,
-                buyin=self.buyin, n_players=self.n_players,
-                street=self.street, community_cards=self.community_cards,
-                stacks=stacks, pot=pot, bets=bets, folded=folded,
-                action_history=history, current_bet=cb,
-                last_raise_size=lr, n_raises=raises, to_move=next_seat,
+            return NLHGameState._node(
+                ctx, self.street, self.community_cards, stacks, pot, bets, folded,
+                history, cb, lr, raises, next_seat,
             )
 
-        active = [i for i in range(self.n_players) if i not in folded]
+        active = [i for i in range(ctx.n_players) if i not in folded]
 
         if len(active) == 1:
-            return NLHGameState(
-                parent=self, hands=self.hands, hole_cards=self.hole_cards,
-                full_deck=self.full_deck, pre_board=self.pre_board,
-                equity_p0=self.equity_p0, wallet=self.wallet,
-                buyin=self.buyin, n_players=self.n_players,
-                street=self.street, community_cards=self.community_cards,
-                stacks=stacks, pot=pot, bets=bets, folded=folded,
-                action_history=history, current_bet=0.0,
-                last_raise_size=self.buyin, n_raises=0, to_move=None,
+            return NLHGameState._node(
+                ctx, self.street, self.community_cards, stacks, pot, bets, folded,
+                history, 0.0, ctx.buyin, 0, None,
             )
 
         all_allin = all(stacks[i] == 0 for i in active)
         if all_allin:
             next_street = self.street + 1
             if next_street > 3:
-                return NLHGameState(
-                    parent=self, hands=self.hands, hole_cards=self.hole_cards,
-                    full_deck=self.full_deck, pre_board=self.pre_board,
-                    equity_p0=self.equity_p0, wallet=self.wallet,
-                    buyin=self.buyin, n_players=self.n_players,
-                    street=self.street, community_cards=self.community_cards,
-                    stacks=stacks, pot=pot, bets=bets, folded=folded,
-                    action_history=history, current_bet=0.0,
-                    last_raise_size=self.buyin, n_raises=0, to_move=None,
+                return NLHGameState._node(
+                    ctx, self.street, self.community_cards, stacks, pot, bets, folded,
+                    history, 0.0, ctx.buyin, 0, None,
                 )
             return self._advance_street(
                 stacks=stacks, pot=pot, bets=bets, folded=folded,
@@ -752,15 +986,9 @@ class NLHGameState:
         lr = self.buyin
 
         if next_street > 3:
-            return NLHGameState(
-                parent=self, hands=self.hands, hole_cards=self.hole_cards,
-                full_deck=self.full_deck, pre_board=self.pre_board,
-                equity_p0=self.equity_p0, wallet=self.wallet,
-                buyin=self.buyin, n_players=self.n_players,
-                street=3, community_cards=self.community_cards,
-                stacks=stacks, pot=pot, bets=[0.0]*self.n_players,
-                folded=folded, action_history=[], current_bet=0.0,
-                last_raise_size=self.buyin, n_raises=0, to_move=None,
+            return NLHGameState._node(
+                ctx, 3, self.community_cards, stacks, pot, (0.0,) * ctx.n_players,
+                folded, EMPTY_HISTORY, 0.0, ctx.buyin, 0, None,
             )
 
         return self._advance_street(
@@ -784,12 +1012,12 @@ class NLHGameState:
                 return c
 
         # Pass 2: anyone who hasn't acted yet this street
-        acted = {s for s, _ in history}
+        acted = history.seats
         for offset in range(1, self.n_players + 1):
             c = (last_seat + offset) % self.n_players
             if c in folded or stacks[c] == 0:
                 continue
-            if c not in acted:
+            if not (acted >> c) & 1:
                 return c
 
         # BB option: preflop, no raises, BB hasn't acted yet
@@ -800,7 +1028,7 @@ class NLHGameState:
                 and stacks[bb] > 0
                 and bets[bb] == current_bet
                 and last_seat != bb
-                and not any(s == bb for s, _ in history) 
+                and not (acted >> bb) & 1
             ):
                 return bb
 
@@ -847,10 +1075,9 @@ class NLHGameState:
 
             # Unfinished board: equity approximation
             if self.pre_board is not None:
-                equity = _mc_equity(p0c, p1c, comm, self.full_deck,
-                                    pre_board=self.pre_board, n=100)
+                equity = _mc_equity(p0c, p1c, comm, pre_board=self.pre_board, n=100)
             else:
-                equity = _mc_equity(p0c, p1c, comm, self.full_deck, n=100)
+                equity = _mc_equity(p0c, p1c, comm, n=100)
 
             payoffs[0]  += equity * self.pot
             payoffs[p1] += (1.0 - equity) * self.pot
@@ -866,10 +1093,9 @@ class NLHGameState:
             else:
                 board = comm
 
-            hand_vals = {}
-            for idx in active:
-                cards = list(self.hole_cards[idx]) + board
-                hand_vals[idx] = _eval7(cards)
+            # Board preprocessed once, each player adds only hole cards
+            scorer = _board_scorer(tuple(board))
+            hand_vals = {idx: scorer.evaluate(self.hole_cards[idx]) for idx in active}
 
             best_val = max(hand_vals[idx] for idx in active)
             winners = [idx for idx in active if hand_vals[idx] == best_val]
@@ -887,32 +1113,262 @@ class NLHGameState:
 
     # ── Info set / repr ───────────────────────────────────────────────────────
 
-    def inf_set(self): return self._inf_set_str
+    def inf_set(self):
+        # Built on first access; terminal nodes usually never ask
+        if self._inf_set_key is None:
+            self._inf_set_key = self._build_inf_set()
+        return self._inf_set_key
+
+    def public_inf_set(self):
+        """Info set key with the deal-dependent fields (INF_SET_PRIVATE_MASK) left at 0."""
+        return self._build_inf_set(private=False)
 
-    def _build_inf_set(self):
-        seat   = self.to_move
-        sname  = SEAT_NAMES.get(seat, str(seat))
-        hb     = self.hands[seat] if seat is not None else "X"
-        street = STREET_NAMES.get(self.street, str(self.street))
-        bb     = _board_bucket(self.community_cards)
-        hist = "_".join(f"{s}{_ACTION_ABBR[a]}" for s, a in self.action_history)
+    def _build_inf_set(self, private=True):
+        """Packed info set key, see describe_inf_set() for the field layout."""
+        seat = self.to_move
+        key  = self.action_history.code << _HIST_SHIFT | self.street << 3
 
         if self.street == 0 and seat is not None:
-            pf_ctx    = _preflop_action_context(self)
-            pos_ctx   = _position_context(self, seat)
-            depth_ctx = _effective_stack_bucket(self, seat)
-            return f"{sname}.{hb}.{street}.{pf_ctx}.{pos_ctx}.{depth_ctx}.{hist}"
+            pf_ctx    = _PF_CONTEXTS.index(_preflop_action_context(self))
+            pos_ctx   = _POSITIONS.index(_position_context(self, seat))
+            depth_ctx = _DEPTHS.index(_effective_stack_bucket(self, seat))
+            return (key | seat | _PREFLOP_BIT | (self.hands[seat] << 6 if private else 0)
+                    | pf_ctx << 14 | pos_ctx << 16 | depth_ctx << 17)
 
         # Postflop: include hand strength bucket so CFR differentiates
         # "trash hand on a paired board" from "top pair on a paired board".
         # Without this, all hands with the same preflop bucket collapse into
         # a single infoset regardless of how they connected with the board.
         hole  = self.hole_cards[seat] if (self.hole_cards and seat is not None) else None
-        hsb   = _hand_strength_bucket(hole, self.community_cards, self.full_deck)
-        return f"{sname}.{street}.{bb}.{hsb}.{hist}" # Hand bucket removed from infoset for now to reduce size and focus equity
+        seat_bits = _NO_SEAT if seat is None else seat
+        if not private:
+            return key | seat_bits
+        # Hand bucket removed from infoset for now to reduce size and focus equity
+        return key | seat_bits | inf_set_private_bits(self.street, None, hole, self.community_cards)
 
     def __repr__(self):
         seat = SEAT_NAMES.get(self.to_move, str(self.to_move))
         return (f"NLHGameState(street={self.street}, seat={seat}, "
                 f"pot={self.pot:.1f}, bet={self.current_bet:.1f}, "
-                f"community={len(self.community_cards)}, folded={self.folded})")
\ No newline at end of file
+                f"community={len(self.community_cards)}, folded={self.folded})")
+
+# ── In-place state (make / unmake) ────────────────────────────────────────────
+
+class NLHMutableState(_DealFields):
+    """
+    Mutable counterpart of NLHGameState for sampled traversals.
+
+    apply(action) and deal() change the state in place and push one undo
+    record; undo() reverts the most recent one.  A depth-first walk that
+    undoes every step on return visits the same states as walking the
+    NLHGameState tree, but allocates no nodes and caches nothing.
+
+    Betting rules, legal actions, info sets and evaluation are shared with
+    NLHGameState.  The immutable tree stays the reference for debugging and
+    for code that keeps nodes around; build one of these from any of its
+    nodes with from_state().
+
+    Pending community deals are represented by to_move == CHANCE.
+    """
+
+    __slots__ = ('ctx', 'street', 'community_cards', 'stacks', 'pot', 'bets',
+                 'folded', 'action_history', 'current_bet', 'last_raise_size',
+                 'n_raises', 'to_move', 'actions', 'next_street', 'all_in_runout',
+                 '_inf_set_key', '_undo')
+
+    MAX_RAISES       = NLHGameState.MAX_RAISES
+    CARDS_PER_STREET = StreetChanceNode.CARDS_PER_STREET
+
+    _effective_stack_remaining             = NLHGameState._effective_stack_remaining
+    _pot_size_now                          = NLHGameState._pot_size_now
+    _spr_now                               = NLHGameState._spr_now
+    _should_force_preflop_commit_resolution = NLHGameState._should_force_preflop_commit_resolution
+    _legal_actions                         = NLHGameState._legal_actions
+    _next_to_act                           = NLHGameState._next_to_act
+    _build_inf_set                         = NLHGameState._build_inf_set
+    public_inf_set                         = NLHGameState.public_inf_set
+    evaluation                             = NLHGameState.evaluation
+
+    @classmethod
+    def from_state(cls, state):
+        """Mutable copy of an NLHGameState (usually a deal root from NLHChanceNode)."""
+        self = cls.__new__(cls)
+        self.ctx             = state.ctx
+        self.street          = state.street
+        self.community_cards = tuple(state.community_cards)
+        self.stacks          = list(state.stacks)
+        self.pot             = state.pot
+        self.bets            = list(state.bets)
+        self.folded          = state.folded
+        self.action_history  = state.action_history
+        self.current_bet     = state.current_bet
+        self.last_raise_size = state.last_raise_size
+        self.n_raises        = state.n_raises
+        self.to_move         = state.to_move
+        self.actions         = list(state.actions)
+        self.next_street     = None
+        self.all_in_runout   = False
+        self._inf_set_key    = state._inf_set_key
+        self._undo           = []
+        return self
+
+    # ── Flags ─────────────────────────────────────────────────────────────────
+
+    def is_terminal(self):  return self.to_move is None
+    def is_chance(self):    return self.to_move == CHANCE
+    def chance_prob(self):  return 1.0
+
+    def inf_set(self):
+        if self._inf_set_key is None:
+            self._inf_set_key = self._build_inf_set()
+        return self._inf_set_key
+
+    # ── Make / unmake ─────────────────────────────────────────────────────────
+
+    def _push_undo(self, seat):
+        # bets is saved by reference: apply() only writes bets[seat] before
+        # any street reset, and resets swap in a fresh list
+        self._undo.append((
+            self.street, self.to_move, self.next_street, self.all_in_runout,
+            self.community_cards, self.pot, self.folded, self.action_history,
+            self.current_bet, self.last_raise_size, self.n_raises, self.actions,
+            self._inf_set_key, self.bets, seat,
+            self.stacks[seat] if seat is not None else None,
+            self.bets[seat]   if seat is not None else None,
+        ))
+
+    def undo(self):
+        (self.street, self.to_move, self.next_street, self.all_in_runout,
+         self.community_cards, self.pot, self.folded, self.action_history,
+         self.current_bet, self.last_raise_size, self.n_raises, self.actions,
+         self._inf_set_key, bets, seat, stack, bet) = self._undo.pop()
+        self.bets = bets
+        if seat is not None:
+            self.stacks[seat] = stack
+            bets[seat]        = bet
+
+    def apply(self, action):
+        """In-place play(action)."""
+        seat = self.to_move
+        if seat is None or seat == CHANCE:
+            raise RuntimeError("apply() on terminal or chance state")
+        self._push_undo(seat)
+
+        ctx     = self.ctx
+        stacks  = self.stacks
+        bets    = self.bets
+        folded  = self.folded
+        pot     = self.pot
+        cb      = self.current_bet
+        lr      = self.last_raise_size
+        raises  = self.n_raises
+        history = self.action_history.push(seat, action)
+
+        if action == FOLD:
+            folded = folded.with_seat(seat)
+        else:
+            pot, cb, lr, raises = _apply_bet(action, seat, stacks, bets,
+                                             pot, cb, lr, raises, ctx.buyin)
+
+        self.folded         = folded
+        self.pot            = pot
+        self.action_history = history
+
+        next_seat = self._next_to_act(seat, folded, stacks, bets, cb, history, raises)
+        if next_seat is not None:
+            self.current_bet     = cb
+            self.last_raise_size = lr
+            self.n_raises        = raises
+            self._to_act(next_seat)
+            return
+
+        active = [i for i in range(ctx.n_players) if i not in folded]
+        if len(active) == 1:
+            self._end_hand()
+            return
+
+        next_street = self.street + 1
+        if all(stacks[i] == 0 for i in active):
+            if next_street > 3:
+                self._end_hand()
+            else:
+                self._await_deal(next_street, all_in=True)
+            return
+
+        if next_street > 3:
+            self.street         = 3
+            self.bets           = [0.0] * ctx.n_players
+            self.action_history = EMPTY_HISTORY
+            self._end_hand()
+            return
+
+        self._await_deal(next_street, all_in=False)
+
+    def deal(self):
+        """In-place StreetChanceNode.sample_one(): deal the next street's cards."""
+        if self.to_move != CHANCE:
+            raise RuntimeError("deal() on non-chance state")
+        ctx = self.ctx
+        n   = self.CARDS_PER_STREET[self.next_street - 1]
+
+        if ctx.pre_board is not None:
+            start = len(self.community_cards)
+            drawn = tuple(ctx.pre_board[start: start + n])
+        else:
+            drawn = tuple(BitDeck.without(self.community_cards, *ctx.hole_cards).sample(n))
+
+        self._push_undo(None)
+        self.community_cards = self.community_cards + drawn
+        self.bets            = [0.0] * ctx.n_players
+        self.action_history  = EMPTY_HISTORY
+        self.current_bet     = 0.0
+        self.n_raises        = 0
+
+        if self.all_in_runout:
+            if self.next_street >= 3 and len(self.community_cards) >= 5:
+                self.street          = 3
+                self.last_raise_size = 0.0
+                self.to_move         = None
+                self.actions         = []
+                self._inf_set_key    = None
+            else:
+                self.next_street += 1
+            return
+
+        sb_seat = ctx.n_players - 2
+        first   = None
+        for offset in range(ctx.n_players):
+            c = (sb_seat + offset) % ctx.n_players
+            if c not in self.folded and self.stacks[c] > 0:
+                first = c
+                break
+
+        self.street          = self.next_street
+        self.last_raise_size = ctx.buyin
+        self._to_act(first)
+
+    def _to_act(self, seat):
+        self.to_move      = seat
+        self.actions      = self._legal_actions()
+        self._inf_set_key = None
+
+    def _end_hand(self):
+        self.current_bet     = 0.0
+        self.last_raise_size = self.ctx.buyin
+        self.n_raises        = 0
+        self._to_act(None)
+
+    def _await_deal(self, next_street, all_in):
+        self.next_street     = next_street
+        self.all_in_runout   = all_in
+        self.last_raise_size = self.ctx.buyin
+        self.to_move         = CHANCE
+        self.actions         = []
+        self._inf_set_key    = "."
+
+    def __repr__(self):
+        seat = SEAT_NAMES.get(self.to_move, str(self.to_move))
+        return (f"NLHMutableState(street={self.street}, seat={seat}, "
+                f"pot={self.pot:.1f}, bet={self.current_bet:.1f}, "
+                f"community={len(self.community_cards)}, folded={self.folded}, "
+                f"depth={len(self._undo)})")
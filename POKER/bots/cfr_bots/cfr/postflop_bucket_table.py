@@ -0,0 +1,181 @@
+"""
+postflop_bucket_table.py
+------------------------
+Offline postflop strength buckets, one byte per suit-isomorphic
+(hole cards, board) class, stored as memory-mapped files.
+
+  street 1 (flop)    HandIndexer((2, 3))     1,286,792 entries  ~1.3 MB
+  street 2 (turn)    HandIndexer((2, 4))    13,960,050 entries   ~14 MB
+  street 3 (river)   HandIndexer((2, 5))   123,156,254 entries  ~123 MB
+
+Each entry is the postflop_equity_bucket() bucket (0 = strongest, 11 =
+weakest) of the class's canonical hand: Monte Carlo equity against one
+random opponent, mapped through the same _POSTFLOP_BOUNDARIES.
+
+Lookups are one hand index plus one array read. The files are opened
+read-only with np.memmap, so every training process shares the same
+OS page cache instead of rebuilding a private dict.
+
+────────────────────────────────────────────────────────────────────────────────
+FILE FORMAT  (little-endian)
+────────────────────────────────────────────────────────────────────────────────
+  4s   magic   b"PFBK"
+  H    format version (TABLE_VERSION)
+  H    street (1-3)
+  I    Monte Carlo samples per entry
+  Q    number of entries (= indexer size)
+  u1[entries]   buckets, indexed by HandIndexer.index([hole, board])
+
+The tables are too large to ship; generate them once per machine, e.g.
+
+  python -m bots.cfr_bots.cfr.postflop_bucket_table --street 1 --workers 8
+  (from the POKER directory)
+"""
+
+from __future__ import annotations
+
+import argparse
+import struct
+import time
+from multiprocessing import Pool
+from pathlib import Path
+
+import numpy as np
+
+from core.card_codes import N_CARDS, to_codes
+from core.evaluators.batch import evaluate_batch
+
+from .hand_indexer import HandIndexer
+from .preflop_abstraction import _POSTFLOP_BOUNDARIES
+
+# ── Constants ─────────────────────────────────────────────────────────────────
+
+TABLE_VERSION = 1
+TABLE_MAGIC   = b"PFBK"
+TABLE_DIR     = Path(__file__).resolve().parent / "tables"
+
+STREET_ROUNDS = {1: (2, 3), 2: (2, 4), 3: (2, 5)}
+STREET_FILES  = {1: "postflop_buckets_flop.bin",
+                 2: "postflop_buckets_turn.bin",
+                 3: "postflop_buckets_river.bin"}
+
+_HEADER     = struct.Struct("<4sHHIQ")
+_BOUNDARIES = np.asarray(_POSTFLOP_BOUNDARIES)
+
+_indexers = {}
+_tables   = {}   # street -> memmap, or None once known to be missing
+
+def get_indexer(street: int) -> HandIndexer:
+    if street not in _indexers:
+        _indexers[street] = HandIndexer(STREET_ROUNDS[street])
+    return _indexers[street]
+
+def table_path(street: int, table_dir=TABLE_DIR) -> Path:
+    return Path(table_dir) / STREET_FILES[street]
+
+# ── Generation ────────────────────────────────────────────────────────────────
+
+def _bucket_equities(equity: np.ndarray) -> np.ndarray:
+    """Vectorized postflop_equity_bucket() threshold scan."""
+    return (equity[:, None] < _BOUNDARIES).sum(axis=1).astype(np.uint8)
+
+def _chunk_buckets(street: int, start: int, stop: int, n_samples: int, seed: int) -> np.ndarray:
+    """Buckets for indices start..stop-1, all runouts scored in two batches."""
+    indexer = get_indexer(street)
+    rng     = np.random.default_rng((seed, start))
+
+    hands = np.array([sum(indexer.unindex(i), []) for i in range(start, stop)], dtype=np.int64)
+    n_board = hands.shape[1] - 2
+    needed  = 5 - n_board
+
+    # Every class repeated n_samples times; draw runout + opponent hole cards
+    rows = np.repeat(hands, n_samples, axis=0)
+    keys = rng.random((len(rows), N_CARDS))
+    np.put_along_axis(keys, rows, np.inf, axis=1)
+    drawn = np.argpartition(keys, needed + 1, axis=1)[:, :needed + 2]
+
+    board = np.concatenate([rows[:, 2:], drawn[:, :needed]], axis=1)
+    hero  = evaluate_batch(np.concatenate([rows[:, :2], board], axis=1))
+    opp   = evaluate_batch(np.concatenate([drawn[:, needed:], board], axis=1))
+
+    wins   = (hero > opp) + 0.5 * (hero == opp)
+    equity = wins.reshape(-1, n_samples).mean(axis=1)
+    return _bucket_equities(equity)
+
+def _fill_chunk(args):
+    path, street, start, stop, n_samples, seed = args
+    out = np.memmap(path, dtype=np.uint8, mode="r+", offset=_HEADER.size,
+                    shape=(get_indexer(street).size,))
+    out[start:stop] = _chunk_buckets(street, start, stop, n_samples, seed)
+    out.flush()
+    return stop - start
+
+def generate(street: int, n_samples: int = 200, chunk: int = 500, workers: int = 1,
+             seed: int = 42, table_dir=TABLE_DIR) -> Path:
+    """Write the bucket table for one street. Returns its path."""
+    size = get_indexer(street).size
+    path = table_path(street, table_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(TABLE_MAGIC, TABLE_VERSION, street, n_samples, size))
+        f.truncate(_HEADER.size + size)
+
+    jobs  = [(str(path), street, s, min(s + chunk, size), n_samples, seed)
+             for s in range(0, size, chunk)]
+    done  = 0
+    start = time.perf_counter()
+    with Pool(workers) as pool:
+        for n in pool.imap_unordered(_fill_chunk, jobs):
+            done += n
+            print(f"  {done:,}/{size:,} classes  ({time.perf_counter() - start:,.0f}s)",
+                  end="\r", flush=True)
+    print()
+    return path
+
+# ── Lookup ────────────────────────────────────────────────────────────────────
+
+def load(street: int, table_dir=TABLE_DIR):
+    """Read-only memmap of a street's buckets; None if the file is missing."""
+    path = table_path(street, table_dir)
+    if not path.exists():
+        return None
+    with open(path, "rb") as f:
+        magic, version, file_street, _, size = _HEADER.unpack(f.read(_HEADER.size))
+    if magic != TABLE_MAGIC or version != TABLE_VERSION or file_street != street:
+        raise ValueError(f"{path}: not a version {TABLE_VERSION} street {street} bucket table")
+    return np.memmap(path, dtype=np.uint8, mode="r", offset=_HEADER.size, shape=(size,))
+
+def get_table(street: int):
+    if street not in _tables:
+        _tables[street] = load(street)
+    return _tables[street]
+
+def lookup_bucket(hole_cards, community_cards):
+    """
+    Precomputed bucket for hole cards on a 3-5 card board, or None when that
+    street's table has not been generated.
+    """
+    street = len(community_cards) - 2
+    table  = get_table(street) if street in STREET_ROUNDS else None
+    if table is None:
+        return None
+    index = get_indexer(street).index([to_codes(hole_cards), to_codes(community_cards)])
+    return int(table[index])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate postflop bucket tables")
+    parser.add_argument("--street",  type=int, nargs="+", default=[1], choices=sorted(STREET_ROUNDS),
+                        help="1 = flop, 2 = turn, 3 = river")
+    parser.add_argument("--samples", type=int, default=200,
+                        help="Monte Carlo runouts per class (postflop_equity_bucket default)")
+    parser.add_argument("--chunk",   type=int, default=500)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed",    type=int, default=42)
+    args = parser.parse_args()
+
+    for street in args.street:
+        print(f"Street {street}: {get_indexer(street).size:,} classes")
+        path = generate(street, args.samples, args.chunk, args.workers, args.seed)
+        print(f"Wrote {path}")
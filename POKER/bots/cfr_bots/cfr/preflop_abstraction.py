@@ -57,12 +57,13 @@ from __future__ import annotations
 
 import random
 from collections import Counter
-from itertools import combinations
-from typing import List, Tuple
+from typing import List
 
-# phevaluator is required only for postflop equity bucketing.
-# The import is deferred inside postflop_equity_bucket() so the module remains
-# usable for preflop-only workflows without installing phevaluator.
+from .equity_cache import EquityCache
+
+# Hand strength comes from the shared core.evaluators package (POKER/ must be
+# on sys.path). The import is deferred inside the equity functions so the
+# bucket tables remain usable on their own.
 
 # ── Rank / suit constants ─────────────────────────────────────────────────────
 
@@ -222,16 +223,25 @@ def hand_to_bucket(rank1: str, rank2: str, suited: bool) -> int:
 
 # ── Full deck and deal generation ─────────────────────────────────────────────
 
-def _make_deck() -> List[Tuple[str, str]]:
-    """Return a list of (rank, suit) tuples for all 52 cards."""
-    return [(r, s) for r in RANKS for s in SUITS]
+# Deals use integer card codes (core.card_codes): rank_index * 4 + suit_index,
+# so code // 4 indexes RANKS and code % 4 indexes SUITS. Code order matches the
+# old (rank, suit) tuple order, so seeded shuffles deal the same cards.
+
+def _make_deck() -> List[int]:
+    """Return the card codes 0-51 for all 52 cards."""
+    return list(range(len(RANKS) * len(SUITS)))
 
 
-def _cards_to_bucket(card1: Tuple[str, str], card2: Tuple[str, str]) -> int:
-    """Convert a two-card hand expressed as (rank, suit) tuples to its preflop bucket."""
-    r1, s1 = card1
-    r2, s2 = card2
-    return hand_to_bucket(r1, r2, suited=(s1 == s2))
+# Preflop bucket of every ordered pair of card codes, built once at import
+_CODE_BUCKETS = [
+    [hand_to_bucket(RANKS[c1 >> 2], RANKS[c2 >> 2], suited=(c1 & 3) == (c2 & 3)) if c1 != c2 else -1
+     for c2 in range(52)]
+    for c1 in range(52)
+]
+
+def _cards_to_bucket(card1: int, card2: int) -> int:
+    """Convert a two-card hand expressed as card codes to its preflop bucket."""
+    return _CODE_BUCKETS[card1][card2]
 
 
 class PreflopAbstraction:
@@ -252,8 +262,8 @@ class PreflopAbstraction:
 
         Returns a dict with:
           'buckets':    tuple of preflop bucket IDs, one per seat
-          'hole_cards': tuple of ((rank, suit), (rank, suit)) per seat
-          'full_deck':  the shuffled 52-card list used for this deal
+          'hole_cards': tuple of (code, code) per seat
+          'full_deck':  the shuffled 52 card codes used for this deal
                         (passed downstream for postflop equity lookups)
         """
         deck = list(self.deck)
@@ -322,164 +332,69 @@ class PreflopAbstraction:
         return names[bucket] if 0 <= bucket < len(names) else f"bucket_{bucket}"
 
 
-# ── Preflop equity simulation ─────────────────────────────────────────────────
-#
-# Self-contained Monte Carlo evaluator for preflop equity estimates.
-# Does NOT use phevaluator -- hand strength is computed via a pure-Python
-# eval5/eval7 pair, so this function works without any external dependency.
+# ── Preflop equity ────────────────────────────────────────────────────────────
 #
-# Note on RANK_VAL: this function defines a local rank map (face values 2-14,
-# Ace=14) used only inside card_val() comparison tuples. This is intentionally
-# different from the module-level RANK_VAL (0-indexed, 2=0 A=12), which is used
-# solely for gap arithmetic in the preflop bucket table. The two maps are never
-# mixed and must not be merged.
+# Read from the precomputed 169-class table (preflop_equity_table.py) when it
+# is present; otherwise Monte Carlo on integer card codes (see core.card_codes).
 
 def preflop_equity_vs_random(hole_cards_p0, n_simulations: int = 200) -> float:
     """
-    Estimate P0's heads-up equity against one random opponent via Monte Carlo.
+    P0's heads-up equity against one random opponent.
+
+    Uses the precomputed preflop equity table when available (O(1), no
+    sampling noise); falls back to Monte Carlo when the table file is missing.
 
     Args:
-        hole_cards_p0: iterable of 2 (rank, suit) tuples, e.g. [("A","s"),("K","h")]
-        n_simulations: number of MC runouts (default 200, ~+-3% accuracy)
+        hole_cards_p0: 2 card codes (or anything core.card_codes.to_codes accepts)
+        n_simulations: number of MC runouts for the fallback (default 200, ~+-3% accuracy)
 
     Returns:
         float in [0.0, 1.0] -- fraction of pots won (ties count as 0.5)
     """
-    # Local rank values 2-14 (Ace=14) used only for card_val() hand-strength tuples.
-    # See module-level note above for why this differs from RANK_VAL.
-    _local_rank_val = {
-        "2": 2,  "3": 3,  "4": 4,  "5": 5,  "6": 6,  "7": 7,
-        "8": 8,  "9": 9,  "T": 10, "J": 11, "Q": 12, "K": 13, "A": 14,
-    }
+    from core.bit_deck import BitDeck
+    from core.card_codes import to_codes
+    from core.evaluators.batch import evaluate_batch, with_fixed
+    from .preflop_equity_table import class_index, get_table
 
-    def card_val(r, s):
-        return (_local_rank_val[r], s)
+    p0_codes = to_codes(hole_cards_p0)
 
-    def eval5(cards):
-        """
-        Evaluate a 5-card hand. Returns a comparable tuple; higher = better.
-        Hand rank encoding: 8=straight flush, 7=quads, 6=full house, 5=flush,
-                            4=straight, 3=trips, 2=two pair, 1=pair, 0=high card.
-        """
-        vals   = sorted([c[0] for c in cards], reverse=True)
-        suits  = [c[1] for c in cards]
-        vc     = Counter(vals)
-        groups = sorted(vc.items(), key=lambda x: (-x[1], -x[0]))
-
-        is_flush    = len(set(suits)) == 1
-        uvals       = sorted(set(vals), reverse=True)
-        is_straight = False
-        s_high      = 0
-        for i in range(len(uvals) - 4):
-            if uvals[i] - uvals[i + 4] == 4:
-                is_straight = True
-                s_high = uvals[i]
-                break
-        # Wheel: A-2-3-4-5
-        if not is_straight and {14, 2, 3, 4, 5}.issubset(set(vals)):
-            is_straight = True
-            s_high = 5
-
-        if is_straight and is_flush:             return (8, s_high)
-        if groups[0][1] == 4:                    return (7, groups[0][0], groups[1][0])
-        if groups[0][1] == 3 and groups[1][1] == 2:
-                                                 return (6, groups[0][0], groups[1][0])
-        if is_flush:                             return (5,) + tuple(vals)
-        if is_straight:                          return (4, s_high)
-        if groups[0][1] == 3:                    return (3, groups[0][0]) + tuple(v for v, _ in groups[1:])
-        if groups[0][1] == 2 and groups[1][1] == 2:
-            hi = max(groups[0][0], groups[1][0])
-            lo = min(groups[0][0], groups[1][0])
-            return (2, hi, lo, groups[2][0])
-        if groups[0][1] == 2:                    return (1, groups[0][0]) + tuple(v for v, _ in groups[1:])
-        return (0,) + tuple(vals)
-
-    def eval7(cards):
-        """Return the best 5-card hand value from 7 cards."""
-        return max(eval5(combo) for combo in combinations(cards, 5))
-
-    # Build a full deck and remove P0's known cards
-    full_deck = [(r, s) for r in RANKS for s in SUITS]
-    p0_set    = set(map(tuple, hole_cards_p0))
-    deck      = [c for c in full_deck if tuple(c) not in p0_set]
-
-    wins = 0.0
-    for _ in range(n_simulations):
-        random.shuffle(deck)
-        opp_cards = deck[:2]
-        board     = deck[2:7]
+    table = get_table()
+    if table is not None:
+        return float(table[0][class_index(*p0_codes)])
 
-        # Safety check: skip if opponent cards collide with P0 (should not occur)
-        if set(map(tuple, opp_cards)) & p0_set:
-            continue
+    # Full deck with P0's known cards masked out
+    deck    = BitDeck.without(p0_codes)
 
-        p0_hand  = [card_val(*c) for c in hole_cards_p0] + [card_val(*c) for c in board]
-        opp_hand = [card_val(*c) for c in opp_cards]     + [card_val(*c) for c in board]
+    # Each row: opponent's 2 hole cards followed by a 5-card board
+    samples = deck.sample_batch(n_simulations, 7)
+    board   = samples[:, 2:]
 
-        p0_val  = eval7(p0_hand)
-        opp_val = eval7(opp_hand)
+    p0_val  = evaluate_batch(with_fixed(p0_codes, board))
+    opp_val = evaluate_batch(samples)
 
-        if   p0_val > opp_val:  wins += 1.0
-        elif p0_val == opp_val: wins += 0.5
-
-    return wins / n_simulations
+    wins = (p0_val > opp_val).sum() + 0.5 * (p0_val == opp_val).sum()
+    return float(wins) / n_simulations
 
 
 # ── Postflop equity bucketing ─────────────────────────────────────────────────
 #
-# Uses phevaluator for fast, accurate hand evaluation. The import is deferred
-# inside postflop_equity_bucket() so preflop-only callers do not need it.
+# Hands are scored with the shared core.evaluators backend on integer codes.
 #
-# Cache: module-level dict keyed by (hole_card_ids, community_card_ids).
-# CFR traversal hits the same infoset from many traversal paths; the cache
-# avoids redundant MC runs. The cache grows to at most
-#   n_deals x n_streets x n_active_players unique keys per training run.
+# Cache: module-level EquityCache keyed by the suit-canonical (hole, board)
+# codes from suit_isomorphism.canonicalize(), so every suit relabelling of a
+# spot shares one entry and one MC run. CFR traversal hits the same infoset
+# from many traversal paths; the cache avoids redundant MC runs.
+# Unbounded it would grow to n_deals x n_streets x n_active_players keys per
+# training run, so it is capped (LRU by default); see configure_postflop_cache().
 # Call clear_postflop_cache() between runs if deal pools or board cards change.
 
-_postflop_bucket_cache: dict = {}
+_postflop_bucket_cache = EquityCache(capacity=200_000, policy="lru")
 
 # 11 thresholds define 12 buckets: bucket b requires equity >= _POSTFLOP_BOUNDARIES[b].
 # The final bucket (11) catches all equity values below the last threshold (0.08).
 _POSTFLOP_BOUNDARIES = [0.85, 0.75, 0.65, 0.58, 0.52, 0.46, 0.40, 0.33, 0.25, 0.15, 0.08]
 
-# Suit string normalisation for _card_to_ph().
-# Accepts both full suit names (from Card objects) and single-character strings.
-_PF_SUIT_MAP = {
-    "SPADES": "s", "HEARTS": "h", "DIAMONDS": "d", "CLUBS": "c",
-    "s": "s",      "h": "h",      "d": "d",         "c": "c",
-}
-
-
-def _card_to_ph(card) -> str:
-    """
-    Convert a card to a phevaluator-format string, e.g. "As", "Td", "2c".
-    Accepts either a (rank, suit) tuple or a Card object with .value/.suit attrs.
-    Normalises "10" -> "T" for phevaluator compatibility.
-    """
-    if hasattr(card, "value") and hasattr(card, "suit"):
-        rank = "T" if card.value == "10" else card.value
-        suit = _PF_SUIT_MAP.get(card.suit, card.suit[0].lower())
-        return f"{rank}{suit}"
-    rank, suit = card[0], card[1]
-    rank = "T" if rank == "10" else rank
-    suit = _PF_SUIT_MAP.get(suit, suit[0].lower())
-    return f"{rank}{suit}"
-
-
-def _card_id_pf(card) -> str:
-    """
-    Return a stable string identifier for a card, used as a cache key component.
-    Accepts Card objects (uses .id if present, else .suit/.value) or (rank, suit) tuples.
-    """
-    if hasattr(card, "id"):
-        return card.id
-    if hasattr(card, "value") and hasattr(card, "suit"):
-        return f"{card.suit[0]}{card.value}"
-    rank, suit = card[0], card[1]
-    return f"{suit}{rank}"
-
-
-def postflop_equity_bucket(hole_cards, community_cards, full_deck,
+def postflop_equity_bucket(hole_cards, community_cards,
                            n_simulations: int = 200) -> int:
     """
     Estimate a player's heads-up equity given hole cards and board, then map
@@ -489,31 +404,31 @@ def postflop_equity_bucket(hole_cards, community_cards, full_deck,
     board cards are sampled randomly from the cards not already in play.
 
     Args:
-        hole_cards:      iterable of 2 cards (tuple or Card object)
-        community_cards: iterable of 3-5 cards (current board)
-        full_deck:       full 52-card deck in the same card format
+        hole_cards:      2 card codes
+        community_cards: 3-5 card codes (current board)
         n_simulations:   MC samples; 200 gives ~+-3% accuracy, sufficient
                          for 12-bucket resolution (~6-7% bucket width)
 
     Returns:
         int 0-11
-
-    Requires:
-        phevaluator  (pip install phevaluator)
     """
-    from phevaluator import evaluate_cards as _ph_eval
+    import numpy as np
+    from core.bit_deck import BitDeck
+    from core.evaluators.batch import evaluate_batch, with_fixed
+    from .suit_isomorphism import canonicalize
 
     # ── Cache lookup ──────────────────────────────────────────────────────────
-    hole_key  = tuple(_card_id_pf(c) for c in hole_cards)
-    comm_key  = tuple(_card_id_pf(c) for c in community_cards)
-    cache_key = (hole_key, comm_key)
+    # The canonical codes are a valid representative of the spot, so the MC
+    # below runs on them directly.
+    cache_key  = canonicalize([hole_cards, community_cards])
+    hole, comm = cache_key
 
-    if cache_key in _postflop_bucket_cache:
-        return _postflop_bucket_cache[cache_key]
+    cached = _postflop_bucket_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
-    # ── Build the pool of cards available for sampling ────────────────────────
-    known     = set(hole_key) | set(comm_key)
-    available = [c for c in full_deck if _card_id_pf(c) not in known]
+    # ── Cards available for sampling: full deck minus hole + board ───────────
+    available = BitDeck.without(hole, comm)
 
     needed_board = 5 - len(community_cards)   # runout cards still to come
     needed_total = needed_board + 2            # runout + opponent's 2 hole cards
@@ -521,33 +436,18 @@ def postflop_equity_bucket(hole_cards, community_cards, full_deck,
     if len(available) < needed_total:
         # Degenerate state (should not occur in a well-formed game tree).
         # Return the neutral mid-bucket rather than raising an exception.
-        _postflop_bucket_cache[cache_key] = 5
+        _postflop_bucket_cache.put(cache_key, 5)
         return 5
 
-    ph_hole = [_card_to_ph(c) for c in hole_cards]
-    ph_comm = [_card_to_ph(c) for c in community_cards]
-
-    # ── Monte Carlo equity estimation ─────────────────────────────────────────
-    wins       = 0.0
-    valid_sims = 0
-
-    for _ in range(n_simulations):
-        sample    = random.sample(available, needed_total)
-        runout    = sample[:needed_board]
-        opp_cards = sample[needed_board:]
-
-        full_board = ph_comm + [_card_to_ph(c) for c in runout]
-        ph_opp     = [_card_to_ph(c) for c in opp_cards]
+    # ── Monte Carlo equity estimation (one vectorized batch) ─────────────────
+    samples    = available.sample_batch(n_simulations, needed_total)
+    full_board = with_fixed(comm, samples[:, :needed_board])
+    opp_cards  = samples[:, needed_board:]
 
-        hero_rank = _ph_eval(*(ph_hole + full_board))
-        opp_rank  = _ph_eval(*(ph_opp  + full_board))
+    hero_val = evaluate_batch(with_fixed(hole, full_board))
+    opp_val  = evaluate_batch(np.concatenate([opp_cards, full_board], axis=1))
 
-        # phevaluator convention: lower rank number = stronger hand
-        if   hero_rank < opp_rank:  wins += 1.0
-        elif hero_rank == opp_rank: wins += 0.5
-        valid_sims += 1
-
-    equity = wins / max(valid_sims, 1)
+    equity = float((hero_val > opp_val).sum() + 0.5 * (hero_val == opp_val).sum()) / n_simulations
 
     # ── Map equity -> bucket (scan thresholds high-to-low) ───────────────────
     bucket = N_POSTFLOP_BUCKETS - 1   # default: weakest bucket
@@ -556,7 +456,7 @@ def postflop_equity_bucket(hole_cards, community_cards, full_deck,
             bucket = b
             break
 
-    _postflop_bucket_cache[cache_key] = bucket
+    _postflop_bucket_cache.put(cache_key, bucket)
     return bucket
 
 
@@ -569,9 +469,24 @@ def clear_postflop_cache() -> None:
     _postflop_bucket_cache.clear()
 
 
+def configure_postflop_cache(capacity=200_000, policy: str = "lru") -> None:
+    """
+    Replace the postflop bucket cache with an empty one of the given capacity
+    (None = unbounded) and eviction policy ("lru" or "lfu").
+    """
+    global _postflop_bucket_cache
+    _postflop_bucket_cache = EquityCache(capacity=capacity, policy=policy)
+
+
+def postflop_cache_stats() -> dict:
+    """Size, capacity, policy, hits, misses, evictions and hit_rate of the cache."""
+    return _postflop_bucket_cache.stats()
+
+
 # ─────────────────────────────────────────────────────────────────
-# Run directly to verify bucket assignments and deal sampling:
-#   python preflop_abstraction.py
+# Run directly to verify bucket assignments and deal sampling
+# (from the POKER directory, as a module for the package-relative imports):
+#   python -m bots.cfr_bots.cfr.preflop_abstraction
 
 if __name__ == "__main__":
     abst = PreflopAbstraction(n_players=6)
@@ -0,0 +1,206 @@
+"""
+preflop_equity_table.py
+-----------------------
+Precomputed heads-up preflop equities for the 169 canonical starting hands.
+
+Two tables are stored together in one small binary file:
+
+  vs_random[c]      equity of class c against one uniformly random hand
+  vs_class[a, b]    equity of class a against class b, averaged over every
+                    card-disjoint pair of combos (vs_class[b, a] = 1 - vs_class[a, b])
+
+Lookups are O(1) after a single read of the file; preflop_equity_vs_random()
+uses the table whenever it is present.
+
+────────────────────────────────────────────────────────────────────────────────
+CLASS INDEX
+────────────────────────────────────────────────────────────────────────────────
+Classes live on the usual 13x13 grid, rank index 0 = deuce, 12 = ace:
+
+  pair     (r, r)            -> r  * 13 + r
+  suited   hi > lo           -> hi * 13 + lo
+  offsuit  hi > lo           -> lo * 13 + hi
+
+────────────────────────────────────────────────────────────────────────────────
+FILE FORMAT  (little-endian)
+────────────────────────────────────────────────────────────────────────────────
+  4s   magic   b"PFEQ"
+  H    format version (TABLE_VERSION)
+  H    number of classes (169)
+  I    runouts sampled per vs_random entry
+  I    runouts sampled per vs_class entry
+  H[169]        vs_random, equity * 65535
+  H[169 * 169]  vs_class row-major, equity * 65535
+
+Entries are Monte Carlo estimates over the batch evaluator; the sample
+counts are recorded in the header. Regenerate with:
+
+  python -m bots.cfr_bots.cfr.preflop_equity_table --vs-random 200000 --vs-class 20000
+  (from the POKER directory)
+"""
+
+from __future__ import annotations
+
+import argparse
+import struct
+import time
+from pathlib import Path
+
+import numpy as np
+
+from core.card_codes import N_CARDS, N_RANKS, make_code, to_codes
+from core.evaluators.batch import evaluate_batch
+
+# ── Constants ─────────────────────────────────────────────────────────────────
+
+N_CLASSES     = N_RANKS * N_RANKS
+TABLE_VERSION = 1
+TABLE_MAGIC   = b"PFEQ"
+TABLE_PATH    = Path(__file__).resolve().parent / "tables" / "preflop_equity.bin"
+
+_HEADER = struct.Struct("<4sHHII")
+_SCALE  = 65535
+
+_table = None   # (vs_random, vs_class) once loaded
+
+# ── Class index ───────────────────────────────────────────────────────────────
+
+def class_index(code1: int, code2: int) -> int:
+    """Canonical class 0-168 of two hole card codes."""
+    r1, r2 = code1 >> 2, code2 >> 2
+    hi, lo = max(r1, r2), min(r1, r2)
+    if r1 != r2 and (code1 & 3) == (code2 & 3):
+        return hi * N_RANKS + lo
+    return lo * N_RANKS + hi
+
+def class_combos(index: int) -> list:
+    """Every (code1, code2) hole card combo belonging to a class."""
+    row, col = divmod(index, N_RANKS)
+    if row == col:
+        return [(make_code(row, s1), make_code(row, s2))
+                for s1 in range(4) for s2 in range(s1 + 1, 4)]
+    if row > col:
+        return [(make_code(row, s), make_code(col, s)) for s in range(4)]
+    return [(make_code(col, s1), make_code(row, s2))
+            for s1 in range(4) for s2 in range(4) if s1 != s2]
+
+def class_name(index: int) -> str:
+    ranks = "23456789TJQKA"
+    row, col = divmod(index, N_RANKS)
+    if row == col:
+        return ranks[row] * 2
+    if row > col:
+        return f"{ranks[row]}{ranks[col]}s"
+    return f"{ranks[col]}{ranks[row]}o"
+
+# ── Generation ────────────────────────────────────────────────────────────────
+
+def _sample_boards(dead: np.ndarray, k: int, rng) -> np.ndarray:
+    """
+    For each row of dead card codes, draw k distinct live cards.
+    dead: (N, d) int array.  Returns (N, k).
+    """
+    keys = rng.random((len(dead), N_CARDS))
+    np.put_along_axis(keys, dead, np.inf, axis=1)
+    return np.argpartition(keys, k - 1, axis=1)[:, :k]
+
+def _equity(hero: np.ndarray, villain: np.ndarray, boards: np.ndarray) -> float:
+    v0 = evaluate_batch(np.concatenate([hero, boards], axis=1))
+    v1 = evaluate_batch(np.concatenate([villain, boards], axis=1))
+    return float((v0 > v1).sum() + 0.5 * (v0 == v1).sum()) / len(boards)
+
+def _estimate_vs_random(index: int, n: int, rng) -> float:
+    combos = np.array(class_combos(index), dtype=np.int64)
+    hero   = combos[rng.integers(len(combos), size=n)]
+    rest   = _sample_boards(hero, 7, rng)
+    return _equity(hero, rest[:, :2], rest[:, 2:])
+
+def _estimate_vs_class(a: int, b: int, n: int, rng) -> float:
+    pairs = np.array([
+        h + v
+        for h in class_combos(a)
+        for v in class_combos(b)
+        if not set(h) & set(v)
+    ], dtype=np.int64)
+    deal   = pairs[rng.integers(len(pairs), size=n)]
+    boards = _sample_boards(deal, 5, rng)
+    return _equity(deal[:, :2], deal[:, 2:], boards)
+
+def generate(vs_random_samples: int = 200_000, vs_class_samples: int = 20_000,
+             seed: int = 42, verbose: bool = True):
+    """Estimate both tables. Returns (vs_random[169], vs_class[169, 169]) float arrays."""
+    rng       = np.random.default_rng(seed)
+    vs_random = np.zeros(N_CLASSES)
+    vs_class  = np.full((N_CLASSES, N_CLASSES), 0.5)
+    start     = time.perf_counter()
+
+    for a in range(N_CLASSES):
+        vs_random[a] = _estimate_vs_random(a, vs_random_samples, rng)
+        # Mirror pairs share one estimate; a class vs itself is 0.5 by symmetry
+        for b in range(a + 1, N_CLASSES):
+            e = _estimate_vs_class(a, b, vs_class_samples, rng)
+            vs_class[a, b] = e
+            vs_class[b, a] = 1.0 - e
+        if verbose:
+            print(f"  {a + 1:3d}/{N_CLASSES}  {class_name(a):<4} vs random {vs_random[a]:.4f}"
+                  f"   ({time.perf_counter() - start:,.0f}s)", flush=True)
+
+    return vs_random, vs_class
+
+# ── Save / load ───────────────────────────────────────────────────────────────
+
+def save(path, vs_random, vs_class, vs_random_samples: int, vs_class_samples: int) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(TABLE_MAGIC, TABLE_VERSION, N_CLASSES,
+                             vs_random_samples, vs_class_samples))
+        f.write(np.round(np.asarray(vs_random) * _SCALE).astype("<u2").tobytes())
+        f.write(np.round(np.asarray(vs_class) * _SCALE).astype("<u2").tobytes())
+
+def load(path=TABLE_PATH):
+    """Read a table file. Returns (vs_random[169], vs_class[169, 169]) float32 arrays."""
+    data = Path(path).read_bytes()
+    magic, version, n_classes, _, _ = _HEADER.unpack_from(data)
+    if magic != TABLE_MAGIC or version != TABLE_VERSION or n_classes != N_CLASSES:
+        raise ValueError(f"{path}: not a version {TABLE_VERSION} preflop equity table")
+
+    values    = np.frombuffer(data, dtype="<u2", offset=_HEADER.size).astype(np.float32) / _SCALE
+    vs_random = values[:N_CLASSES]
+    vs_class  = values[N_CLASSES:].reshape(N_CLASSES, N_CLASSES)
+    return vs_random, vs_class
+
+def get_table():
+    """The shipped table, loaded on first use; None if the file is missing."""
+    global _table
+    if _table is None and TABLE_PATH.exists():
+        _table = load(TABLE_PATH)
+    return _table
+
+# ── Lookups ───────────────────────────────────────────────────────────────────
+
+def equity_vs_random(hole_cards) -> float:
+    """Heads-up equity of 2 hole cards (codes, Cards or tuples) vs a random hand."""
+    code1, code2 = to_codes(hole_cards)
+    return float(get_table()[0][class_index(code1, code2)])
+
+def equity_vs_hand(hole_cards, villain_cards) -> float:
+    """Class-vs-class equity of hero hole cards against villain hole cards."""
+    h1, h2 = to_codes(hole_cards)
+    v1, v2 = to_codes(villain_cards)
+    return float(get_table()[1][class_index(h1, h2), class_index(v1, v2)])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the preflop equity table")
+    parser.add_argument("--vs-random", type=int, default=200_000,
+                        help="Runouts per vs-random entry")
+    parser.add_argument("--vs-class",  type=int, default=20_000,
+                        help="Runouts per class-vs-class entry")
+    parser.add_argument("--seed",      type=int, default=42)
+    parser.add_argument("--out",       type=str, default=str(TABLE_PATH))
+    args = parser.parse_args()
+
+    vs_random, vs_class = generate(args.vs_random, args.vs_class, args.seed)
+    save(args.out, vs_random, vs_class, args.vs_random, args.vs_class)
+    print(f"Wrote {args.out}")
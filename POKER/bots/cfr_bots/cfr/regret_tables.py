@@ -0,0 +1,336 @@
+"""
+regret_tables.py
+----------------
+Array-backed CFR tables: one row per info set, one column per action.
+
+  tables = RegretTables(ALL_ACTIONS)
+  row    = tables.row(inf_set, legal_actions)   # assigns a row on first sight
+  cols   = tables.columns(legal_actions)        # column indices (cached)
+
+  regrets    cumulative regrets
+  cum_sigma  cumulative strategy weights
+  sigma      current strategy (regret matching, refresh_sigma)
+  average    average strategy (compute_average)
+  legal      mask of the actions seen at each info set
+
+All four value tables are float32 (n_rows x n_actions) arrays that are
+preallocated and grow by doubling, so a new info set is one row index
+rather than four dicts of boxed floats.  refresh_sigma() and
+compute_average() are single vectorized passes over every row.
+
+Rows whose regrets change are added to `dirty` by the caller;
+refresh_dirty() re-runs regret matching for just those rows, so the
+periodic refresh costs what the last few iterations touched, not the
+whole table.
+
+stamp holds, per row, the iteration its regrets and strategy weights were
+last discounted through; discounting update rules (update_rules.py) use it
+to catch a row up lazily when it is next updated.
+
+TableView gives the old {inf_set: {action: value}} shape for diagnostics
+and the dataset collector; load_dicts() reads CFR state saved in that shape.
+
+Parallel traversal (CFRWorkerPool in the trainer) uses sync_keys() to
+mirror the parent's row layout in a worker and merge() (rows_for() +
+add_deltas()) to fold a worker's regret / strategy deltas back into the
+parent's tables.  A worker's regrets only hold the round's deltas, so
+load_rows() can also take the parent's cumulative regrets (base_regrets),
+which action_regrets() / prunable() add back in.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+
+import numpy as np
+
+FIELDS = ("regrets", "cum_sigma", "sigma", "average")
+
+
+class RegretTables:
+
+    def __init__(self, actions, capacity: int = 1024, dtype=np.float32):
+        self.actions = tuple(actions)
+        self.dtype   = dtype
+
+        self.index = {}          # inf_set -> row
+        self.keys  = []          # row -> inf_set
+        self.dirty = set()       # rows whose sigma is stale
+
+        self.base_regrets = None # parent's cumulative regrets, in a worker (load_rows)
+
+        self._column   = {a: i for i, a in enumerate(self.actions)}
+        self._columns  = {}      # actions tuple -> (column array, column list, column bits)
+        self._row_bits = []      # row -> bitmask of legal columns
+
+        width = len(self.actions)
+        for name in FIELDS:
+            setattr(self, name, np.zeros((capacity, width), dtype))
+        self.legal = np.zeros((capacity, width), bool)
+        self.stamp = np.zeros(capacity, np.int64)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, inf_set):
+        return inf_set in self.index
+
+    # ── Rows and columns ─────────────────────────────────────────────────────
+
+    def columns(self, actions):
+        """Column indices of actions, as an index array."""
+        return self._column_info(actions)[0]
+
+    def _column_info(self, actions):
+        key  = tuple(actions)
+        info = self._columns.get(key)
+        if info is None:
+            cols = [self._column[a] for a in key]
+            info = self._columns[key] = (
+                np.array(cols, dtype=np.intp), cols, sum(1 << c for c in cols),
+            )
+        return info
+
+    def row(self, inf_set, actions):
+        """
+        Row of inf_set, created with a uniform sigma / average over actions
+        on first sight.  An action not seen before at an existing info set
+        is added to its mask with a uniform share, as the dict tables did.
+        """
+        cols, _, bits = self._column_info(actions)
+        row = self.index.get(inf_set)
+
+        if row is None:
+            row = len(self.keys)
+            if row == len(self.regrets):
+                self._grow()
+            self.index[inf_set] = row
+            self.keys.append(inf_set)
+            self._row_bits.append(0)
+            new = cols
+        elif self._row_bits[row] & bits == bits:
+            return row
+        else:
+            new = cols[~self.legal[row, cols]]
+            self.dirty.add(row)
+
+        self._row_bits[row] |= bits
+        self.legal[row, new]   = True
+        self.sigma[row, new]   = 1.0 / len(cols)
+        self.average[row, new] = 1.0 / len(cols)
+        return row
+
+    def _grow(self, min_capacity=0):
+        capacity = max(2 * len(self.regrets), min_capacity)
+        for name in FIELDS + ("legal", "stamp"):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    # ── Worker sync ──────────────────────────────────────────────────────────
+
+    def sync_keys(self, n_keep, new_keys):
+        """
+        Keep the first n_keep rows, drop any rows added after them, then
+        append new_keys.  Used by a worker to line its rows up with the
+        parent's before the parent's arrays are copied in.
+        """
+        for inf_set in self.keys[n_keep:]:
+            del self.index[inf_set]
+        del self.keys[n_keep:]
+        del self._row_bits[n_keep:]
+
+        n = n_keep + len(new_keys)
+        if n > len(self.regrets):
+            self._grow(n)
+        for row, inf_set in enumerate(new_keys, start=n_keep):
+            self.index[inf_set] = row
+        self.keys.extend(new_keys)
+        self._row_bits.extend([0] * len(new_keys))
+        self.dirty = set()
+
+    def load_rows(self, sigma, average, legal, regrets=None):
+        """
+        Copy the parent's sigma / average / legal rows in and zero the
+        accumulators.  regrets, the parent's cumulative regrets, are kept as
+        base_regrets for pruning decisions (None when the worker does not prune).
+        """
+        n = len(sigma)
+        self.base_regrets = None if regrets is None else np.array(regrets, self.dtype)
+        self.sigma[:n]   = sigma
+        self.average[:n] = average
+        self.legal[:n]   = legal
+        self.legal[n:]   = False
+        self.regrets[:]   = 0.0
+        self.cum_sigma[:] = 0.0
+        weights = 1 << np.arange(len(self.actions))
+        self._row_bits[:n] = (legal * weights).sum(axis=1).tolist()
+
+    def merge(self, keys, legal, regrets, cum_sigma, floor_regrets=True):
+        """
+        Add per-row regret and strategy-weight deltas, one row per key.
+        Unknown keys get new rows and legal masks are unioned.  With
+        floor_regrets the summed regrets are clipped at 0, so a batch of
+        updates is floored once rather than after each one.
+        """
+        self.add_deltas(self.rows_for(keys, legal), regrets, cum_sigma, floor_regrets)
+
+    def rows_for(self, keys, legal):
+        """Rows of keys (created on first sight) with their legal masks unioned in."""
+        rows = np.empty(len(keys), np.intp)
+        for i, inf_set in enumerate(keys):
+            actions = [a for a, ok in zip(self.actions, legal[i]) if ok]
+            rows[i] = self.row(inf_set, actions)
+        return rows
+
+    def add_deltas(self, rows, regrets, cum_sigma, floor_regrets=True):
+        self.regrets[rows] += regrets
+        if floor_regrets:
+            self.regrets[rows] = np.maximum(self.regrets[rows], 0.0)
+        self.cum_sigma[rows] += cum_sigma
+        self.dirty.update(rows.tolist())
+
+    def discount(self, rows, positive, negative, strategy, stamp):
+        """
+        Scale the positive and negative regrets and the strategy weights of
+        rows by per-row factors (arrays or scalars), and stamp them.
+        """
+        rows     = np.atleast_1d(rows)
+        positive = np.asarray(positive, self.dtype).reshape(-1, 1)
+        negative = np.asarray(negative, self.dtype).reshape(-1, 1)
+        regrets  = self.regrets[rows]
+        self.regrets[rows]    = np.where(regrets > 0, regrets * positive, regrets * negative)
+        self.cum_sigma[rows] *= np.asarray(strategy, self.dtype).reshape(-1, 1)
+        self.stamp[rows]      = stamp
+
+    def strategy(self, row, actions) -> list:
+        """
+        sigma at row restricted to actions, renormalized (uniform if it is
+        all zero).  A plain list: per-node work on a handful of actions is
+        cheaper in Python than through small-array NumPy calls.
+        """
+        sigma = self.sigma[row].tolist()
+        probs = [sigma[c] for c in self._column_info(actions)[1]]
+        total = sum(probs)
+        if total <= 0:
+            return [1.0 / len(probs)] * len(probs)
+        return [p / total for p in probs]
+
+    def action_regrets(self, row, actions) -> list:
+        """Cumulative regrets at row for actions (base_regrets included), as a list."""
+        regrets = self.regrets[row]
+        if self.base_regrets is not None and row < len(self.base_regrets):
+            regrets = regrets + self.base_regrets[row]
+        regrets = regrets.tolist()
+        return [regrets[c] for c in self._column_info(actions)[1]]
+
+    def prunable(self, row, actions, probs, threshold) -> list:
+        """
+        Per action: regret at or below threshold and no weight in probs.
+        Only zero-probability actions are skipped, so a node's value
+        sum(probs * utils) is the same with or without them.
+        """
+        return [r <= threshold and p == 0.0
+                for r, p in zip(self.action_regrets(row, actions), probs)]
+
+    # ── Vectorized strategy updates ──────────────────────────────────────────
+
+    def refresh_sigma(self, rows=None):
+        """Regret matching for the given rows (default: every row) in one pass."""
+        sel = slice(0, len(self.keys)) if rows is None else rows
+        self.sigma[sel] = _normalize(self.regrets[sel], self.legal[sel])
+
+    def refresh_dirty(self) -> int:
+        """Regret matching for the dirty rows only; returns how many were refreshed."""
+        if not self.dirty:
+            return 0
+        rows = np.fromiter(self.dirty, np.intp, len(self.dirty))
+        self.dirty.clear()
+        self.refresh_sigma(rows)
+        return len(rows)
+
+    def compute_average(self):
+        """Average strategy from cumulative strategy weights, for every row."""
+        n = len(self.keys)
+        self.average[:n] = _normalize(self.cum_sigma[:n], self.legal[:n])
+
+    def mean_entropy(self) -> float:
+        """Mean entropy of the average strategy over all info sets."""
+        p = self.average[:len(self.keys)].astype(np.float64)
+        if not len(p):
+            return 0.0
+        return float(-(p * np.log(p + 1e-10)).sum(axis=1).mean())
+
+    # ── Dict-shaped access ───────────────────────────────────────────────────
+
+    def row_dict(self, field, row) -> dict:
+        values = getattr(self, field)[row].tolist()
+        legal  = self._row_bits[row]
+        return {a: values[c] for c, a in enumerate(self.actions) if legal >> c & 1}
+
+    def load_dicts(self, field, table):
+        """Load a {inf_set: {action: value}} table into field."""
+        for inf_set, values in table.items():
+            if not values:
+                continue
+            row = self.row(inf_set, values)
+            target = getattr(self, field)    # row() may have grown the arrays
+            target[row, self.columns(values)] = list(values.values())
+
+    def state_dict(self) -> dict:
+        n = len(self.keys)
+        state = {"actions": self.actions, "keys": list(self.keys),
+                 "legal": self.legal[:n].copy(), "stamp": self.stamp[:n].copy()}
+        for name in FIELDS:
+            state[name] = getattr(self, name)[:n].copy()
+        return state
+
+    def load_state_dict(self, state):
+        if tuple(state["actions"]) != self.actions:
+            raise ValueError(f"saved tables use actions {state['actions']}, expected {self.actions}")
+        n = len(state["keys"])
+        capacity = max(len(self.regrets), n)
+        width    = len(self.actions)
+        for name in FIELDS:
+            table = np.zeros((capacity, width), self.dtype)
+            table[:n] = state[name]
+            setattr(self, name, table)
+        self.legal = np.zeros((capacity, width), bool)
+        self.legal[:n] = state["legal"]
+        self.stamp = np.zeros(capacity, np.int64)
+        self.stamp[:n] = state.get("stamp", 0)     # tables saved before update rules
+
+        self.keys  = list(state["keys"])
+        self.index = {inf_set: row for row, inf_set in enumerate(self.keys)}
+        self.dirty = set()
+        weights    = 1 << np.arange(width)
+        self._row_bits = (self.legal[:n] * weights).sum(axis=1).tolist()
+
+
+def _normalize(weights, legal):
+    """Positive part of weights normalized per row; uniform over legal when nothing is positive."""
+    pos   = np.maximum(weights, 0.0)
+    total = pos.sum(axis=1, keepdims=True)
+    uniform = legal / np.maximum(legal.sum(axis=1, keepdims=True), 1)
+    return np.where(total > 0, pos / np.where(total > 0, total, 1.0), uniform)
+
+
+class TableView(Mapping):
+    """Read-only {inf_set: {action: value}} view of one RegretTables field."""
+
+    def __init__(self, tables, field):
+        self.tables = tables
+        self.field  = field
+
+    def __getitem__(self, inf_set):
+        return self.tables.row_dict(self.field, self.tables.index[inf_set])
+
+    def __contains__(self, inf_set):
+        return inf_set in self.tables.index
+
+    def __iter__(self):
+        return iter(self.tables.keys)
+
+    def __len__(self):
+        return len(self.tables.keys)
@@ -0,0 +1,59 @@
+"""
+suit_isomorphism.py
+-------------------
+Suit-normalized forms of card groups, for cache keys.
+
+Relabelling suits never changes hand strength, equity or board texture:
+A♠K♠ on Q♠J♠2♣ and A♥K♥ on Q♥J♥2♦ are the same spot.  canonicalize()
+maps every member of such a class to one representative, so caches keyed
+by it store (and compute) each class once -- up to 4! = 24 times fewer
+entries than raw card ids.
+
+Cards are integer codes (core.card_codes); anything to_codes() accepts is
+converted first.  Cards are passed as groups whose boundaries matter
+(hole cards vs board, or one group per player), e.g.
+
+  canonicalize([hole, board])
+  canonicalize([p0_hole, p1_hole, board])
+
+────────────────────────────────────────────────────────────────────────────────
+METHOD
+────────────────────────────────────────────────────────────────────────────────
+  Each suit gets a signature: the tuple of its rank bitmasks per group.
+  Two card sets are isomorphic exactly when their multisets of signatures
+  match, so suits are renumbered by descending signature (first = spades
+  code 3, then hearts, diamonds, clubs) and every card rewritten.  Suits
+  with equal signatures are interchangeable, so ties need no tie-break.
+"""
+
+from __future__ import annotations
+
+from core.card_codes import to_codes
+
+N_SUITS = 4
+
+def canonical_suit_map(groups) -> list:
+    """old suit index -> canonical suit index, for groups of card codes."""
+    signatures = [[0] * len(groups) for _ in range(N_SUITS)]
+    for g, cards in enumerate(groups):
+        for code in cards:
+            signatures[code & 3][g] |= 1 << (code >> 2)
+
+    order = sorted(range(N_SUITS), key=lambda s: signatures[s], reverse=True)
+    suit_map = [0] * N_SUITS
+    for rank, suit in enumerate(order):
+        suit_map[suit] = N_SUITS - 1 - rank
+    return suit_map
+
+def canonicalize(groups) -> tuple:
+    """
+    Suit-normalized form of card groups: a tuple of sorted code tuples,
+    identical for every suit relabelling of the input.  Usable directly as
+    a dict key, and the codes are a valid representative of the class.
+    """
+    groups   = [to_codes(cards) for cards in groups]
+    suit_map = canonical_suit_map(groups)
+    return tuple(
+        tuple(sorted((code & ~3) | suit_map[code & 3] for code in cards))
+        for cards in groups
+    )
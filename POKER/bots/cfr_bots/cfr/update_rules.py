@@ -0,0 +1,94 @@
+"""
+update_rules.py
+---------------
+Regret / average-strategy update rules for VanillaCFR.
+
+Each rule is a Discounted CFR schedule (Brown & Sandholm): after iteration
+t, positive cumulative regrets are multiplied by t^a / (t^a + 1), negative
+ones by t^b / (t^b + 1) and cumulative strategy weights by (t / (t+1))^g.
+
+  legacy  regrets floored at 0 after every update, uniform averaging
+          (what VanillaCFR always did)
+  cfr+    CFR+: floored regrets, linearly weighted average (g = 1)
+  linear  Linear CFR: iteration t weighted by t everywhere (a = b = g = 1)
+  dcfr    DCFR, default a = 1.5, b = 0, g = 2
+
+Discounting every row after every iteration would be a pass over the whole
+table per iteration.  Instead each row remembers the iteration it was last
+discounted through (RegretTables.stamp) and is caught up when it is next
+updated: the product of the factors over iterations (s, t] is
+exp(L[t] - L[s]) with L the running sum of log factors.  Positive regrets
+within a row, and its strategy weights, all share one factor, so regret
+matching and the normalized average come out the same as with eager
+discounting.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+UPDATE_RULES = ("legacy", "cfr+", "linear", "dcfr")
+
+
+class UpdateRule:
+
+    def __init__(self, name, alpha=math.inf, beta=math.inf, gamma=0.0, floor=False):
+        self.name  = name
+        self.alpha = alpha
+        self.beta  = beta
+        self.gamma = gamma
+        self.floor = floor      # clip cumulative regrets at 0 after each update
+
+        # Nothing to catch up when every factor is 1 (floored rules ignore beta)
+        self.discounts = not (alpha == math.inf and gamma == 0.0
+                              and (floor or beta == math.inf))
+        self._log = np.zeros((3, 1))        # running log-factor sums, column t
+
+    def __repr__(self):
+        if self.name == "dcfr":
+            return f"dcfr(alpha={self.alpha}, beta={self.beta}, gamma={self.gamma})"
+        return self.name
+
+    def _extend(self, t):
+        have = self._log.shape[1] - 1
+        if t <= have:
+            return
+        n = max(t, 2 * have)
+        s = np.arange(have + 1, n + 1, dtype=np.float64)
+        steps = np.stack([
+            _log_ratio(s, self.alpha),
+            _log_ratio(s, self.beta) if not self.floor else np.zeros_like(s),
+            self.gamma * np.log(s / (s + 1)),
+        ])
+        self._log = np.concatenate([self._log, self._log[:, -1:] + np.cumsum(steps, axis=1)], axis=1)
+
+    def factors(self, since, t):
+        """
+        (positive, negative, strategy) multipliers for the discounts of
+        iterations (since, t].  since may be an array of per-row stamps.
+        """
+        self._extend(t)
+        log = self._log
+        return tuple(np.exp(log[i, t] - log[i, since]) for i in range(3))
+
+
+def _log_ratio(s, exponent):
+    """log(s^e / (s^e + 1)), with e = inf giving 0 (no discount)."""
+    if exponent == math.inf:
+        return np.zeros_like(s)
+    return -np.log1p(s ** -exponent)
+
+
+def make_update_rule(name="legacy", alpha=1.5, beta=0.0, gamma=2.0):
+    """Rule by name; alpha / beta / gamma only apply to dcfr."""
+    if name == "legacy":
+        return UpdateRule(name, floor=True)
+    if name == "cfr+":
+        return UpdateRule(name, gamma=1.0, floor=True)
+    if name == "linear":
+        return UpdateRule(name, alpha=1.0, beta=1.0, gamma=1.0)
+    if name == "dcfr":
+        return UpdateRule(name, alpha=alpha, beta=beta, gamma=gamma)
+    raise ValueError(f"Unknown update rule {name!r}, choose from {UPDATE_RULES}")
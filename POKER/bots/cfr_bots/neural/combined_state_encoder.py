@@ -32,7 +32,7 @@ GAME STATE SCALARS (10)
 STREET / BOARD (11)
   [33-36]  street one-hot                (PRE/FLP/TRN/RVR)
   [37]     community card count          (normalised by 5)
-  [38]     hand strength                 (phevaluator, raw [0,1])
+  [38]     hand strength                 (core.evaluators, raw [0,1])
   [39]     flush draw
   [40]     straight draw
   [41]     draw equity                   (blended fd+sd)
@@ -92,7 +92,10 @@ import math
 import torch
 import numpy as np
 from collections import Counter, defaultdict
-from phevaluator import evaluate_cards   
+
+from core.card_codes import to_codes
+from core.evaluators import evaluate, equivalence_class, lookup
+from core.evaluators.batch import evaluate_batch
 
 # ── Constants ─────────────────────────────────────────────────────────────────
 
@@ -238,22 +241,16 @@ def reset_profiles():
 
 # ── Card utilities ────────────────────────────────────────────────────────────
 
-RANK_MAP = {
-    '2':2,'3':3,'4':4,'5':5,'6':6,'7':7,
-    '8':8,'9':9,'T':10,'10':10,  
-    'J':11,'Q':12,'K':13,'A':14
-}
+# Cards are integer codes 0-51 (core.card_codes): rank_index * 4 + suit_index.
+# Engine Card objects are converted before they reach the encoder.
 
 def rank(card):
-    return RANK_MAP.get(card[0], 0) if isinstance(card, tuple) else RANK_MAP.get(card.value, 0)
+    """Face value 2-14."""
+    return (card >> 2) + 2
 
 def suit(card):
-    return card[1] if isinstance(card, tuple) else card.suit
-
-def _get_rank_suit(card):
-    if isinstance(card, tuple):
-        return card[0], card[1]
-    return getattr(card, 'rank', getattr(card, 'value', '')), card.suit
+    """Suit index 0-3."""
+    return card & 3
 
 
 # ── Hand strength ─────────────────────────────────────────────────────────────
@@ -263,24 +260,8 @@ def _postflop_hand_strength(hole_cards, community_cards) -> float:
         return 0.0
     try:
 
-        _SUIT_MAP = {
-            'SPADES': 's', 'HEARTS': 'h', 'DIAMONDS': 'd', 'CLUBS': 'c',
-            's': 's', 'h': 'h', 'd': 'd', 'c': 'c',
-        }
-
-        def _to_ph(card):
-            if hasattr(card, 'value') and hasattr(card, 'suit'):
-                r = 'T' if card.value == '10' else card.value
-                s = _SUIT_MAP.get(card.suit, card.suit[0].lower())
-                return f"{r}{s}"
-            r, s = card[0], card[1]
-            r = 'T' if r == '10' else r
-            s = _SUIT_MAP.get(s, s[0].lower())
-            return f"{r}{s}"
-
-        all_cards  = list(hole_cards) + list(community_cards)
-        ph_strings = [_to_ph(c) for c in all_cards]
-        score      = evaluate_cards(*ph_strings)
+        # Equivalence class 1 (royal flush) .. 7462, scaled to [0, 1]
+        score = equivalence_class(evaluate(list(hole_cards) + list(community_cards)))
         return float(1.0 - (score - 1) / 7461.0)
     except Exception:
         return 0.0
@@ -294,18 +275,10 @@ def _draw_features(hole_cards, community_cards):
         return 0.0, 0.0, 0.0
     try:
         all_cards   = list(hole_cards) + list(community_cards)
-        suits_list  = [_get_rank_suit(c)[1] for c in all_cards]
-        suit_counts = Counter(suits_list)
+        suit_counts = Counter(suit(c) for c in all_cards)
         flush_draw  = 1.0 if max(suit_counts.values()) == 4 else 0.0
 
-        _RANK_VAL = {
-            '2':2,'3':3,'4':4,'5':5,'6':6,'7':7,'8':8,
-            '9':9,'T':10,'10':10,'J':11,'Q':12,'K':13,'A':14,
-        }
-        ranks = sorted(set(
-            _RANK_VAL.get(_get_rank_suit(c)[0], 0)
-            for c in all_cards
-        ))
+        ranks = sorted(set(rank(c) for c in all_cards))
         straight_draw = 0.0
         for i in range(len(ranks) - 3):
             if ranks[i + 3] - ranks[i] == 3:
@@ -318,6 +291,39 @@ def _draw_features(hole_cards, community_cards):
         return 0.0, 0.0, 0.0
 
 
+# ── Batched hand strength / draws ─────────────────────────────────────────────
+# The same values as _postflop_hand_strength() / _draw_features() for a
+# (k, 2) array of hole cards against one board.
+
+_CLASS_STRENGTHS = None     # every distinct strength, ascending
+
+def _postflop_hand_strength_batch(holdings, community_cards) -> np.ndarray:
+    global _CLASS_STRENGTHS
+    if _CLASS_STRENGTHS is None:
+        _CLASS_STRENGTHS = np.array(lookup.class_strengths()[::-1], dtype=np.int64)
+    board     = np.broadcast_to(np.asarray(community_cards, dtype=np.int64), (len(holdings), len(community_cards)))
+    strengths = evaluate_batch(np.concatenate([holdings, board], axis=1))
+    # Equivalence class 1 (best) .. 7462 is one more than the count of stronger classes
+    stronger  = len(_CLASS_STRENGTHS) - 1 - np.searchsorted(_CLASS_STRENGTHS, strengths)
+    return 1.0 - stronger / 7461.0
+
+
+def _draw_features_batch(holdings, community_cards):
+    """(flush_draw, straight_draw, draw_equity) arrays."""
+    cards = np.concatenate([holdings, np.broadcast_to(np.asarray(community_cards, dtype=np.int64),
+                                                      (len(holdings), len(community_cards)))], axis=1)
+    suit_counts = (cards[:, :, None] & 3) == np.arange(4)
+    flush_draw  = (suit_counts.sum(axis=1).max(axis=1) == 4).astype(np.float32)
+
+    # Four distinct ranks in a row (ace high only)
+    present = np.zeros((len(cards), 13), dtype=bool)
+    np.put_along_axis(present, cards >> 2, True, axis=1)
+    runs = present[:, :-3] & present[:, 1:-2] & present[:, 2:-1] & present[:, 3:]
+    straight_draw = runs.any(axis=1).astype(np.float32)
+
+    return flush_draw, straight_draw, flush_draw * 0.5 + straight_draw * 0.5
+
+
 # ── Stack / position helpers ──────────────────────────────────────────────────
 
 def _effective_stack_bb(state, seat: int) -> float:
@@ -445,6 +451,14 @@ _init_hand_class_table()
 
 # ── Main encoder ──────────────────────────────────────────────────────────────
 
+SPR_THRESHOLD = 2.0
+BB_THRESHOLD  = 20.0
+
+def _bucket_feature_active(street, spr, eff_bb) -> bool:
+    """Whether encode_state() writes the preflop bucket one-hot [7-22]."""
+    return (street == 0) or (spr >= SPR_THRESHOLD and eff_bb >= BB_THRESHOLD)
+
+
 def encode_state(state, iteration_progress: float = 0.0) -> torch.Tensor:
     """
     Encode game state into an 80-dim feature vector.
@@ -590,9 +604,7 @@ def encode_state(state, iteration_progress: float = 0.0) -> torch.Tensor:
     # keeping it active postflop would let the net learn spurious strategies the
     # CFR regret table doesn't support. Feature vector stays 80-dim: fv[7-22]
     # are simply left as zeros when the condition is false (76-dim unchanged).
-    SPR_THRESHOLD = 2.0
-    BB_THRESHOLD  = 20.0
-    hb_active = (street == 0) or (spr >= SPR_THRESHOLD and eff_bb >= BB_THRESHOLD)
+    hb_active = _bucket_feature_active(street, spr, eff_bb)
     if hb_active:
         fv[7 + min(hand_bucket, N_BUCKETS - 1)] = 1.0
 
@@ -636,6 +648,31 @@ def encode_state(state, iteration_progress: float = 0.0) -> torch.Tensor:
     return torch.tensor(fv, dtype=torch.float32)
 
 
+def encode_state_holdings(state, holdings, buckets, iteration_progress: float = 0.0) -> torch.Tensor:
+    """
+    encode_state() for the seat to act once per candidate holding: row i as
+    if it held holdings[i] (two card codes) with preflop bucket buckets[i].
+    Only the bucket one-hot [7-22] and hand strength / draws [38-41] depend
+    on the holding, so the rest is encoded once.  Holdings must not share
+    cards with the board.  Returns (k, N_FEATURES).
+    """
+    holdings = np.asarray(holdings, dtype=np.int64).reshape(-1, 2)
+    fv       = np.repeat(encode_state(state, iteration_progress).numpy()[None, :], len(holdings), axis=0)
+    seat     = state.to_move
+
+    fv[:, 7:23] = 0.0
+    spr = state.stacks[seat] / max(state.pot, 1.0)
+    if _bucket_feature_active(getattr(state, 'street', 0), spr, _effective_stack_bb(state, seat)):
+        fv[np.arange(len(holdings)), 7 + np.minimum(buckets, N_BUCKETS - 1)] = 1.0
+
+    board = getattr(state, 'community_cards', [])
+    if getattr(state, 'hole_cards', None) and board:
+        fv[:, 38] = _postflop_hand_strength_batch(holdings, board)
+        fv[:, 39], fv[:, 40], fv[:, 41] = _draw_features_batch(holdings, board)
+
+    return torch.from_numpy(fv)
+
+
 # ── Policy helpers ────────────────────────────────────────────────────────────
 
 def policy_tensor(sigma: dict, legal_actions: list):
@@ -664,14 +701,9 @@ def mask_logits(logits, legal_actions):
 
 # ── Smoke test ────────────────────────────────────────────────────────────────
 
-class _FakeCard:
-    def __init__(self, value, suit):
-        self.value = value
-        self.suit  = suit
-
 if __name__ == '__main__':
-    hole  = [_FakeCard('A', 'SPADES'), _FakeCard('K', 'SPADES')]
-    board = [_FakeCard('Q', 'SPADES'), _FakeCard('J', 'HEARTS'), _FakeCard('2', 'CLUBS')]
+    hole  = to_codes([('A', 's'), ('K', 's')])
+    board = to_codes([('Q', 's'), ('J', 'h'), ('2', 'c')])
 
     hs = _postflop_hand_strength(hole, board)
     fd, sd, de = _draw_features(hole, board)
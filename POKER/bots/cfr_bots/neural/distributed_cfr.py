@@ -0,0 +1,343 @@
+"""
+distributed_cfr.py
+------------------------------------
+Distributed MCCFR: a coordinator that owns the regret / strategy tables and
+worker processes, on this host or others, that traverse shards of the deal
+pool and send back regret deltas over TCP.
+
+The trainer runs the coordinator (--coordinator HOST:PORT).  Workers join
+with:
+
+    python distributed_cfr.py --connect HOST:PORT --authkey KEY
+
+or are started on this host with --local-workers N.  Connections use
+multiprocessing.connection, so every message is a pickle behind an HMAC
+handshake on the shared authkey; only run workers you trust.
+
+Each sync round works like CFRWorkerPool's:
+  1. the coordinator sends each worker the info-set keys it has not seen,
+     a snapshot of sigma / average / legal (plus the cumulative regrets
+     when pruning) and its share of the iterations
+  2. the worker traverses its deal shard against that snapshot and replies
+     with the rows it touched (raw regret and strategy-weight deltas)
+  3. the coordinator merges the replies, floors the regrets and refreshes
+     sigma for the updated rows
+
+A worker that disconnects, reports an error, or does not reply within
+round_timeout (ROUND_TIMEOUT by default) is dropped.  Its partial work is
+never merged: its iterations are re-run by the remaining workers and the
+deal pool is re-split between them.  Workers can join at any time and get
+a shard from the next round on.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import random
+import threading
+import time
+import traceback
+import multiprocessing as mp
+from multiprocessing.connection import Client, Listener, wait
+
+ROUND_TIMEOUT = 600.0      # seconds a worker may take over one round before it is dropped
+
+
+def parse_address(address):
+    """"host:port" -> (host, port)."""
+    host, _, port = address.rpartition(":")
+    return (host or "localhost", int(port))
+
+
+# ── Coordinator ───────────────────────────────────────────────────────────────
+
+class _Worker:
+    __slots__ = ("conn", "name", "synced", "n_deals")
+
+    def __init__(self, conn, name):
+        self.conn    = conn
+        self.name    = name
+        self.synced  = 0        # coordinator rows this worker already knows
+        self.n_deals = 0        # size of its current deal shard
+
+
+class CFRCoordinator:
+    """
+    Owns cfr.tables and runs CFR iterations on remote workers.  Drop-in for
+    cfr.run() / CFRWorkerPool.run() in the trainer.
+    """
+
+    def __init__(self, cfr, address=("localhost", 0), authkey=b"", round_timeout=ROUND_TIMEOUT):
+        self.cfr           = cfr
+        self.authkey       = authkey
+        self.round_timeout = round_timeout
+
+        root = cfr.root
+        self._deals     = root.hand_deals
+        self._root_args = dict(
+            wallet=root.wallet, buyin=root.buyin, n_players=root.n_players,
+            tree_cache=root.tree_cache, max_cached_deals=root.children.capacity,
+        )
+
+        self._workers   = []
+        self._ids       = itertools.count()
+        self._joined    = []            # accepted, not yet given a shard
+        self._lock      = threading.Lock()
+        self._rebalance = False
+
+        self._listener = Listener(address, authkey=authkey)
+        self.address   = self._listener.address
+        self._accepter = threading.Thread(target=self._accept_loop, daemon=True)
+        self._accepter.start()
+
+    def _accept_loop(self):
+        while True:
+            try:
+                conn = self._listener.accept()
+            except OSError:
+                return                  # listener closed
+            except Exception:
+                continue                # failed handshake (wrong authkey)
+            with self._lock:
+                name = f"worker-{next(self._ids)}@{self._listener.last_accepted[0]}"
+                self._joined.append(_Worker(conn, name))
+
+    @property
+    def n_workers(self):
+        with self._lock:
+            return len(self._workers) + len(self._joined)
+
+    def wait_for_workers(self, n, timeout=None):
+        """Block until n workers have connected; False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.n_workers < n:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    # ── Membership ───────────────────────────────────────────────────────────
+
+    def _admit_joined(self):
+        with self._lock:
+            joined, self._joined = self._joined, []
+        if joined:
+            self._workers.extend(joined)
+            self._rebalance = True
+
+    def _drop(self, worker, reason):
+        print(f"\n  [coordinator] dropping {worker.name}: {reason}", flush=True)
+        try:
+            worker.conn.close()
+        except OSError:
+            pass
+        self._workers.remove(worker)
+        self._rebalance = True
+
+    def _send_shards(self):
+        """Split the deal pool evenly across the live workers."""
+        n = len(self._workers)
+        for i, worker in list(enumerate(self._workers)):
+            shard = self._deals[i::n]
+            worker.n_deals = len(shard)
+            if not shard:
+                continue                # more workers than deals: this one idles
+            try:
+                worker.conn.send(("shard", dict(self._root_args, hand_deals=shard),
+                                  self.cfr.worker_settings()))
+            except OSError:
+                self._drop(worker, "disconnected")
+                return self._send_shards()
+        self._rebalance = False
+
+    def _live_workers(self):
+        self._admit_joined()
+        while not self._workers:
+            time.sleep(0.05)            # every worker is gone; wait for one to join
+            self._admit_joined()
+        if self._rebalance:
+            self._send_shards()
+            if not self._workers:
+                return self._live_workers()
+        return self._workers
+
+    # ── Rounds ───────────────────────────────────────────────────────────────
+
+    def run(self, iterations=1, progress_interval=0):
+        from self_play_train_nlh import _print_cfr_progress
+
+        cfr        = self.cfr
+        tables     = cfr.tables
+        collector  = cfr.sample_collector
+        done = refreshed = 0
+        cfr.actions_explored = cfr.actions_pruned = 0
+
+        while done < iterations:
+            workers    = list(self._live_workers())
+            round_size = max(cfr.sigma_refresh_interval, len(workers))
+            todo       = min(round_size, iterations - done)
+            shares     = _split(todo, [w.n_deals for w in workers])
+
+            n_rows   = len(tables)
+            snapshot = (tables.sigma[:n_rows].copy(), tables.average[:n_rows].copy(),
+                        tables.legal[:n_rows].copy())
+            regrets  = cfr.pruning_regrets(n_rows)
+            regrets  = None if regrets is None else regrets.copy()
+            pending  = {}
+            for worker, share in zip(workers, shares):
+                if not share:
+                    continue
+                try:
+                    worker.conn.send(("round", worker.synced, tables.keys[worker.synced:n_rows],
+                                      *snapshot, share, random.getrandbits(32),
+                                      collector is not None, cfr.iteration, regrets))
+                except OSError:
+                    self._drop(worker, "disconnected")
+                    continue
+                worker.synced = n_rows
+                pending[worker.conn] = (worker, share)
+
+            replies = []
+            for worker, share, reply in self._gather(pending):
+                status, payload = reply
+                if status != "ok":
+                    self._drop(worker, f"failed, re-running its {share} iterations:\n{payload}")
+                    continue
+                replies.append((share, payload))
+
+            # The round's deltas count as its last iteration's contributions;
+            # shares of dropped workers are not counted and get re-run
+            returned = sum(share for share, _ in replies)
+            cfr.iteration += returned
+            for share, payload in replies:
+                keys, regrets, cum_sigma, legal, infoset_data, (explored, pruned) = payload
+                cfr.merge_deltas(keys, legal, regrets, cum_sigma)
+                if infoset_data and collector is not None:
+                    collector.merge_infoset_data(infoset_data)
+                cfr.actions_explored += explored
+                cfr.actions_pruned   += pruned
+            done += returned
+
+            refreshed += tables.refresh_dirty()
+            if progress_interval:
+                _print_cfr_progress(done, iterations)
+
+        cfr.last_refreshed_rows = refreshed
+        if progress_interval:
+            print("\r" + " " * 55 + "\r", end="", flush=True)
+
+    def _gather(self, pending):
+        """Yield (worker, share, reply) as replies arrive; drop workers that die or time out."""
+        deadline = None if self.round_timeout is None else time.monotonic() + self.round_timeout
+        while pending:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready   = wait(list(pending), timeout)
+            if not ready:
+                for worker, share in list(pending.values()):
+                    self._drop(worker, f"no reply in {self.round_timeout}s, re-running its {share} iterations")
+                return
+            for conn in ready:
+                worker, share = pending.pop(conn)
+                try:
+                    reply = conn.recv()
+                except (EOFError, OSError):
+                    self._drop(worker, f"disconnected, re-running its {share} iterations")
+                    continue
+                yield worker, share, reply
+
+    def close(self):
+        self._admit_joined()
+        for worker in self._workers:
+            try:
+                worker.conn.send(None)
+                worker.conn.close()
+            except OSError:
+                pass
+        self._workers = []
+        self._listener.close()
+
+
+def _split(total, weights):
+    """total split proportionally to weights, largest remainders first."""
+    weight_sum = sum(weights)
+    if not weight_sum:
+        weights, weight_sum = [1] * len(weights), len(weights)     # no shards yet: split evenly
+    exact  = [total * w / weight_sum for w in weights]
+    shares = [int(x) for x in exact]
+    order  = sorted(range(len(weights)), key=lambda i: shares[i] - exact[i])
+    for i in order[:total - sum(shares)]:
+        shares[i] += 1
+    return shares
+
+
+# ── Worker ────────────────────────────────────────────────────────────────────
+
+def run_worker(address, authkey=b"", connect_timeout=30.0):
+    """
+    Connect to a coordinator and serve rounds until it sends None or the
+    connection drops.
+    """
+    from self_play_train_nlh import NLHChanceNode, VanillaCFR, cfr_worker_round
+
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        try:
+            conn = Client(address, authkey=authkey)
+            break
+        except ConnectionRefusedError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.2)
+
+    cfr = None
+    try:
+        while True:
+            message = conn.recv()
+            if message is None:
+                return
+            kind, *args = message
+
+            if kind == "shard":
+                root_args, settings = args
+                root = NLHChanceNode(**root_args)
+                if cfr is None:
+                    cfr = VanillaCFR(root=root, **settings)
+                    cfr.floor_regrets = False
+                else:
+                    cfr.root = root
+                continue
+
+            try:
+                rows, keys, exported = cfr_worker_round(cfr, *args)
+                tables = cfr.tables
+                conn.send(("ok", (keys, tables.regrets[rows], tables.cum_sigma[rows],
+                                  tables.legal[rows], exported,
+                                  (cfr.actions_explored, cfr.actions_pruned))))
+            except Exception:
+                conn.send(("error", traceback.format_exc()))
+    except (EOFError, OSError):
+        return
+    finally:
+        conn.close()
+
+
+def spawn_local_workers(address, authkey, n):
+    """Start n worker processes on this host for the coordinator at address."""
+    procs = []
+    for _ in range(n):
+        proc = mp.Process(target=run_worker, args=(address, authkey), daemon=True)
+        proc.start()
+        procs.append(proc)
+    return procs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Distributed CFR worker")
+    parser.add_argument("--connect", type=str, required=True, help="Coordinator HOST:PORT")
+    parser.add_argument("--authkey", type=str, required=True, help="Shared secret set on the coordinator")
+    parser.add_argument("--connect-timeout", type=float, default=30.0,
+                        help="Seconds to keep retrying while the coordinator is not up yet")
+    args = parser.parse_args()
+
+    run_worker(parse_address(args.connect), args.authkey.encode(), args.connect_timeout)
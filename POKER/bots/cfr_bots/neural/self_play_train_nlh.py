@@ -23,6 +23,10 @@ import pickle
 import hashlib
 import json
 import psutil
+import traceback
+import multiprocessing as mp
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing import resource_tracker
 from collections import Counter
 
 # Suppress a known PyTorch false-positive: SequentialLR / epoch-level schedulers
@@ -40,7 +44,9 @@ from pathlib import Path
 SCRIPT_DIR   = Path(__file__).resolve().parent
 CFR_BOTS_DIR = SCRIPT_DIR.parent
 BOTS_DIR     = CFR_BOTS_DIR.parent
+POKER_DIR    = BOTS_DIR.parent
 sys.path.insert(0, str(BOTS_DIR))
+sys.path.insert(0, str(POKER_DIR))   # core.* (shared hand evaluators)
 
 import torch
 import torch.nn as nn
@@ -48,17 +54,40 @@ import torch.nn.functional as F
 from torch.utils.data import DataLoader, TensorDataset
 
 from cfr_bots.cfr.cfrm import CounterfactualRegretMinimizationBase
-from cfr_bots.cfr.nlh_gamestate import NLHChanceNode, _card_id
+from cfr_bots.cfr.nlh_gamestate import (
+    NLHChanceNode, NLHMutableState, STREET_NAMES, ALL_ACTIONS as TREE_ACTIONS,
+    describe_inf_set, inf_set_key_from_str, inf_set_street,
+)
+from cfr_bots.cfr.regret_tables import RegretTables, TableView
+from cfr_bots.cfr.update_rules import UPDATE_RULES, make_update_rule
+from cfr_bots.cfr.best_response import BestResponse
 from cfr_bots.cfr.export_dataset import CFRDatasetCollector
-from cfr_bots.cfr.preflop_abstraction import PreflopAbstraction
+from cfr_bots.cfr.preflop_abstraction import (
+    PreflopAbstraction, configure_postflop_cache, postflop_cache_stats
+)
+
+from core import evaluators
 
 from cfr_net import CFRNet
+# distributed_cfr imports VanillaCFR from here; when run as a script, let it
+# find this module instead of importing a second copy
+sys.modules.setdefault("self_play_train_nlh", sys.modules[__name__])
+from distributed_cfr import CFRCoordinator, ROUND_TIMEOUT, parse_address, spawn_local_workers
+from bots.game_bots.lbr_eval import lbr_evaluate
 #from state_encoder import encode_state, policy_tensor, N_FEATURES, N_ACTIONS, ALL_ACTIONS
 from combined_state_encoder import (
     encode_state, policy_tensor, N_FEATURES, N_ACTIONS, ALL_ACTIONS,
     STREET_SLICE, IDX_HAND_STRENGTH
 )
 
+def _print_cfr_progress(done, total):
+    bar = int(done / total * 20)
+    print(
+        f"\r    CFR [{'X' * bar}{'.' * (20 - bar)}] {done}/{total}",
+        end="",
+        flush=True,
+    )
+
 # ── VanillaCFR (FIXED) ────────────────────────────────────────────────────────
 
 class VanillaCFR(CounterfactualRegretMinimizationBase):
@@ -67,11 +96,70 @@ class VanillaCFR(CounterfactualRegretMinimizationBase):
 
     Chance and opponent actions are sampled.
     Traverser actions are fully expanded and regret-updated.
+
+    inplace=True walks each sampled deal with an NLHMutableState (apply /
+    undo) instead of building and caching NLHGameState children, so
+    traversal memory stays flat.  It is not reliably faster than the tree
+    with a warm deal-subtree cache, so inplace=False (the persistent tree)
+    is the default.
+
+    Regrets and strategies live in a RegretTables (one float32 row per
+    info set).  Every sigma_refresh_interval iterations, and at the end of
+    run(), sigma is recomputed for the rows that received regret updates
+    since the last refresh; last_refreshed_rows reports how many.  sigma / cumulative_regrets / cumulative_sigma /
+    nash_equilibrium are read-only dict-shaped views of it; assigning a
+    {inf_set: {action: value}} mapping to one loads it into the table.
+
+    update_rule (update_rules.make_update_rule) picks how regrets and
+    strategy weights are floored and discounted; the default "legacy" rule
+    is floored regrets with uniform averaging.  iteration counts completed
+    CFR iterations and drives the discount schedule.
+
+    Regret-based pruning (prune_threshold not None): after prune_after
+    iterations, traverser actions whose regret is <= prune_threshold and
+    whose current strategy probability is 0 are not expanded and get no
+    regret update, so node values match an unpruned traversal.  Every prune_full_every-th iteration expands
+    everything so pruned actions can recover.  actions_explored /
+    actions_pruned count traverser-node actions since the last run().
     """
 
-    def __init__(self, root, sample_collector=None):
+    def __init__(self, root, sample_collector=None, inplace=False, sigma_refresh_interval=10,
+                 update_rule=None, prune_threshold=None, prune_after=200, prune_full_every=20):
+        self.tables = RegretTables(TREE_ACTIONS)
         super().__init__(root=root, chance_sampling=True,
                          sample_collector=sample_collector)
+        self.inplace = inplace
+        self.sigma_refresh_interval = sigma_refresh_interval
+        self.last_refreshed_rows    = 0
+        self.update_rule            = update_rule or make_update_rule()
+        self.iteration              = 0
+        # Workers accumulate raw deltas; the parent floors when merging
+        self.floor_regrets          = self.update_rule.floor
+
+        self.prune_threshold  = prune_threshold
+        self.prune_after      = prune_after
+        self.prune_full_every = prune_full_every
+        self.actions_explored = 0
+        self.actions_pruned   = 0
+        self._pruning         = False
+
+    def worker_settings(self):
+        """Constructor arguments a worker's VanillaCFR needs to traverse like this one."""
+        return dict(inplace=self.inplace, prune_threshold=self.prune_threshold,
+                    prune_after=self.prune_after, prune_full_every=self.prune_full_every)
+
+    def _table_field(field):
+        def get(self):
+            return TableView(self.tables, field)
+        def load(self, table):
+            self.tables.load_dicts(field, table)
+        return property(get, load)
+
+    sigma              = _table_field("sigma")
+    cumulative_regrets = _table_field("regrets")
+    cumulative_sigma   = _table_field("cum_sigma")
+    nash_equilibrium   = _table_field("average")
+    del _table_field
 
     def _player_index(self, state):
         raw = state.to_move
@@ -81,36 +169,15 @@ class VanillaCFR(CounterfactualRegretMinimizationBase):
         if raw >= 0:            return raw
         return 0
 
-    # External Sampling Helper: ensure sigma entries exist for all actions at this infoset, then normalize.
-    def _normalize_sigma_for_actions(self, inf_set, actions):
-        self._ensure_info_set(inf_set, actions)
-
-        for a in actions:
-            if a not in self.sigma[inf_set]:
-                self.sigma[inf_set][a]              = 1.0 / len(actions)
-                self.cumulative_regrets[inf_set][a] = 0.0
-                self.cumulative_sigma[inf_set][a]   = 0.0
-                self.nash_equilibrium[inf_set][a]   = 1.0 / len(actions)
-
-        total_sigma = sum(self.sigma[inf_set][a] for a in actions)
-        if total_sigma <= 0:
-            u = 1.0 / len(actions)
-            for a in actions:
-                self.sigma[inf_set][a] = u
-        else:
-            for a in actions:
-                self.sigma[inf_set][a] /= total_sigma
-
-    # External Sampling Helper: sample an action according to sigma at this infoset, restricted to given actions.
-    def _sample_action_from_sigma(self, inf_set, actions):
-        probs = [self.sigma[inf_set][a] for a in actions]
+    # External Sampling Helper: sample an action index according to probs.
+    def _sample_action_index(self, probs):
         r = random.random()
         cum = 0.0
-        for a, p in zip(actions, probs):
+        for i, p in enumerate(probs):
             cum += p
             if r <= cum:
-                return a
-        return actions[-1]
+                return i
+        return len(probs) - 1
     
     # External-sampling MCCFR recursive traversal.
     def _cfr_external_sampling(self, state, traverser, reaches, _depth=0):
@@ -126,7 +193,8 @@ class VanillaCFR(CounterfactualRegretMinimizationBase):
 
         inf_set = state.inf_set()
         actions = state.actions
-        self._normalize_sigma_for_actions(inf_set, actions)
+        row     = self.tables.row(inf_set, actions)
+        probs   = self.tables.strategy(row, actions)
 
         player = self._player_index(state)
 
@@ -137,95 +205,213 @@ class VanillaCFR(CounterfactualRegretMinimizationBase):
         opp_reach = max(opp_reach, 1e-12)
 
         if player == traverser:
-            action_utils = {}
-            node_util = 0.0
+            action_utils = [0.0] * len(actions)
+            pruned = self._pruned_actions(row, actions, probs) if self._pruning else None
 
-            for a in actions:
+            for i, a in enumerate(actions):
+                if pruned and pruned[i]:
+                    continue
                 child = state.play(a)
                 child_reaches = list(reaches)
 
-                u = self._cfr_external_sampling(
+                action_utils[i] = self._cfr_external_sampling(
                     child,
                     traverser,
                     child_reaches,
                     _depth + 1,
                 )
 
-                action_utils[a] = u
-                node_util += self.sigma[inf_set][a] * u
-
-            for a in actions:
-                regret = action_utils[a] - node_util
-                self.cumulative_regrets[inf_set][a] = max(
-                    0.0,
-                    self.cumulative_regrets[inf_set][a] + opp_reach * regret
-                )
-
-            for a in actions:
-                self.cumulative_sigma[inf_set][a] += opp_reach * self.sigma[inf_set][a]
-
-            if self.sample_collector is not None:
-                self.sample_collector(state, self.sigma[inf_set], node_util)
-
+            node_util = sum(p * u for p, u in zip(probs, action_utils))
+            self._update_traverser_node(state, row, probs, action_utils,
+                                        node_util, opp_reach, pruned)
             return node_util
 
-        sampled_action = self._sample_action_from_sigma(inf_set, actions)
+        sampled = self._sample_action_index(probs)
         child_reaches = list(reaches)
-        child_reaches[player] *= self.sigma[inf_set][sampled_action]
+        child_reaches[player] *= probs[sampled]
 
         return self._cfr_external_sampling(
-            state.play(sampled_action),
+            state.play(actions[sampled]),
             traverser,
             child_reaches,
             _depth + 1,
         )
 
+    # In-place variant of _cfr_external_sampling on an NLHMutableState: every
+    # step is applied to the one state and undone on return.
+    def _cfr_external_sampling_inplace(self, state, traverser, reaches, _depth=0):
+        if _depth > 200:
+            raise RecursionError("CFR external-sampling depth exceeded 200")
+
+        if state.is_terminal():
+            return state.evaluation()[traverser]
+
+        if state.is_chance():
+            state.deal()
+            u = self._cfr_external_sampling_inplace(state, traverser, reaches, _depth + 1)
+            state.undo()
+            return u
+
+        inf_set = state.inf_set()
+        actions = state.actions
+        row     = self.tables.row(inf_set, actions)
+        probs   = self.tables.strategy(row, actions)
+
+        player = self._player_index(state)
+
+        opp_reach = 1.0
+        for j, rr in enumerate(reaches):
+            if j != traverser:
+                opp_reach *= rr
+        opp_reach = max(opp_reach, 1e-12)
+
+        if player == traverser:
+            action_utils = [0.0] * len(actions)
+            pruned = self._pruned_actions(row, actions, probs) if self._pruning else None
+
+            for i, a in enumerate(actions):
+                if pruned and pruned[i]:
+                    continue
+                state.apply(a)
+                action_utils[i] = self._cfr_external_sampling_inplace(
+                    state, traverser, reaches, _depth + 1)
+                state.undo()
+
+            node_util = sum(p * u for p, u in zip(probs, action_utils))
+            self._update_traverser_node(state, row, probs, action_utils,
+                                        node_util, opp_reach, pruned)
+            return node_util
+
+        sampled = self._sample_action_index(probs)
+        own_reach = reaches[player]
+        reaches[player] = own_reach * probs[sampled]
+
+        state.apply(actions[sampled])
+        u = self._cfr_external_sampling_inplace(state, traverser, reaches, _depth + 1)
+        state.undo()
+
+        reaches[player] = own_reach
+        return u
+
+    # Traverser actions to skip this visit (list of bools), or None to expand all.
+    # Only zero-probability actions are skipped, so node_util is unchanged.
+    def _pruned_actions(self, row, actions, probs):
+        if self.update_rule.discounts and self.tables.stamp[row] < self.iteration - 1:
+            self._catch_up(row)     # prune on discounted regrets
+        pruned    = self.tables.prunable(row, actions, probs, self.prune_threshold)
+        n_pruned  = sum(pruned)
+        if n_pruned == len(actions):
+            n_pruned = 0            # nothing left to expand: expand everything
+        self.actions_pruned   += n_pruned
+        self.actions_explored += len(actions) - n_pruned
+        return pruned if n_pruned else None
+
+    # Regret / average-strategy update at a traverser node (both traversal modes).
+    # Pruned actions keep their regret: their utilities were not computed.
+    def _update_traverser_node(self, state, row, probs, action_utils, node_util, opp_reach,
+                               pruned=None):
+        tables  = self.tables
+        cols    = tables.columns(state.actions)
+        if self.update_rule.discounts and tables.stamp[row] < self.iteration - 1:
+            self._catch_up(row)
+        regret_cols = cols
+        if pruned:
+            regret_cols  = cols[[not p for p in pruned]]
+            action_utils = [u for u, p in zip(action_utils, pruned) if not p]
+        regrets = tables.regrets[row]
+        regrets[regret_cols] += opp_reach * (np.array(action_utils) - node_util)
+        if self.floor_regrets:
+            regrets[regret_cols] = np.maximum(0.0, regrets[regret_cols])
+        tables.dirty.add(row)
+        tables.cum_sigma[row, cols] += opp_reach * np.array(probs)
+
+        if self.sample_collector is not None:
+            self.sample_collector(state, dict(zip(state.actions, probs)), node_util)
+
+    def _catch_up(self, rows):
+        """Apply the update rule's discounts for the iterations rows have missed."""
+        t = self.iteration - 1
+        self.tables.discount(rows, *self.update_rule.factors(self.tables.stamp[rows], t), t)
+
+    def merge_deltas(self, keys, legal, regrets, cum_sigma):
+        """Fold a worker's raw deltas in as contributions to the current iteration."""
+        tables = self.tables
+        rows   = tables.rows_for(keys, legal)
+        if self.update_rule.discounts:
+            self._catch_up(rows)
+        tables.add_deltas(rows, regrets, cum_sigma, floor_regrets=self.floor_regrets)
+
+    def pruning_regrets(self, n_rows):
+        """
+        Cumulative regrets of the first n_rows, discounted through the last
+        completed iteration, for workers to prune against; None when pruning
+        is off.  The catch-up is the one traversal would apply lazily.
+        """
+        if self.prune_threshold is None:
+            return None
+        if self.update_rule.discounts:
+            rows = np.arange(n_rows)
+            self.tables.discount(rows, *self.update_rule.factors(self.tables.stamp[rows], self.iteration),
+                                 self.iteration)
+        return self.tables.regrets[:n_rows]
+
+    def _update_sigma(self, inf_set):
+        self.tables.refresh_sigma([self.tables.index[inf_set]])
+
     def run(self, iterations=1, progress_interval=0):
         n = self.root.n_players
-        sigma_update_interval = 10  
+        sigma_update_interval = max(1, self.sigma_refresh_interval)
+        refreshed = 0
+        self.actions_explored = self.actions_pruned = 0
 
         for i in range(iterations):
-            for traverser in range(n):
-                self._cfr_external_sampling(
-                    self.root,
-                    traverser=traverser,
-                    reaches=[1.0] * n,
-                    _depth=0,
-                )
+            self.traverse_iteration()
 
             if (i + 1) % sigma_update_interval == 0:
-                for inf_set in self.cumulative_regrets:
-                    self._update_sigma(inf_set)
+                refreshed += self.tables.refresh_dirty()
 
             if progress_interval and (i + 1) % progress_interval == 0:
-                pct = (i + 1) / iterations
-                bar = int(pct * 20)
-                print(
-                    f"\r    CFR [{'X' * bar}{'.' * (20 - bar)}] {i+1}/{iterations}",
-                    end="",
-                    flush=True,
-                )
+                _print_cfr_progress(i + 1, iterations)
 
-        for inf_set in self.cumulative_regrets:
-            self._update_sigma(inf_set)
+        refreshed += self.tables.refresh_dirty()
+        self.last_refreshed_rows = refreshed
 
         if progress_interval:
             print("\r" + " " * 55 + "\r", end="", flush=True)
 
-    def compute_nash_equilibrium(self):
-        for inf_set in self.cumulative_sigma:
-            total = sum(self.cumulative_sigma[inf_set].values())
-            for a in self.nash_equilibrium[inf_set]:
-                self.nash_equilibrium[inf_set][a] = (
-                    self.cumulative_sigma[inf_set][a] / total
-                    if total > 0
-                    else 1.0 / len(self.nash_equilibrium[inf_set])
+    # One external-sampling traversal per player, against the current sigma.
+    def traverse_iteration(self):
+        n = self.root.n_players
+        self.iteration += 1
+        self._pruning = (self.prune_threshold is not None
+                         and self.iteration > self.prune_after
+                         and self.iteration % max(1, self.prune_full_every) != 0)
+        for traverser in range(n):
+            if self.inplace:
+                # Only the per-deal root is taken from the tree
+                state = NLHMutableState.from_state(self.root.sample_one())
+                self._cfr_external_sampling_inplace(
+                    state,
+                    traverser=traverser,
+                    reaches=[1.0] * n,
+                    _depth=1,
                 )
+                continue
+            self._cfr_external_sampling(
+                self.root,
+                traverser=traverser,
+                reaches=[1.0] * n,
+                _depth=0,
+            )
+
+    def compute_nash_equilibrium(self):
+        self.tables.compute_average()
 
     def value_of_the_game(self, n_samples: int = 50):
         
         #Monte-Carlo estimate of P0 game value using average strategy.
-        if not self.nash_equilibrium:
+        tables = self.tables
+        if not len(tables):
             return 0.0
 
         def _eval_one_path(state):
@@ -234,11 +420,11 @@ class VanillaCFR(CounterfactualRegretMinimizationBase):
                 return result if isinstance(result, list) else [result, -result]
             if state.is_chance():
                 return _eval_one_path(state.sample_one())
-            avg = self.nash_equilibrium.get(state.inf_set(), {})
-            if not avg:
+            row = tables.index.get(state.inf_set())
+            if row is None:
                 return [0.0] * self.root.n_players
             actions = state.actions
-            probs   = [avg.get(a, 0.0) for a in actions]
+            probs   = tables.average[row, tables.columns(actions)].tolist()
             total   = sum(probs)
             if total <= 0:
                 return [0.0] * self.root.n_players
@@ -328,6 +514,244 @@ class NLHDatasetCollector(CFRDatasetCollector):
         self._infoset_data.clear()
         self.samples.clear()
 
+    def export_infoset_data(self):
+        """Picklable copy of the per-infoset data (features as numpy), sent back by CFR workers."""
+        return {
+            inf_set: dict(data, features=None if data['features'] is None else data['features'].numpy())
+            for inf_set, data in self._infoset_data.items()
+        }
+
+    def merge_infoset_data(self, infoset_data):
+        """Fold another collector's export_infoset_data() into this one."""
+        for inf_set, other in infoset_data.items():
+            data = self._infoset_data[inf_set]
+            if data['features'] is None and other['features'] is not None:
+                data['features'] = torch.from_numpy(other['features'])
+            data['legal_actions'].update(other['legal_actions'])
+            data['sigmas'].extend(other['sigmas'])
+            data['values'].extend(other['values'])
+
+# ── Parallel MCCFR ────────────────────────────────────────────────────────────
+
+class CFRWorkerPool:
+    """
+    Runs VanillaCFR traversals in forked worker processes.
+
+    Work is done in rounds of max(sigma_refresh_interval, n_workers) CFR
+    iterations:
+      1. the parent publishes sigma / average / legal (and, when pruning,
+         the cumulative regrets) for every known info set in one
+         shared-memory block and sends each worker the keys added since
+         the previous round
+      2. each worker lines its RegretTables up with the parent's rows, runs
+         its share of the iterations against that fixed sigma and
+         accumulates raw regret / strategy-weight deltas
+      3. each worker writes the rows it touched to its own shared-memory
+         block; the parent merges them (RegretTables.merge), floors the
+         regrets once and refreshes sigma for the updated rows
+
+    Sigma is held fixed within a round just as VanillaCFR.run holds it
+    between refreshes.  The only difference from a single process is that
+    the regret floor is applied once per round rather than after every visit.
+    """
+
+    def __init__(self, cfr, n_workers):
+        self.cfr       = cfr
+        self.n_workers = n_workers
+        self._n_synced = 0          # parent rows the workers already know
+
+        # One resource tracker for every process, so blocks created in one and
+        # unlinked in another are not reported as leaked
+        resource_tracker.ensure_running()
+        ctx = mp.get_context("fork")
+        self._conns = []
+        self._procs = []
+        for _ in range(n_workers):
+            conn, child_conn = ctx.Pipe()
+            proc = ctx.Process(target=_cfr_worker_main,
+                               args=(child_conn, cfr.root, cfr.worker_settings()), daemon=True)
+            proc.start()
+            child_conn.close()
+            self._conns.append(conn)
+            self._procs.append(proc)
+
+    def run(self, iterations=1, progress_interval=0):
+        cfr        = self.cfr
+        tables     = cfr.tables
+        collector  = cfr.sample_collector
+        round_size = max(cfr.sigma_refresh_interval, self.n_workers)
+        done = refreshed = 0
+        cfr.actions_explored = cfr.actions_pruned = 0
+
+        while done < iterations:
+            todo   = min(round_size, iterations - done)
+            shares = [todo // self.n_workers + (w < todo % self.n_workers)
+                      for w in range(self.n_workers)]
+
+            n_rows   = len(tables)
+            new_keys = tables.keys[self._n_synced:n_rows]
+            regrets  = cfr.pruning_regrets(n_rows)
+            block    = _publish_rows(tables, n_rows, regrets)
+            try:
+                for conn, share in zip(self._conns, shares):
+                    conn.send((self._n_synced, new_keys, block.name, n_rows, share,
+                               random.getrandbits(32), collector is not None, cfr.iteration,
+                               regrets is not None))
+                self._n_synced = n_rows
+                replies = [conn.recv() for conn in self._conns]
+            finally:
+                block.close()
+                block.unlink()
+
+            # Nothing is merged unless every worker succeeded; the blocks of the
+            # ones that did are released before raising
+            failed = [payload for status, payload in replies if status != "ok"]
+            if failed:
+                for status, payload in replies:
+                    if status == "ok":
+                        _release_block(payload[1])
+                raise RuntimeError("CFR worker failed:\n" + "\n".join(failed))
+
+            # The round's deltas count as its last iteration's contributions
+            cfr.iteration += todo
+            for status, payload in replies:
+                self._merge(*payload, collector)
+
+            refreshed += tables.refresh_dirty()
+            done += todo
+            if progress_interval:
+                _print_cfr_progress(done, iterations)
+
+        cfr.last_refreshed_rows = refreshed
+        if progress_interval:
+            print("\r" + " " * 55 + "\r", end="", flush=True)
+
+    def _merge(self, keys, block_name, infoset_data, counts, collector):
+        block = SharedMemory(name=block_name)
+        try:
+            regrets, cum_sigma, legal = _row_views(block, len(keys), len(self.cfr.tables.actions))
+            self.cfr.merge_deltas(keys, legal, regrets, cum_sigma)
+            del regrets, cum_sigma, legal
+        finally:
+            block.close()
+            block.unlink()
+        if infoset_data and collector is not None:
+            collector.merge_infoset_data(infoset_data)
+        self.cfr.actions_explored += counts[0]
+        self.cfr.actions_pruned   += counts[1]
+
+    def close(self):
+        for conn in self._conns:
+            conn.send(None)
+        for proc in self._procs:
+            proc.join()
+        self._conns, self._procs = [], []
+
+
+# A block holds three (n_rows, width) arrays: two float32 tables then a bool mask,
+# optionally followed by the parent's regrets (float32) for pruning.
+def _block_size(n_rows, width, with_regrets=False):
+    return max(1, n_rows * width * (4 + 4 + 1 + 4 * with_regrets))
+
+def _row_views(block, n_rows, width):
+    cells = n_rows * width
+    a     = np.ndarray((n_rows, width), np.float32, block.buf, 0)
+    b     = np.ndarray((n_rows, width), np.float32, block.buf, 4 * cells)
+    legal = np.ndarray((n_rows, width), np.bool_, block.buf, 8 * cells)
+    return a, b, legal
+
+def _release_block(name):
+    block = SharedMemory(name=name)
+    block.close()
+    block.unlink()
+
+def _regret_view(block, n_rows, width):
+    return np.ndarray((n_rows, width), np.float32, block.buf, 9 * n_rows * width)
+
+def _publish_rows(tables, n_rows, regrets=None):
+    width = len(tables.actions)
+    block = SharedMemory(create=True, size=_block_size(n_rows, width, regrets is not None))
+    sigma, average, legal = _row_views(block, n_rows, width)
+    sigma[:]   = tables.sigma[:n_rows]
+    average[:] = tables.average[:n_rows]
+    legal[:]   = tables.legal[:n_rows]
+    del sigma, average, legal
+    if regrets is not None:
+        _regret_view(block, n_rows, width)[:] = regrets
+    return block
+
+
+def cfr_worker_round(cfr, n_keep, new_keys, sigma, average, legal, iterations, seed, collect,
+                     iteration=0, regrets=None):
+    """
+    Worker side of one sync round, shared by CFRWorkerPool and the TCP
+    workers in distributed_cfr.  Lines cfr.tables up with the parent's
+    rows, runs the iterations (numbered on from the parent's iteration)
+    against the parent's sigma and returns the touched rows, their keys and
+    the exported collector data (or None); cfr.actions_explored /
+    actions_pruned count the round.  cfr.floor_regrets must be off so the
+    rows hold raw deltas.  regrets (the parent's pruning_regrets) let
+    pruning see cumulative regrets rather than the round's deltas.
+    """
+    tables = cfr.tables
+    tables.sync_keys(n_keep, new_keys)
+    tables.load_rows(sigma, average, legal, regrets)
+    cfr.iteration = iteration
+    cfr.actions_explored = cfr.actions_pruned = 0
+
+    random.seed(seed)
+    np.random.seed(seed)
+    cfr.root.new_iteration()
+    cfr.sample_collector = (NLHDatasetCollector(encode_state, cfr_ref=cfr)
+                            if collect else None)
+    for _ in range(iterations):
+        cfr.traverse_iteration()
+
+    # Rows with regret updates or new legal actions, plus rows first seen here
+    touched = set(tables.dirty)
+    touched.update(range(len(sigma), len(tables)))
+    rows = np.array(sorted(touched), dtype=np.intp)
+
+    keys     = [tables.keys[r] for r in rows.tolist()]
+    exported = (cfr.sample_collector.export_infoset_data()
+                if cfr.sample_collector is not None else None)
+    cfr.sample_collector = None
+    return rows, keys, exported
+
+
+def _cfr_worker_main(conn, root, settings):
+    cfr = VanillaCFR(root=root, **settings)
+    cfr.floor_regrets = False
+    tables = cfr.tables
+    width  = len(tables.actions)
+
+    while True:
+        task = conn.recv()
+        if task is None:
+            break
+        n_keep, new_keys, block_name, n_rows, iterations, seed, collect, iteration, pruning = task
+        try:
+            block = SharedMemory(name=block_name)
+            sigma, average, legal = _row_views(block, n_rows, width)
+            regrets = _regret_view(block, n_rows, width) if pruning else None
+            rows, keys, exported = cfr_worker_round(cfr, n_keep, new_keys, sigma, average, legal,
+                                                    iterations, seed, collect, iteration, regrets)
+            del sigma, average, legal, regrets
+            block.close()
+
+            out = SharedMemory(create=True, size=_block_size(len(rows), width))
+            regrets, cum_sigma, legal = _row_views(out, len(rows), width)
+            regrets[:]   = tables.regrets[rows]
+            cum_sigma[:] = tables.cum_sigma[rows]
+            legal[:]     = tables.legal[rows]
+            del regrets, cum_sigma, legal
+            out.close()
+
+            counts = (cfr.actions_explored, cfr.actions_pruned)
+            conn.send(("ok", (keys, out.name, exported, counts)))
+        except Exception:
+            conn.send(("error", traceback.format_exc()))
+
 # ── Neural net training  ───────────────────────────────────────────────
 
 def train_net_on_samples(net, optimizer, samples, device, epochs=10,
@@ -477,7 +901,7 @@ def _safe_entropy(probs_dict):
     return -sum(p * math.log(p + 1e-12) for p in probs)
 
 
-def _print_active_infoset_summary(cfr, collector, top_k=10, street_filter=".PRE."):
+def _print_active_infoset_summary(cfr, collector, top_k=10, street=0):
     """
     Print the most-visited infosets from THIS iteration, not hard-coded nodes
     and not arbitrary first dict entries.
@@ -485,7 +909,7 @@ def _print_active_infoset_summary(cfr, collector, top_k=10, street_filter=".PRE.
     rows = []
 
     for inf_set, data in collector._infoset_data.items():
-        if street_filter not in inf_set:
+        if inf_set_street(inf_set) != street:
             continue
 
         n_visits = len(data.get("values", []))
@@ -524,11 +948,11 @@ def _print_active_infoset_summary(cfr, collector, top_k=10, street_filter=".PRE.
 
     rows.sort(key=lambda r: (r["visits"], r["entropy_avg"]), reverse=True)
 
-    label = street_filter.strip(".")
+    label = STREET_NAMES[street]
     print(f"  [DIAG] Top {min(top_k, len(rows))} active infosets [{label}]:")
 
     for row in rows[:top_k]:
-        print(f"    [NODE] {row['inf_set']}")
+        print(f"    [NODE] {describe_inf_set(row['inf_set'])}")
         print(f"      visits_this_iter : {row['visits']}")
         print(f"      avg_value_target : {row['avg_value']:+.4f}")
         print(f"      legal_actions    : {row['legal_actions']}")
@@ -553,14 +977,14 @@ def _print_preflop_bucket_summary(collector, top_k=12):
     bucket_infosets = Counter()
 
     for inf_set, data in collector._infoset_data.items():
-        if ".PRE." not in inf_set:
+        if inf_set_street(inf_set) != 0:
             continue
 
         n_visits = len(data.get("values", []))
         if n_visits <= 0:
             continue
 
-        parts = inf_set.split(".")
+        parts = describe_inf_set(inf_set).split(".")
         if len(parts) < 2:
             continue
 
@@ -574,14 +998,14 @@ def _print_preflop_bucket_summary(collector, top_k=12):
 
 
 def _print_preflop_coverage_summary(cfr, collector):
-    total_pre = sum(1 for k in cfr.cumulative_regrets if ".PRE." in k)
+    total_pre = sum(1 for k in cfr.cumulative_regrets if inf_set_street(k) == 0)
     active_pre = 0
     total_pre_visits = 0
     one_visit = 0
     multi_visit = 0
 
     for inf_set, data in collector._infoset_data.items():
-        if ".PRE." not in inf_set:
+        if inf_set_street(inf_set) != 0:
             continue
         n = len(data.get("values", []))
         if n > 0:
@@ -601,6 +1025,13 @@ def _print_preflop_coverage_summary(cfr, collector):
     print(f"    multi_visit_infosets : {multi_visit}")
     print(f"    avg_visits_active    : {avg_visits:.2f}")
 
+def _rekey_legacy_infosets(cfr_state):
+    """CFR state saved before packed info set keys used strings; convert in place."""
+    for name in ('cumulative_regrets', 'cumulative_sigma', 'nash_equilibrium', 'sigma'):
+        table = cfr_state[name]
+        for inf_set in [k for k in table if isinstance(k, str)]:
+            table[inf_set_key_from_str(inf_set)] = table.pop(inf_set)
+
 # ── Main self-play loop ───────────────────────────────────────────────────────
 
 def self_play_train(
@@ -613,7 +1044,34 @@ def self_play_train(
     net_epochs:     int   = 10,
     checkpoint_dir: str   = str(CFR_BOTS_DIR / "checkpoints"),
     resume_path:    str   = None,
+    evaluator:      str   = None,
+    equity_cache_size:   int = 200_000,
+    equity_cache_policy: str = "lru",
+    traversal:           str = "tree",
+    tree_cache:          str = "lru",
+    tree_cache_deals:    int = 256,
+    sigma_refresh:       int = 10,
+    workers:             int = 1,
+    coordinator:         str = None,
+    authkey:             str = None,
+    local_workers:       int = 0,
+    round_timeout:       float = ROUND_TIMEOUT,
+    update_rule:         str = "legacy",
+    dcfr_alpha:          float = 1.5,
+    dcfr_beta:           float = 0.0,
+    dcfr_gamma:          float = 2.0,
+    prune_threshold:     float = None,
+    prune_after:         int = 200,
+    prune_full_every:    int = 20,
+    br_every:            int = 0,
+    target_exploitability: float = None,
+    lbr_hands:           int = 0,
+    lbr_workers:         int = 1,
 ):
+    if evaluator is not None:
+        evaluators.set_backend(evaluator)
+    configure_postflop_cache(equity_cache_size, equity_cache_policy)
+
     device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
     out_dir = Path(checkpoint_dir)
@@ -624,6 +1082,7 @@ def self_play_train(
     last_path  = out_dir / f"last_{ckpt_stem}.pt"
     best_path  = out_dir / f"best_{ckpt_stem}.pt"
     best_txt   = out_dir / f"best_{ckpt_stem}.txt"
+    best_lbr_txt = out_dir / f"best_{ckpt_stem}_lbr.txt"
 
     print(f"\n{'='*60}")
     print(f"  NLH CFR + Neural Net Self-Play Trainer  [FIXED v5]")
@@ -634,6 +1093,28 @@ def self_play_train(
     print(f"  Outer iterations:  {n_iterations}")
     print(f"  CFR iters/cycle:   {cfr_iterations}")
     print(f"  Net epochs/cycle:  {net_epochs}")
+    print(f"  Hand evaluator:    {evaluators.backend_name()}")
+    print(f"  Equity cache:      {equity_cache_size or 'unbounded'} entries, {equity_cache_policy}")
+    print(f"  CFR traversal:     {traversal}")
+    print(f"  Sigma refresh:     every {sigma_refresh} CFR iters (updated rows only)")
+    print(f"  CFR update rule:   {make_update_rule(update_rule, dcfr_alpha, dcfr_beta, dcfr_gamma)!r}")
+    if prune_threshold is None:
+        print(f"  Regret pruning:    off")
+    else:
+        print(f"  Regret pruning:    regret <= {prune_threshold} after {prune_after} CFR iters, "
+              f"full pass every {prune_full_every}")
+    if coordinator:
+        print(f"  CFR coordinator:   {coordinator}  ({local_workers} local workers)")
+    else:
+        print(f"  CFR workers:       {workers}" + (" (merged every sigma refresh)" if workers > 1 else ""))
+    print(f"  Tree cache:        {tree_cache}" + (f" ({tree_cache_deals} deals)" if tree_cache == "lru" else ""))
+    if br_every:
+        print(f"  Exploitability:    every {br_every} outer iters"
+              + (f", stop at <= {target_exploitability} chips/hand" if target_exploitability is not None else ""))
+    if lbr_hands:
+        print(f"  Best checkpoint:   lowest LBR mbb/hand, {lbr_hands:,} hands on {lbr_workers} workers")
+    else:
+        print(f"  Best checkpoint:   lowest val loss")
     print(f"{'='*60}\n")
 
     # ── Build deal pool ───────────────────────────────────────────────────────
@@ -663,6 +1144,7 @@ def self_play_train(
 
     lr        = 2e-4      # FIX D: lower lr prevents overshoot at start
     best_loss = float("inf")
+    best_lbr  = float("inf")
 
     optimizer = torch.optim.Adam(net.parameters(), lr=lr)
     
@@ -712,9 +1194,14 @@ def self_play_train(
 
     # ── Pre-compute equity and board for every deal ───────────────────────────
     from cfr_bots.cfr.preflop_abstraction import preflop_equity_vs_random, _make_deck
+    from cfr_bots.cfr.preflop_equity_table import TABLE_PATH, get_table
 
     canonical_deck = _make_deck()
     equity_sims    = 50
+    if get_table() is not None:
+        print(f"Preflop equity from table {TABLE_PATH.name}")
+    else:
+        print(f"Preflop equity table missing, Monte Carlo with {equity_sims} sims per deal")
     n_valid        = sum(1 for d in deals if isinstance(d, dict) and 'hole_cards' in d)
     processed      = 0
     rng = random.Random(42)
@@ -732,8 +1219,8 @@ def self_play_train(
             list(deal['hole_cards'][0]), n_simulations=equity_sims
         )
 
-        hole_ids  = {_card_id(c) for hc in deal['hole_cards'] for c in hc}
-        remaining = [c for c in canonical_deck if _card_id(c) not in hole_ids]
+        hole_ids  = {c for hc in deal['hole_cards'] for c in hc}
+        remaining = [c for c in canonical_deck if c not in hole_ids]
 
         rng.shuffle(remaining)
         deal['board'] = remaining[:5]
@@ -746,8 +1233,14 @@ def self_play_train(
         wallet=wallet,
         buyin=buyin,
         n_players=n_players,
+        tree_cache=tree_cache,
+        max_cached_deals=tree_cache_deals,
     )
-    cfr = VanillaCFR(root=root)
+    cfr = VanillaCFR(root=root, inplace=(traversal == "inplace"),
+                     sigma_refresh_interval=sigma_refresh,
+                     update_rule=make_update_rule(update_rule, dcfr_alpha, dcfr_beta, dcfr_gamma),
+                     prune_threshold=prune_threshold, prune_after=prune_after,
+                     prune_full_every=prune_full_every)
 
     # ── Load persisted CFR state if available ─────────────────────────────────
     if cfr_state_path.exists():
@@ -755,23 +1248,48 @@ def self_play_train(
         try:
             with open(cfr_state_path, 'rb') as f:
                 cfr_state = pickle.load(f)
-            cfr.cumulative_regrets = cfr_state['cumulative_regrets']
-            cfr.cumulative_sigma   = cfr_state['cumulative_sigma']
-            cfr.nash_equilibrium   = cfr_state['nash_equilibrium']
-            cfr.sigma              = cfr_state['sigma']
-            print(f"done. ({len(cfr.cumulative_regrets):,} info sets loaded)")
+            if 'tables' in cfr_state:
+                cfr.tables.load_state_dict(cfr_state['tables'])
+                cfr.iteration = cfr_state.get('iteration', 0)
+            else:
+                # dict-of-dicts state from before RegretTables
+                _rekey_legacy_infosets(cfr_state)
+                cfr.cumulative_regrets = cfr_state['cumulative_regrets']
+                cfr.cumulative_sigma   = cfr_state['cumulative_sigma']
+                cfr.nash_equilibrium   = cfr_state['nash_equilibrium']
+                cfr.sigma              = cfr_state['sigma']
+            print(f"done. ({len(cfr.tables):,} info sets loaded)")
         except Exception as e:
             print(f"failed ({e}), starting fresh.")
     else:
         print(f"No CFR state found at {cfr_state_path}, starting fresh.")
 
+    # Forked after the state load; workers pick up the loaded rows on their first round
+    if coordinator:
+        if not authkey:
+            raise ValueError("--coordinator needs --authkey (shared with the workers)")
+        pool = CFRCoordinator(cfr, parse_address(coordinator), authkey.encode(), round_timeout)
+        spawn_local_workers(pool.address, authkey.encode(), local_workers)
+        print(f"  Waiting for CFR workers on {pool.address[0]}:{pool.address[1]}...", flush=True)
+        pool.wait_for_workers(max(1, local_workers))
+    elif workers > 1:
+        pool = CFRWorkerPool(cfr, workers)
+    else:
+        pool = None
+
+    best_response = None
+    if br_every:
+        print("Pre-computing best-response tables...", end=" ", flush=True)
+        best_response = BestResponse(root)
+        print("done.")
+
     # Sliding-window replay buffer instead of full accumulation.
     iter_sample_history = []     # list-of-lists, one entry per outer iteration
     replay_window = 20_000       # New strat moved from 90000 to 20000 samples, not thats like 15+
     val_loss = float("inf")      # initialize before loop
 
-    print(f"{'Iter':>5} | {'New':>6}  | {'States':>7} | {'Pol Loss':>9} | {'Val Loss':>9} | {'Avg Strat Entropy':>9} | {'Game Val':>9} | Ep/LR             | RAM USED ")
-    print("-" * 115)
+    print(f"{'Iter':>5} | {'New':>6}  | {'States':>7} | {'Pol Loss':>9} | {'Val Loss':>9} | {'Avg Strat Entropy':>9} | {'Game Val':>9} | Ep/LR             | RAM USED | Eq cache hit/size/evict | Sigma rows | Pruned")
+    print("-" * 167)
 
     for iteration in range(1, n_iterations + 1):
 
@@ -782,38 +1300,35 @@ def self_play_train(
         )
 
         cfr.sample_collector = collector
-        cfr.run(iterations=cfr_iterations, progress_interval=max(1, min(50, cfr_iterations // 10)))
+        cfr_runner = pool if pool is not None else cfr
+        cfr_runner.run(iterations=cfr_iterations, progress_interval=max(1, min(50, cfr_iterations // 10)))
         cfr.sample_collector = None
 
         cfr.compute_nash_equilibrium()
         game_value = cfr.value_of_the_game(n_samples=250)
 
-        entropies = []
-        for inf_set, actions in cfr.nash_equilibrium.items():
-            probs = list(actions.values())
-            total = sum(probs)
-            if total > 0:
-                probs = [p/total for p in probs]
-                h = -sum(p * math.log(p+1e-10) for p in probs)
-                entropies.append(h)
-        avg_entropy = sum(entropies) / max(len(entropies), 1)
+        avg_entropy = cfr.tables.mean_entropy()
+
+        exploitability = None
+        if best_response is not None and iteration % br_every == 0:
+            br_result      = best_response.exploitability(cfr.tables)
+            exploitability = br_result["exploitability"]
+            print(f"  [BR] exploitability={exploitability:.4f} chips/hand  "
+                  f"nash_conv={br_result['nash_conv']:.4f}  "
+                  f"best_response={[round(v, 4) for v in br_result['best_response']]}  "
+                  f"values={[round(v, 4) for v in br_result['values']]}")
 
         # ── Save CFR state after every iteration ──────────────────────────────
         try:
             with open(cfr_state_path, 'wb') as f:
-                pickle.dump({
-                    'cumulative_regrets': cfr.cumulative_regrets,
-                    'cumulative_sigma':   cfr.cumulative_sigma,
-                    'nash_equilibrium':   cfr.nash_equilibrium,
-                    'sigma':              cfr.sigma,
-                }, f)
+                pickle.dump({'tables': cfr.tables.state_dict(), 'iteration': cfr.iteration}, f)
         except Exception as e:
             print(f"  WARNING: CFR state save failed: {e}")
 
         new_samples = collector.get_dataset()
 
-        _print_active_infoset_summary(cfr, collector, top_k=3, street_filter=".PRE.")
-        _print_active_infoset_summary(cfr, collector, top_k=3, street_filter=".FLP.")
+        _print_active_infoset_summary(cfr, collector, top_k=3, street=0)
+        _print_active_infoset_summary(cfr, collector, top_k=3, street=1)
 
         collector.reset()
 
@@ -970,6 +1485,7 @@ def self_play_train(
             "scheduler_state":scheduler.state_dict(),
             "game_value":     game_value,
             "avg_entropy":    avg_entropy,
+            "exploitability": exploitability,
             "net_loss":       net_loss,
             "pol_loss":       pol_loss,
             "val_loss":       val_loss,
@@ -983,8 +1499,23 @@ def self_play_train(
         # Always save latest weights so --resume never loses progress
         torch.save(ckpt_payload,last_path)
 
-        # Save best checkpoint when val_loss strictly improves
-        if val_loss < best_loss:
+        # With --lbr-hands, best = least exploited by LBR when played through the engine;
+        # one seed for every checkpoint, so they all play the same deals
+        if lbr_hands:
+            lbr = lbr_evaluate(last_path, n_players, buyin, wallet, lbr_hands, lbr_workers, seed=0)
+            print(f"  [LBR] {lbr['mbb_per_hand']:+.1f} ± {lbr['ci95']:.1f} mbb/hand over {lbr['hands']:,} hands")
+            ckpt_payload["lbr_mbb_per_hand"] = lbr["mbb_per_hand"]
+            ckpt_payload["lbr_ci95"]         = lbr["ci95"]
+            if lbr["mbb_per_hand"] < best_lbr:
+                best_lbr = lbr["mbb_per_hand"]
+                stored_lbr = float(best_lbr_txt.read_text()) if best_lbr_txt.exists() else float("inf")
+                if best_lbr < stored_lbr:
+                    torch.save(ckpt_payload, best_path)
+                    best_lbr_txt.write_text(str(best_lbr))
+                    saved_tag = "    [BEST SAVED]"
+
+        # Otherwise save best checkpoint when val_loss strictly improves
+        elif val_loss < best_loss:
             best_loss = val_loss
             # Read stored best loss if the file exists, otherwise treat as inf
             stored_loss = float(best_txt.read_text()) if best_txt.exists() else float("inf")
@@ -993,12 +1524,30 @@ def self_play_train(
                 best_txt.write_text(str(best_loss))
                 saved_tag = "    [BEST SAVED]"
 
+        cache = postflop_cache_stats()
         print(f"{iteration:>5} | {len(new_samples):>6,} | {len(accumulated_samples):>7,} | "
               f"{pol_loss:>9.4f} | {val_loss:>9.4f} |         {avg_entropy:>9.4f} | {game_value:>9.4f} | ep={adaptive_epochs} lr={scheduler.get_last_lr()[0]:.2e} |  {psutil.Process(os.getpid()).memory_info().rss / 1e9:.2f} GB   "  
+              f"| {cache['hit_rate']:>4.0%} {cache['size']:>7,} {cache['evictions']:>7,}   "
+              f"| {cfr.last_refreshed_rows:>10,} "
+              f"| {cfr.actions_pruned / max(1, cfr.actions_pruned + cfr.actions_explored):>6.1%}"
               f"{saved_tag}")
 
+        # Release this iteration's deal subtrees ("iteration" tree cache)
+        root.new_iteration()
+
+        if (exploitability is not None and target_exploitability is not None
+                and exploitability <= target_exploitability):
+            print(f"\n  Exploitability {exploitability:.4f} <= target {target_exploitability}, stopping.")
+            break
+
+    if pool is not None:
+        pool.close()
+
     # Fix the end-of-run print to show actual paths
-    print(f"\n  Best val loss: {best_loss:.4f}")
+    if lbr_hands:
+        print(f"\n  Best LBR: {best_lbr:+.1f} mbb/hand")
+    else:
+        print(f"\n  Best val loss: {best_loss:.4f}")
     print(f"  Best model:  {best_path}")
     print(f"  Last model:  {last_path}")
     print(f"{'='*60}\n")
@@ -1020,6 +1569,52 @@ if __name__ == "__main__":
     parser.add_argument("--epochs",  type=int,   default=10)
     parser.add_argument("--resume",  type=str,   default=None,
                         help="Path to checkpoint .pt to resume from")
+    parser.add_argument("--evaluator", type=str, default=None,
+                        choices=sorted(evaluators.BACKENDS),
+                        help="Hand evaluator backend (default: $POKER_EVALUATOR or lookup)")
+    parser.add_argument("--equity-cache-size", type=int, default=200_000,
+                        help="Max postflop equity cache entries (0 = unbounded)")
+    parser.add_argument("--equity-cache-policy", type=str, default="lru", choices=["lru", "lfu"])
+    parser.add_argument("--tree-cache", type=str, default="lru", choices=["all", "iteration", "lru", "none"],
+                        help="How long explored deal subtrees stay in memory (all = never released)")
+    parser.add_argument("--tree-cache-deals", type=int, default=256,
+                        help="Deal subtrees kept by --tree-cache lru")
+    parser.add_argument("--sigma-refresh", type=int, default=10,
+                        help="CFR iterations between sigma refreshes of the info sets updated since the last one")
+    parser.add_argument("--traversal", type=str, default="tree", choices=["tree", "inplace"],
+                        help="tree = cached immutable nodes; inplace = make/unmake on one mutable state "
+                             "(flat memory, not reliably faster than a warm --tree-cache)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="CFR traversal processes; per-worker regret deltas are merged every sigma refresh")
+    parser.add_argument("--update-rule", type=str, default="legacy", choices=UPDATE_RULES,
+                        help="Regret / average-strategy update: legacy = floored regrets, uniform "
+                             "averaging; cfr+, linear (Linear CFR) and dcfr converge in fewer iterations")
+    parser.add_argument("--dcfr-alpha", type=float, default=1.5, help="DCFR positive-regret discount exponent")
+    parser.add_argument("--dcfr-beta",  type=float, default=0.0, help="DCFR negative-regret discount exponent")
+    parser.add_argument("--dcfr-gamma", type=float, default=2.0, help="DCFR average-strategy discount exponent")
+    parser.add_argument("--prune-threshold", type=float, default=None,
+                        help="Skip zero-probability traverser actions with regret <= this (off by default; 0 suits the "
+                             "floored legacy / cfr+ rules, a negative value linear / dcfr)")
+    parser.add_argument("--prune-after", type=int, default=200,
+                        help="CFR iterations (in total) before pruning starts")
+    parser.add_argument("--prune-full-every", type=int, default=20,
+                        help="Every Nth CFR iteration expands every action")
+    parser.add_argument("--coordinator", type=str, default=None,
+                        help="HOST:PORT to serve tables on; CFR runs on workers started with distributed_cfr.py")
+    parser.add_argument("--authkey", type=str, default=os.environ.get("POKER_CFR_AUTHKEY"),
+                        help="Shared secret for coordinator / worker connections (default: $POKER_CFR_AUTHKEY)")
+    parser.add_argument("--local-workers", type=int, default=0,
+                        help="Workers to start on this host for --coordinator")
+    parser.add_argument("--round-timeout", type=float, default=ROUND_TIMEOUT,
+                        help="Seconds before a silent worker is dropped and its iterations re-run")
+    parser.add_argument("--br-every", type=int, default=0,
+                        help="Compute the exact exploitability of the average strategy every N outer iters (0 = off)")
+    parser.add_argument("--target-exploitability", type=float, default=None,
+                        help="Stop once exploitability (chips/hand) is at or below this; needs --br-every")
+    parser.add_argument("--lbr-hands", type=int, default=0,
+                        help="Pick the best checkpoint by LBR mbb/hand over this many hands per outer iter "
+                             "instead of val loss (0 = off)")
+    parser.add_argument("--lbr-workers", type=int, default=1, help="Processes for the LBR evaluation")
     args = parser.parse_args()
 
     self_play_train(
@@ -1031,4 +1626,27 @@ if __name__ == "__main__":
         cfr_iterations = args.cfr,
         net_epochs     = args.epochs,
         resume_path    = args.resume,
+        evaluator      = args.evaluator,
+        equity_cache_size   = args.equity_cache_size or None,
+        equity_cache_policy = args.equity_cache_policy,
+        traversal           = args.traversal,
+        tree_cache          = args.tree_cache,
+        tree_cache_deals    = args.tree_cache_deals,
+        sigma_refresh       = args.sigma_refresh,
+        workers             = args.workers,
+        coordinator         = args.coordinator,
+        authkey             = args.authkey,
+        local_workers       = args.local_workers,
+        round_timeout       = args.round_timeout,
+        update_rule         = args.update_rule,
+        dcfr_alpha          = args.dcfr_alpha,
+        dcfr_beta           = args.dcfr_beta,
+        dcfr_gamma          = args.dcfr_gamma,
+        prune_threshold     = args.prune_threshold,
+        prune_after         = args.prune_after,
+        prune_full_every    = args.prune_full_every,
+        br_every            = args.br_every,
+        target_exploitability = args.target_exploitability,
+        lbr_hands           = args.lbr_hands,
+        lbr_workers         = args.lbr_workers,
     )
\ No newline at end of file
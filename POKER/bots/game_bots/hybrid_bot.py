@@ -10,16 +10,20 @@ from __future__ import annotations
 from typing import Optional
 import random
 
+import numpy as np
 import torch
 import torch.nn.functional as F
 from core.card import Card
+from core.card_codes import cards_to_codes
 from core.table_state import TableState
 from core.player_action import PlayerAction, ActionType
 from engine.game_state import GamePhase
 
 from bots.cfr_bots.neural.cfr_net import CFRNet
 from bots.cfr_bots.cfr.preflop_abstraction import hand_to_bucket as _cfr_hand_to_bucket
-from bots.cfr_bots.neural.combined_state_encoder import encode_state, mask_logits, N_FEATURES, N_ACTIONS, ALL_ACTIONS
+from bots.cfr_bots.neural.combined_state_encoder import (
+    encode_state, encode_state_holdings, mask_logits, N_FEATURES, N_ACTIONS, ALL_ACTIONS,
+)
 
 # ── Hand bucket mapping ───────────────────────────────────────────────────────
 _ENGINE_TO_CFR_RANK = {
@@ -60,8 +64,9 @@ class EngineStateProxy:
         self.n_raises        = n_raises
         self.folded          = {i for i, p in enumerate(table.players) if p.folded}
         self.street          = _PHASE_TO_STREET.get(phase, 0)
-        self.community_cards = list(table.community_cards)
-        self.hole_cards      = [p.hand for p in table.players]
+        # Engine Cards -> integer codes, the format the CFR encoder works on
+        self.community_cards = cards_to_codes(table.community_cards)
+        self.hole_cards      = [cards_to_codes(p.hand) for p in table.players]
         self.buyin           = table.buy_in
         self.last_raise_size = table.last_raise_size
 
@@ -135,11 +140,10 @@ class HybridPokerBot:
     
     # ── Core decision logic ────────────────────────────────────────────────────
     
-    def decide(self) -> tuple[str, PlayerAction]:
-        """Choose directly from the CFR average strategy."""
+    def legal_actions(self) -> list[str]:
+        """Abstract actions decide() chooses from in the current table state."""
         player  = self.table.players[self.player_index]
         to_call = self.table.current_bet - player.bet
-        stack   = player.cash
 
         legal = []
         if to_call > 0:
@@ -150,9 +154,17 @@ class HybridPokerBot:
         if self._n_raises < MAX_RAISES:
             legal += ["RAISE_2", "RAISE_4"]
 
-        if stack > 0 and self._current_street != GamePhase.PREFLOP:
+        if player.cash > 0 and self._current_street != GamePhase.PREFLOP:
             legal.append("ALLIN")
+        return legal
+
+    def decide(self) -> tuple[str, PlayerAction]:
+        """Choose directly from the CFR average strategy."""
+        player  = self.table.players[self.player_index]
+        to_call = self.table.current_bet - player.bet
+        stack   = player.cash
 
+        legal  = self.legal_actions()
         policy = self._get_avg_policy(legal)
         action_name = self._sample_action(policy, legal)
 
@@ -166,15 +178,7 @@ class HybridPokerBot:
         Run the CFR net, mask illegal actions, softmax over legal actions only.
         Returns avg strategy as a name->probability dict.
         """
-        proxy = EngineStateProxy(
-            table=self.table,
-            phase=self._current_street,
-            acting_seat=self.player_index,
-            n_raises=self._n_raises,
-            action_history=self._action_history,
-            hand_buckets=self._hand_buckets,
-        )
-        features = encode_state(proxy).unsqueeze(0)
+        features = encode_state(self._state_proxy()).unsqueeze(0)
 
         self.net.eval()
         with torch.no_grad():
@@ -193,6 +197,35 @@ class HybridPokerBot:
         }
 
 
+    def action_distribution(self, holdings, buckets) -> np.ndarray:
+        """
+        decide()'s abstract action for each candidate holding of this seat
+        (holdings: (k, 2) card codes, buckets: their preflop buckets), as a
+        (k, N_ACTIONS) one-hot array over ALL_ACTIONS.  decide() always plays
+        the most probable legal action, so given the cards it is deterministic.
+        """
+        features = encode_state_holdings(self._state_proxy(), holdings, buckets)
+
+        self.net.eval()
+        with torch.no_grad():
+            policy_logits, _ = self.net(features)   # (k, N_ACTIONS)
+        probs = F.softmax(mask_logits(policy_logits, self.legal_actions()), dim=-1).numpy()
+
+        # argmax takes the first of equal maxima in ALL_ACTIONS order, as _sample_action's stable sort does
+        chosen = np.zeros_like(probs)
+        chosen[np.arange(len(probs)), probs.argmax(axis=1)] = 1.0
+        return chosen
+
+    def _state_proxy(self) -> EngineStateProxy:
+        return EngineStateProxy(
+            table=self.table,
+            phase=self._current_street,
+            acting_seat=self.player_index,
+            n_raises=self._n_raises,
+            action_history=self._action_history,
+            hand_buckets=self._hand_buckets,
+        )
+
     def _sample_action(self, policy: dict[str, float], legal_actions: list[str]) -> str:
         names = [a for a in ALL_ACTIONS if a in legal_actions]
         ranked = sorted(names, key=lambda a: policy.get(a, 0.0), reverse=True)
@@ -0,0 +1,370 @@
+"""
+lbr_eval.py
+-----------
+Local Best Response (Lisy & Bowling, 2017) against trained CFRNet
+checkpoints, played through HybridPokerBot on the real engine
+(HandController / BettingRound), so the number reflects how the bot
+actually plays rather than how well its value head fits.
+
+    python POKER/bots/game_bots/lbr_eval.py --checkpoints best_2P_10B_200W.pt last_2P_10B_200W.pt \\
+        --hands 20000 --workers 4
+
+One seat per hand is LBR, every other seat runs the checkpoint.  LBR keeps
+a range for each bot: every two-card holding that does not collide with
+its own cards or the board, reweighted after each bot action by whether
+that holding plays it (HybridPokerBot.action_distribution, one batched net
+call over the range).  At its own turns LBR takes the action with the best
+immediate value against those ranges, assuming the hand checks down after:
+
+  fold    0
+  call    wp * pot - (1 - wp) * to_call
+  raise   fp * pot + (1 - fp) * (wp' * (pot + c) - (1 - wp') * r)
+
+wp is LBR's showdown equity against the ranges (Monte Carlo rollout), r
+the chips LBR adds, fp the chance every bot folds to the raise (each bot's
+policy in the position after it, applied to a copy of the table through
+BettingRound), and wp' / c the equity against and calls from the holdings
+that continue.  With more than one bot they are all assumed to call when
+not all of them fold.  LBR raises half pot, pot and all-in.
+
+Results are LBR's net chips per hand in mbb/hand (1000 * chips / big
+blind) with a normal 95% confidence interval over hands.  Button and LBR
+seat rotate, so every seat is LBR equally often.  LBR is a lower bound on
+exploitability: the higher its win rate, the more exploitable the bot.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import contextlib
+import os
+import random
+import sys
+import multiprocessing as mp
+from itertools import combinations
+from pathlib import Path
+
+import numpy as np
+
+# Run as a script: make POKER/ importable (core.*, engine.*, bots.*)
+POKER_DIR = Path(__file__).resolve().parents[2]
+if str(POKER_DIR) not in sys.path:
+    sys.path.insert(0, str(POKER_DIR))
+
+import torch
+
+from core.card_codes import cards_to_codes
+from core.evaluators.batch import evaluate_batch, sample_without_replacement
+from core.hand_evaluator import HandEvaluator
+from core.player_action import PlayerAction, ActionType
+from core.table_state import TableState
+from engine.game_state import GamePhase
+from engine.hand_controller import HandController
+from bots.cfr_bots.cfr.preflop_abstraction import hand_to_bucket, RANKS
+from bots.cfr_bots.neural.combined_state_encoder import ALL_ACTIONS, reset_profiles
+from bots.game_bots.hybrid_bot import HybridPokerBot, get_hybrid_bot
+
+# Every two-card holding, its preflop bucket, and which holdings use each card
+_HOLDINGS = np.array(list(combinations(range(52), 2)), dtype=np.int64)           # (1326, 2)
+_HOLDING_BUCKETS = np.array([hand_to_bucket(RANKS[a >> 2], RANKS[b >> 2], (a & 3) == (b & 3))
+                             for a, b in _HOLDINGS])
+_HOLDING_MASKS = (np.int64(1) << _HOLDINGS[:, 0]) | (np.int64(1) << _HOLDINGS[:, 1])
+_USES_CARD = np.zeros((52, len(_HOLDINGS)), dtype=bool)
+_USES_CARD[_HOLDINGS[:, 0], np.arange(len(_HOLDINGS))] = True
+_USES_CARD[_HOLDINGS[:, 1], np.arange(len(_HOLDINGS))] = True
+
+_FOLD = ALL_ACTIONS.index("FOLD")
+
+RAISE_FRACTIONS = (0.5, 1.0)    # of the pot after calling; all-in is always tried too
+
+
+class _QuietHandController(HandController):
+    """HandController without the PHH hand-history files and UI hand-odds helpers."""
+
+    def init_phh_store(self):
+        self.store_path = ''
+
+    def write_phh(self):
+        pass
+
+    def _run_monte_carlo_predictions(self):
+        pass
+
+
+# ── LBR player ────────────────────────────────────────────────────────────────
+
+class LBRPlayer:
+
+    def __init__(self, seat: int, rng: np.random.Generator, n_samples: int = 256,
+                 raise_fractions=RAISE_FRACTIONS):
+        self.seat            = seat
+        self.rng             = rng
+        self.n_samples       = n_samples
+        self.raise_fractions = raise_fractions
+        self.ranges: dict[int, np.ndarray] = {}
+        self._own = []
+
+    def new_hand(self, table: TableState):
+        """Call once hole cards are dealt: every bot starts on every holding LBR does not block."""
+        self._own = cards_to_codes(table.players[self.seat].hand)
+        start = (~_USES_CARD[self._own].any(axis=0)).astype(np.float64)
+        self.ranges = {p.id: start.copy() for p in table.players
+                       if p.id != self.seat and p.playing}
+
+    # ── Range tracking ───────────────────────────────────────────────────────
+
+    def _live(self, seat, table):
+        """Seat's range weights with holdings that use a board card removed."""
+        weights = self.ranges[seat]
+        blocked = _USES_CARD[cards_to_codes(table.community_cards)].any(axis=0)
+        weights[blocked] = 0.0
+        if not weights.any():                   # only after a forced observe(); start over
+            weights[:] = ~(blocked | _USES_CARD[self._own].any(axis=0))
+        return weights
+
+    def range_policy(self, bot: HybridPokerBot):
+        """(support, (len(support), N_ACTIONS) action distribution) of bot over its current range."""
+        support = np.flatnonzero(self._live(bot.player_index, bot.table))
+        return support, bot.action_distribution(_HOLDINGS[support], _HOLDING_BUCKETS[support])
+
+    def observe(self, seat, policy, action_name):
+        """Keep the holdings that play action_name; policy is range_policy() from before the action."""
+        support, dist = policy
+        weights = np.zeros_like(self.ranges[seat])
+        weights[support] = self.ranges[seat][support] * dist[:, ALL_ACTIONS.index(action_name)]
+        if weights.sum() > 0:                   # never empty a range on a numerical near-tie
+            self.ranges[seat] = weights
+
+    # ── Equity ───────────────────────────────────────────────────────────────
+
+    def _equity(self, table, ranges):
+        """LBR's showdown equity (ties split) against holdings drawn from ranges, board rolled out."""
+        board   = cards_to_codes(table.community_cards)
+        blocked = set(self._own) | set(board)
+        pool    = [c for c in range(52) if c not in blocked]
+        n       = self.n_samples
+
+        fills = sample_without_replacement(pool, n, 5 - len(board), self.rng)
+        used  = np.bitwise_or.reduce(np.int64(1) << fills, axis=1)
+        ok    = np.ones(n, dtype=bool)
+        opp_holdings = []
+        for weights in ranges:
+            picks = self.rng.choice(len(_HOLDINGS), size=n, p=weights / weights.sum())
+            masks = _HOLDING_MASKS[picks]
+            ok   &= (used & masks) == 0
+            used |= masks
+            opp_holdings.append(_HOLDINGS[picks])
+        if not ok.any():
+            return 0.5
+
+        shared   = np.concatenate([np.broadcast_to(np.array(board, dtype=np.int64), (n, len(board))), fills], axis=1)[ok]
+        mine     = evaluate_batch(np.concatenate([np.broadcast_to(np.array(self._own), (len(shared), 2)), shared], axis=1))
+        theirs   = np.stack([evaluate_batch(np.concatenate([h[ok], shared], axis=1)) for h in opp_holdings])
+        best     = theirs.max(axis=0)
+        tied     = (theirs == best).sum(axis=0)
+        return float(np.mean(np.where(mine > best, 1.0, np.where(mine == best, 1.0 / (tied + 1), 0.0))))
+
+    # ── Decision ─────────────────────────────────────────────────────────────
+
+    def decide(self, hc: HandController, bots: dict) -> tuple[str, PlayerAction]:
+        table   = hc.table
+        player  = table.players[self.seat]
+        to_call = min(table.current_bet - player.bet, player.cash)
+        pot     = table.pot
+
+        live = [s for s in self.ranges if not table.players[s].folded]
+        wp   = self._equity(table, [self._live(s, table) for s in live])
+
+        if to_call > 0:
+            options = {"FOLD": 0.0, "CALL": wp * pot - (1 - wp) * to_call}
+        else:
+            options = {"CHECK": wp * pot}
+
+        raises = {}
+        if player.cash > to_call and any(not table.players[s].all_in for s in live):
+            for raise_to in self._raise_sizes(table, player, to_call):
+                raises[raise_to] = self._raise_value(hc, bots, live, raise_to, pot)
+
+        best_name  = max(options, key=options.get)
+        best_value = options[best_name]
+        best_raise = max(raises, key=raises.get, default=None)
+        if best_raise is not None and raises[best_raise] > best_value:
+            name = _raise_name(table, player, best_raise)
+            return name, PlayerAction(ActionType.RAISE, self.seat, best_raise)
+
+        action_type = {"FOLD": ActionType.FOLD, "CALL": ActionType.CALL, "CHECK": ActionType.CHECK}[best_name]
+        return best_name, PlayerAction(action_type, self.seat, 0)
+
+    def _raise_sizes(self, table, player, to_call):
+        all_in    = player.bet + player.cash
+        min_legal = table.current_bet + table.last_raise_size
+        sizes = {int(min(max(table.current_bet + f * (table.pot + to_call), min_legal), all_in))
+                 for f in self.raise_fractions}
+        sizes.add(int(all_in))
+        return sorted(sizes)
+
+    def _raise_value(self, hc, bots, live, raise_to, pot):
+        """Immediate value of raising to raise_to: bots fold, or the continuing holdings call."""
+        table   = _table_after_raise(hc, self.seat, raise_to)
+        me      = table.players[self.seat]
+        put_in  = raise_to - hc.table.players[self.seat].bet
+        name    = _raise_name(hc.table, hc.table.players[self.seat], raise_to)
+
+        fold_all, calls, ranges = 1.0, 0.0, []
+        for seat in live:
+            weights = self._live(seat, table)
+            opp     = table.players[seat]
+            if opp.all_in:                      # cannot respond, goes to showdown
+                ranges.append(weights)
+                continue
+            bot = copy.copy(bots[seat])
+            bot.table            = table
+            bot._n_raises       += 1
+            bot._action_history  = bot._action_history + [name]
+            support, dist = self.range_policy(bot)
+
+            folds = np.zeros_like(weights)
+            folds[support] = weights[support] * dist[:, _FOLD]
+            fold_all *= folds.sum() / weights.sum()
+            if (weights - folds).any():
+                ranges.append(weights - folds)
+                calls += min(me.bet - opp.bet, opp.cash)
+
+        if not ranges:
+            return pot                          # every bot folds every holding
+        wp = self._equity(table, ranges)
+        return fold_all * pot + (1 - fold_all) * (wp * (pot + calls) - (1 - wp) * put_in)
+
+
+def _table_after_raise(hc, seat, raise_to):
+    """Copy of hc.table with seat's raise applied by the engine's BettingRound."""
+    table = copy.copy(hc.table)
+    table.players = [copy.copy(p) for p in hc.table.players]
+    betting = copy.copy(hc.betting_round)
+    betting.table = table
+    betting.apply(PlayerAction(ActionType.RAISE, seat, raise_to))
+    return table
+
+
+def _raise_name(table, player, raise_to):
+    """Nearest HybridPokerBot abstract action for a raise, for the bots' action history."""
+    if raise_to >= player.bet + player.cash:
+        return "ALLIN"
+    min_inc = max(table.last_raise_size, table.buy_in)
+    return "RAISE_2" if raise_to <= table.current_bet + 3 * min_inc else "RAISE_4"
+
+
+# ── Hands ─────────────────────────────────────────────────────────────────────
+
+def _play_hands(checkpoint, n_players, buyin, wallet, first_hand, n_hands, seed, n_samples):
+    """
+    LBR's net chips for hands first_hand .. first_hand + n_hands - 1.  Hand h
+    has the button on seat h % n_players and LBR on (h // n_players) % n_players.
+    Every hand is dealt and played from its own (seed, h) random state, so
+    checkpoints evaluated with the same seed see the same cards.
+    """
+    torch.set_num_threads(1)
+    reset_profiles()
+
+    table = TableState(n_players, buyin, wallet)
+    hc    = _QuietHandController(table, HandEvaluator())
+    first = get_hybrid_bot(checkpoint, 0, table, GamePhase.PREFLOP)
+    bots  = {0: first}
+    for seat in range(1, n_players):
+        bots[seat] = HybridPokerBot(first.net, seat, table, GamePhase.PREFLOP)
+
+    results = np.zeros(n_hands)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for i, hand in enumerate(range(first_hand, first_hand + n_hands)):
+            lbr_seat = (hand // n_players) % n_players
+            lbr      = LBRPlayer(lbr_seat, np.random.default_rng((seed, hand)), n_samples)
+            hc.deck.cards.sort(key=lambda card: card.code)      # shuffle from the same order
+            random.seed(seed * 1_000_003 + hand)
+            for player in table.players:
+                player.cash, player.playing = wallet, True
+                player.is_bot = player.id != lbr_seat
+                player.bot    = bots[player.id] if player.is_bot else None
+            table.num_players_playing = n_players
+            table.dealer_index        = hand % n_players
+
+            hc.start_hand()
+            lbr.new_hand(table)
+            while hc.phase not in (GamePhase.SHOWDOWN, GamePhase.GAMEOVER):
+                seat = hc.betting_round.current_index
+                if seat == lbr_seat:
+                    name, action = lbr.decide(hc, bots)
+                else:
+                    policy = lbr.range_policy(bots[seat])
+                    name, action = bots[seat].decide()
+                    lbr.observe(seat, policy, name)
+                hc.apply_action(action)
+                for player in table.players:
+                    if player.is_bot:
+                        player.bot.notify_action(name)
+
+            results[i] = table.players[lbr_seat].cash - wallet
+    return results
+
+
+def summarize(chips, big_blind) -> dict:
+    """mbb/hand and its 95% confidence half-width from per-hand chip results."""
+    mbb = 1000.0 * np.asarray(chips, dtype=np.float64) / big_blind
+    n   = len(mbb)
+    std = float(mbb.std(ddof=1)) if n > 1 else float("inf")
+    return {
+        "hands":        n,
+        "mbb_per_hand": float(mbb.mean()),
+        "ci95":         1.96 * std / np.sqrt(n),
+        "std":          std,
+    }
+
+
+def lbr_evaluate(checkpoint, n_players=2, buyin=10, wallet=200, hands=10_000,
+                 workers=1, seed=0, n_samples=256) -> dict:
+    """
+    Play hands of LBR against checkpoint, split over worker processes.
+    Returns summarize() of LBR's results.  The deals depend only on seed
+    and hands, so comparing checkpoints under one seed is a paired test.
+    """
+    workers = max(1, min(workers, hands))
+    shares  = [hands // workers + (w < hands % workers) for w in range(workers)]
+    starts  = np.concatenate([[0], np.cumsum(shares)[:-1]]).tolist()
+    jobs    = [(str(checkpoint), n_players, buyin, wallet, start, share, seed, n_samples)
+               for start, share in zip(starts, shares)]
+
+    if workers == 1:
+        parts = [_play_hands(*jobs[0])]
+    else:
+        with mp.Pool(workers) as pool:
+            parts = pool.starmap(_play_hands, jobs)
+    return summarize(np.concatenate(parts), buyin)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local best response against CFRNet checkpoints")
+    parser.add_argument("--checkpoints", nargs="+", required=True, help="Checkpoint .pt files to compare")
+    parser.add_argument("--players", type=int,   default=None, help="Default: the checkpoint's n_players")
+    parser.add_argument("--buyin",   type=float, default=None, help="Big blind; default: the checkpoint's buyin")
+    parser.add_argument("--wallet",  type=float, default=None, help="Starting stack; default: the checkpoint's wallet")
+    parser.add_argument("--hands",   type=int,   default=10_000)
+    parser.add_argument("--workers", type=int,   default=os.cpu_count() or 1)
+    parser.add_argument("--seed",    type=int,   default=0)
+    parser.add_argument("--samples", type=int,   default=256, help="Monte Carlo rollouts per equity estimate")
+    args = parser.parse_args()
+
+    rows = []
+    for path in args.checkpoints:
+        meta      = torch.load(path, map_location="cpu", weights_only=True)
+        n_players = args.players or meta.get("n_players", 2)
+        buyin     = args.buyin   or meta.get("buyin", 10)
+        wallet    = args.wallet  or meta.get("wallet", 200)
+        result    = lbr_evaluate(path, n_players, buyin, wallet, args.hands, args.workers, args.seed, args.samples)
+        rows.append((path, result))
+        print(f"  {path}: LBR {result['mbb_per_hand']:+9.1f} ± {result['ci95']:.1f} mbb/hand "
+              f"({result['hands']:,} hands, {n_players}P {buyin:g}B {wallet:g}W)", flush=True)
+
+    if len(rows) > 1:
+        print("\n  Least exploitable first:")
+        for rank, (path, result) in enumerate(sorted(rows, key=lambda r: r[1]["mbb_per_hand"]), 1):
+            print(f"  {rank:>3}. {result['mbb_per_hand']:+9.1f} ± {result['ci95']:.1f}  {path}")
@@ -0,0 +1,95 @@
+#########
+# BIT DECK
+#########
+
+# A set of cards stored as one 52-bit integer: bit `code` is set when the card
+# with that core.card_codes code is still in the deck.
+#
+#   deck = BitDeck.without(known_codes)   # full deck minus dead cards
+#   deck.remove(code)                     # O(1), no list scan
+#   deck.sample(k)                        # k distinct codes, no pool list built
+#   deck.sample_batch(n, k)               # (n, k) array for the batch evaluator
+#
+# Dead-card masking is a single AND, so equity code can build "everything not
+# yet seen" without allocating a 52-entry list per call.
+
+import random
+
+import numpy as np
+
+from core.card_codes import N_CARDS
+from core.evaluators.batch import sample_without_replacement
+
+FULL_MASK = (1 << N_CARDS) - 1
+
+_CODE_BITS = np.left_shift(np.int64(1), np.arange(N_CARDS, dtype=np.int64))
+
+def card_mask(codes):
+    """Bitmask with the bit of every code in codes set."""
+    mask = 0
+    for code in codes:
+        mask |= 1 << code
+    return mask
+
+class BitDeck:
+    __slots__ = ('mask',)
+
+    def __init__(self, mask=FULL_MASK):
+        self.mask = mask
+
+    @classmethod
+    def without(cls, *dead):
+        """Full deck minus every code in the given iterables of dead cards."""
+        mask = FULL_MASK
+        for codes in dead:
+            for code in codes:
+                mask &= ~(1 << code)
+        return cls(mask)
+
+    def copy(self):
+        return BitDeck(self.mask)
+
+    def remove(self, code):
+        self.mask &= ~(1 << code)
+
+    def add(self, code):
+        self.mask |= 1 << code
+
+    def __contains__(self, code):
+        return (self.mask >> code) & 1 == 1
+
+    def __len__(self):
+        return self.mask.bit_count()
+
+    def __iter__(self):
+        # Lowest set bit first, so codes come out in ascending order
+        mask = self.mask
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def codes(self):
+        return list(self)
+
+    def sample(self, k, rng=random):
+        """
+        k distinct codes drawn uniformly from the deck (the deck is unchanged).
+        Rejection-samples 6-bit draws against the mask, so no pool is built;
+        with at most a handful of dead cards almost every draw is accepted.
+        """
+        mask = self.mask
+        if k > mask.bit_count():
+            raise ValueError(f"cannot draw {k} cards from a {mask.bit_count()}-card deck")
+        drawn = []
+        while len(drawn) < k:
+            code = rng.getrandbits(6)
+            if code < N_CARDS and (mask >> code) & 1:
+                mask &= ~(1 << code)
+                drawn.append(code)
+        return drawn
+
+    def sample_batch(self, n_samples, k, rng=None):
+        """(n_samples, k) array of independent k-card draws, see batch.sample_without_replacement."""
+        pool = np.flatnonzero(self.mask & _CODE_BITS)
+        return sample_without_replacement(pool, n_samples, k, rng)
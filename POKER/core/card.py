@@ -17,6 +17,8 @@ SUIT_VALUE = {
     'SPADES': 3
 }
 
+SUIT_NAME = {name[0]: name for name in SUIT_VALUE}
+
 VALUE_NAME = {
     11: "Jack",
     12: "Queen",
@@ -24,37 +26,76 @@ VALUE_NAME = {
     14: "Ace"
 }
 
-class Card: 
-    def __init__(self, id, suit, value):
-        self.id = id
-        self.suit = suit
-        self.value = value
+# Every Card is one of 52 shared, immutable instances: Card(id, suit, value)
+# returns the registered card for that value and suit instead of a new object.
+# Suits may be given as names or initials ('CLUBS' / 'C'); the shared card
+# always carries the full name and its canonical id ('CA').
+# Rank, suit index, integer code (see core.card_codes) and hash are computed
+# once here, so comparisons, hashing and list.remove() on hands and decks are
+# integer / identity checks.
+
+class Card:
+    __slots__ = ('id', 'suit', 'value', 'rank', 'suit_index', 'code', '_hash')
+
+    _registry = {}
+
+    def __new__(cls, id, suit, value):
+        card = cls._registry.get((value, suit))
+        if card is None:
+            suit = SUIT_NAME[suit[0].upper()]
+            card = cls._registry.get((value, suit))
+        if card is None:
+            card = super().__new__(cls)
+            rank = CARD_VALUE[value]
+            suit_index = SUIT_VALUE[suit]
+            for name, field in (('id', suit[0] + value), ('suit', suit), ('value', value),
+                                ('rank', rank), ('suit_index', suit_index),
+                                ('code', (rank - 2) * 4 + suit_index)):
+                object.__setattr__(card, name, field)
+            object.__setattr__(card, '_hash', hash(card.code))
+            cls._registry[(value, suit)] = card
+        return card
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Card objects are immutable")
+
+    def __reduce__(self):
+        # Unpickling / copying goes back through the registry
+        return (Card, (self.id, self.suit, self.value))
 
     def __hash__(self):
-        return hash((CARD_VALUE[self.value], SUIT_VALUE[self.suit]))
+        return self._hash
 
     # Define equality based on name and grade
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, Card):
             return NotImplemented
-        return (CARD_VALUE[self.value] == CARD_VALUE[other.value]) and (SUIT_VALUE[self.suit] == SUIT_VALUE[other.suit])
+        return self.code == other.code
 
-    # Define less than based on grade
+    # Define less than based on grade, then suit
     def __lt__(self, other):
         if not isinstance(other, Card):
             return NotImplemented
-        
-        # Primary comparison: value 
-        if CARD_VALUE[self.value] < CARD_VALUE[other.value]:
-            return True
-        elif CARD_VALUE[self.value] > CARD_VALUE[other.value]:
-            return False
-        else:
-            # Secondary comparison: name (if grades are equal)
-            return SUIT_VALUE[self.suit] < SUIT_VALUE[other.suit]
+        return self.code < other.code
+
+    def __repr__(self):
+        return f"Card({self.id!r}, {self.suit!r}, {self.value!r})"
 
     def print(self):
         print(f"{self.value} of {self.suit} ({self.id})")
 
     def get_card_string(self):
-        return f"{self.value} of {self.suit}"
\ No newline at end of file
+        return f"{self.value} of {self.suit}"
+
+# The 52 shared cards, indexed by integer card code
+CARDS = [None] * 52
+for _suit in SUIT_VALUE:
+    for _value in CARD_VALUE:
+        _card = Card(_suit[0] + _value, _suit, _value)
+        CARDS[_card.code] = _card
+del _suit, _value, _card
+
+def card_from_code(code):
+    return CARDS[code]
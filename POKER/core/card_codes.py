@@ -0,0 +1,69 @@
+#########
+# INTEGER CARD CODES
+#########
+
+# A card code is rank_index * 4 + suit_index:
+#   rank_index  0-12 for 2..A   (face value - 2)
+#   suit_index  0-3  following SUIT_VALUE (CLUBS, DIAMONDS, HEARTS, SPADES)
+#
+# This is the same layout phevaluator uses for integer cards (2c = 0, As = 51),
+# and sorting codes gives the same order as sorting Card objects.
+
+from core.card import CARD_VALUE, Card
+
+N_CARDS = 52
+N_RANKS = 13
+N_SUITS = 4
+
+# Suit letters accepted on input. Card objects normally carry full suit names
+# ('SPADES'), but single letters ('S') are matched through their first character.
+SUIT_INDEX = {
+    'C': 0,
+    'D': 1,
+    'H': 2,
+    'S': 3
+}
+
+def make_code(rank_index, suit_index):
+    return rank_index * 4 + suit_index
+
+def code_rank(code):
+    """Rank index 0-12 (2..A) of a card code."""
+    return code >> 2
+
+def code_suit(code):
+    """Suit index 0-3 of a card code."""
+    return code & 3
+
+def code_value(code):
+    """Face value 2-14 of a card code, matching CARD_VALUE."""
+    return (code >> 2) + 2
+
+def card_to_code(card):
+    """Convert a core.card.Card (value '2'..'A', any suit spelling) to its code."""
+    if type(card) is Card:
+        return card.code
+    return make_code(CARD_VALUE[card.value] - 2, SUIT_INDEX[card.suit[0].upper()])
+
+def cards_to_codes(cards):
+    return [card_to_code(card) for card in cards]
+
+# Rank spellings accepted by to_code(): CARD_VALUE keys plus 'T' for ten
+RANK_INDEX = {rank: value - 2 for rank, value in CARD_VALUE.items()}
+RANK_INDEX['T'] = 8
+
+def to_code(card):
+    """
+    Convert any card representation used in the project to a code:
+    an int code (returned unchanged), a Card, or a (rank, suit) tuple
+    such as ('T', 'h') or ('10', 'HEARTS').
+    """
+    if isinstance(card, int):
+        return card
+    if isinstance(card, tuple):
+        rank, suit = card
+        return make_code(RANK_INDEX[rank.upper()], SUIT_INDEX[suit[0].upper()])
+    return card_to_code(card)
+
+def to_codes(cards):
+    return [to_code(card) for card in cards]
@@ -15,7 +15,7 @@ class Deck:
             for suit in suits:
                 for value in values:
                     id = suit[0]+value 
-                    self.cards.append(Card(id,suit,value))
+                    self.cards.append(Card(id,suit,value))   # shared flyweight, no allocation
 
     def shuffle(self):
         random.shuffle(self.cards)
@@ -0,0 +1,101 @@
+#########
+# HAND EVALUATORS
+#########
+
+# One evaluator API shared by the engine, the CFR game tree and the bots.
+#
+#   evaluate(codes)      packed strength of the best hand in 5-7 card codes
+#   hand_value(codes)    the same as a comparable (category, ranks...) tuple
+#   board_evaluator(board_codes)
+#                        scorer for many hole card sets against one board;
+#                        .evaluate(hole_codes) == evaluate(board + hole)
+#
+# Codes are core.card_codes ints; card_codes.to_codes() converts Card objects
+# and (rank, suit) tuples. All backends return the same packed strength scale
+# (see core.evaluators.lookup), so results can be compared across backends.
+#
+# Backends:
+#   lookup       precomputed flush / unique / prime-product tables (default)
+#   phevaluator  the phevaluator C-backed package, if installed
+#   python       reference implementation scoring every 5-card subset
+#
+# The backend is chosen with set_backend(), or the POKER_EVALUATOR environment
+# variable at import time.
+
+import os
+from importlib import import_module
+
+from core.evaluators import lookup
+from core.evaluators.lookup import unpack, equivalence_class
+
+DEFAULT_BACKEND = "lookup"
+
+BACKENDS = {
+    "lookup": "core.evaluators.lookup",
+    "phevaluator": "core.evaluators.phevaluator_eval",
+    "python": "core.evaluators.python_eval"
+}
+
+_backend_name = None
+_evaluate = None
+
+def get_backend(name=None):
+    """Return the evaluate(codes) function of a backend (default: the active one)."""
+    if name is None:
+        return _evaluate
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown evaluator backend {name!r}, choose from {sorted(BACKENDS)}")
+    return import_module(BACKENDS[name]).evaluate
+
+def set_backend(name):
+    """Select the backend used by evaluate() / hand_value() everywhere."""
+    global _backend_name, _evaluate
+    _evaluate = get_backend(name)
+    _backend_name = name
+
+def backend_name():
+    return _backend_name
+
+def available_backends():
+    """Backends whose dependencies import cleanly here."""
+    names = []
+    for name in BACKENDS:
+        try:
+            get_backend(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+def evaluate(codes):
+    return _evaluate(codes)
+
+def hand_value(codes):
+    return unpack(_evaluate(codes))
+
+
+class _ConcatBoardEvaluator:
+    """board_evaluator() for backends without board preprocessing."""
+
+    def __init__(self, board_codes, evaluate_fn):
+        self.board = list(board_codes)
+        self._evaluate = evaluate_fn
+
+    def evaluate(self, hole_codes):
+        return self._evaluate(self.board + list(hole_codes))
+
+    def hand_value(self, hole_codes):
+        return unpack(self.evaluate(hole_codes))
+
+def board_evaluator(board_codes, backend=None):
+    """
+    Scorer for hole cards against a shared board (default: the active backend).
+    The lookup backend preprocesses the board once (lookup.BoardEvaluator);
+    other backends score board + hole cards on each call.
+    """
+    evaluate_fn = get_backend(backend)
+    if evaluate_fn is lookup.evaluate:
+        return lookup.BoardEvaluator(board_codes)
+    return _ConcatBoardEvaluator(board_codes, evaluate_fn)
+
+set_backend(os.environ.get("POKER_EVALUATOR", DEFAULT_BACKEND))
@@ -0,0 +1,113 @@
+#########
+# BATCH EVALUATOR
+#########
+
+# Vectorized version of the lookup evaluator: scores a whole (N, k) array of
+# card codes (k = 5, 6 or 7) in one call and returns the same packed strengths
+# as core.evaluators.evaluate().
+#
+#   flush      per-suit rank bitmasks -> FLUSH table (0 when no 5-card flush)
+#   otherwise  product of one prime per card rank -> searchsorted over the
+#              sorted keys of every 5-7 card rank multiset
+#
+# Monte Carlo callers draw all runouts at once with sample_without_replacement()
+# and compare the returned arrays instead of looping over _eval7 per sample.
+#
+# The vectorized path is the lookup backend.  When another backend is active
+# (core.evaluators.set_backend), evaluate_batch() scores row by row with it,
+# so the batch path follows the same backend choice as evaluate().
+#
+# Draws come from the stdlib random state unless an rng is passed, so the
+# random.seed() callers already use keeps Monte Carlo results reproducible.
+
+import random
+from itertools import combinations
+
+import numpy as np
+
+from core import evaluators
+from core.card_codes import N_RANKS
+from core.evaluators import lookup
+
+_flush_array = None
+_product_keys = None
+_product_values = None
+
+def _build_arrays():
+    global _flush_array, _product_keys, _product_values
+
+    flush_table, unique_table, product_table = lookup.tables()
+    products = dict(product_table)
+
+    # The scalar evaluator reads all-distinct hands from the UNIQUE table;
+    # fold them into the product table so one lookup covers every hand.
+    for n_cards in (5, 6, 7):
+        for ranks in combinations(range(N_RANKS), n_cards):
+            key = 1
+            rank_mask = 0
+            for r in ranks:
+                key *= lookup.PRIMES[r]
+                rank_mask |= 1 << r
+            products[key] = unique_table[rank_mask]
+
+    keys = np.fromiter(products.keys(), dtype=np.int64, count=len(products))
+    values = np.fromiter(products.values(), dtype=np.int64, count=len(products))
+    order = np.argsort(keys)
+
+    _flush_array = np.asarray(flush_table, dtype=np.int64)
+    _product_keys = keys[order]
+    _product_values = values[order]
+
+_PRIME_ARRAY = np.asarray(lookup.PRIMES, dtype=np.int64)
+_SUITS = np.arange(4)
+
+def evaluate_batch(cards, backend=None):
+    """
+    Packed strengths for an (N, k) int array of card codes, k = 5..7.
+    Returns an int64 array of shape (N,); higher = better.
+    backend defaults to the active one; only lookup is vectorized.
+    """
+    cards = np.asarray(cards, dtype=np.int64)
+    evaluate_fn = evaluators.get_backend(backend)
+    if evaluate_fn is not lookup.evaluate:
+        return np.fromiter((evaluate_fn(row) for row in cards.tolist()), dtype=np.int64, count=len(cards))
+
+    if _flush_array is None:
+        _build_arrays()
+
+    ranks = cards >> 2
+    suits = cards & 3
+
+    # (N, k, 4) -> per-suit rank bitmask; cards are distinct so sum == OR
+    in_suit = suits[:, :, None] == _SUITS
+    suit_masks = np.where(in_suit, (1 << ranks)[:, :, None], 0).sum(axis=1)
+    flush = _flush_array[suit_masks].max(axis=1)
+
+    keys = _PRIME_ARRAY[ranks].prod(axis=1)
+    rest = _product_values[np.searchsorted(_product_keys, keys)]
+
+    return np.where(flush > 0, flush, rest)
+
+def categories(strengths):
+    """Hand category (HIGH=1 .. STRAIGHT_FLUSH=9) of an array of strengths."""
+    return np.asarray(strengths) >> 20
+
+def sample_without_replacement(pool, n_samples, k, rng=None):
+    """
+    (n_samples, k) array; each row holds k distinct entries of pool.
+    Rows are independent draws, like calling random.sample(pool, k) n times.
+    rng (a numpy Generator) defaults to one seeded from the stdlib random
+    state, so random.seed() applies.
+    """
+    if rng is None:
+        rng = np.random.default_rng(random.getrandbits(64))
+    pool = np.asarray(pool, dtype=np.int64)
+    if k == 0:
+        return np.empty((n_samples, 0), dtype=np.int64)
+    picks = np.argpartition(rng.random((n_samples, len(pool))), k - 1, axis=1)[:, :k]
+    return pool[picks]
+
+def with_fixed(fixed, samples):
+    """Prepend the same fixed codes to every row of samples."""
+    fixed = np.asarray(fixed, dtype=np.int64).reshape(1, -1)
+    return np.concatenate([np.repeat(fixed, len(samples), axis=0), samples], axis=1)
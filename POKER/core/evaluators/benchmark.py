@@ -0,0 +1,67 @@
+#########
+# EVALUATOR BENCHMARK
+#########
+
+# Times every available backend on the same random hands and checks that
+# they agree. Run from the POKER directory:
+#
+#   python -m core.evaluators.benchmark --hands 20000 --cards 7
+
+import argparse
+import random
+import time
+
+from core.card_codes import N_CARDS
+from core import evaluators
+
+def random_hands(n_hands, n_cards, seed=0):
+    rng = random.Random(seed)
+    return [rng.sample(range(N_CARDS), n_cards) for _ in range(n_hands)]
+
+def benchmark(hands, backends=None):
+    """
+    Returns {backend: (seconds, results)} for each backend over the same hands.
+    Table-building backends are warmed up first so build time is not counted.
+    """
+    timings = {}
+    for name in backends or evaluators.available_backends():
+        evaluate = evaluators.get_backend(name)
+        evaluate(hands[0])
+
+        start = time.perf_counter()
+        results = [evaluate(hand) for hand in hands]
+        timings[name] = (time.perf_counter() - start, results)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare hand evaluator backends")
+    parser.add_argument("--hands", type=int, default=20_000)
+    parser.add_argument("--cards", type=int, default=7, choices=(5, 6, 7))
+    parser.add_argument("--backends", nargs="*", default=None,
+                        help=f"Subset of {sorted(evaluators.BACKENDS)} (default: all available)")
+    args = parser.parse_args()
+
+    hands = random_hands(args.hands, args.cards)
+    timings = benchmark(hands, args.backends)
+
+    reference = None
+    print(f"{args.hands:,} random {args.cards}-card hands")
+    for name, (seconds, results) in timings.items():
+        if reference is None:
+            reference = results
+        agrees = "OK" if results == reference else "MISMATCH"
+        per_hand = seconds / len(hands) * 1e6
+        print(f"  {name:<12} {seconds:8.3f}s  {per_hand:8.2f} us/hand  {len(hands) / seconds:12,.0f} hands/s  {agrees}")
+
+    # Vectorized lookup over the whole array in one call
+    from core.evaluators.batch import evaluate_batch
+    evaluate_batch(hands[:1])
+    start = time.perf_counter()
+    results = evaluate_batch(hands).tolist()
+    seconds = time.perf_counter() - start
+    agrees = "OK" if reference is None or results == reference else "MISMATCH"
+    per_hand = seconds / len(hands) * 1e6
+    print(f"  {'batch':<12} {seconds:8.3f}s  {per_hand:8.2f} us/hand  {len(hands) / seconds:12,.0f} hands/s  {agrees}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+#########
+# LOOKUP TABLE EVALUATOR
+#########
+
+# Scores 5, 6 or 7 integer card codes (see core.card_codes) in one pass,
+# without enumerating 5-card subsets.
+#
+#   FLUSH table    rank bitmask of a suit with >= 5 cards -> best flush / straight flush
+#   UNIQUE table   rank bitmask when every rank is distinct -> best straight / high card
+#   PRODUCT table  product of one prime per card rank      -> every hand with a paired rank
+#
+# With at most 7 cards a flush can never coexist with quads or a full house,
+# so a flush hit is always the final answer.
+#
+# Strength values are packed ints (higher = better) built from the same
+# comparable tuples HandEvaluator has always returned:
+#
+#     (category, r1, r2, r3, r4, r5)  ->  category << 20 | r1 << 16 | ... | r5
+#
+# All tuples of one category have the same length, so comparing packed ints
+# gives exactly the same order as comparing tuples. unpack() restores the tuple.
+
+from itertools import combinations_with_replacement
+
+from core.card_codes import N_RANKS
+
+STRAIGHT_FLUSH = 9
+QUADS = 8
+FULL_HOUSE = 7
+FLUSH = 6
+STRAIGHT = 5
+TRIPLES = 4
+TWO_PAIR = 3
+PAIR = 2
+HIGH = 1
+
+# Number of rank fields that follow the category in each value tuple
+VALUE_LENGTH = {
+    STRAIGHT_FLUSH: 1,
+    QUADS: 2,
+    FULL_HOUSE: 2,
+    FLUSH: 5,
+    STRAIGHT: 1,
+    TRIPLES: 3,
+    TWO_PAIR: 3,
+    PAIR: 4,
+    HIGH: 5
+}
+
+PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+# (rank bitmask, high card value) for every straight, best first. The wheel
+# uses the ace bit (12) with a high card of 5.
+STRAIGHTS = [(0b11111 << low, low + 6) for low in range(8, -1, -1)]
+STRAIGHTS.append(((1 << 12) | 0b1111, 5))
+
+_flush_table = None
+_unique_table = None
+_product_table = None
+
+
+def pack(value):
+    """Pack a value tuple into a comparable int."""
+    strength = value[0]
+    for i in range(1, 6):
+        strength <<= 4
+        if i < len(value):
+            strength |= value[i]
+    return strength
+
+def unpack(strength):
+    """Inverse of pack(): rebuild the (category, ranks...) tuple."""
+    category = strength >> 20
+    return (category,) + tuple(
+        (strength >> (16 - 4 * i)) & 0xF for i in range(VALUE_LENGTH[category])
+    )
+
+def category(strength):
+    return strength >> 20
+
+
+def _straight_high(rank_mask):
+    for mask, high in STRAIGHTS:
+        if rank_mask & mask == mask:
+            return high
+    return 0
+
+def _top_values(rank_mask, n):
+    values = []
+    for r in range(N_RANKS - 1, -1, -1):
+        if rank_mask >> r & 1:
+            values.append(r + 2)
+            if len(values) == n:
+                break
+    return values
+
+def _flush_value(rank_mask):
+    high = _straight_high(rank_mask)
+    if high:
+        return (STRAIGHT_FLUSH, high)
+    return (FLUSH, *_top_values(rank_mask, 5))
+
+def _unique_value(rank_mask):
+    high = _straight_high(rank_mask)
+    if high:
+        return (STRAIGHT, high)
+    return (HIGH, *_top_values(rank_mask, 5))
+
+def _counts_value(counts):
+    """Best non-flush value for a rank count vector (index 0 = deuce)."""
+    quads, trips, pairs, singles = [], [], [], []
+    rank_mask = 0
+    for r in range(N_RANKS - 1, -1, -1):
+        n = counts[r]
+        if n:
+            rank_mask |= 1 << r
+            if n == 4:
+                quads.append(r + 2)
+            elif n == 3:
+                trips.append(r + 2)
+            elif n == 2:
+                pairs.append(r + 2)
+            else:
+                singles.append(r + 2)
+
+    if quads:
+        kicker = max(quads[1:] + trips + pairs + singles)
+        return (QUADS, quads[0], kicker)
+
+    if trips and (len(trips) > 1 or pairs):
+        pair = max(trips[1:] + pairs)
+        return (FULL_HOUSE, trips[0], pair)
+
+    high = _straight_high(rank_mask)
+    if high:
+        return (STRAIGHT, high)
+
+    if trips:
+        return (TRIPLES, trips[0], *singles[:2])
+
+    if len(pairs) >= 2:
+        kicker = max(pairs[2:] + singles)
+        return (TWO_PAIR, pairs[0], pairs[1], kicker)
+
+    if pairs:
+        return (PAIR, pairs[0], *singles[:3])
+
+    return (HIGH, *singles[:5])
+
+def _build_tables():
+    global _flush_table, _unique_table, _product_table
+
+    flush_table = [0] * (1 << N_RANKS)
+    unique_table = [0] * (1 << N_RANKS)
+    for rank_mask in range(1 << N_RANKS):
+        n = rank_mask.bit_count()
+        if n >= 5:
+            flush_table[rank_mask] = pack(_flush_value(rank_mask))
+            if n <= 7:
+                unique_table[rank_mask] = pack(_unique_value(rank_mask))
+
+    product_table = {}
+    for n_cards in (5, 6, 7):
+        for ranks in combinations_with_replacement(range(N_RANKS), n_cards):
+            counts = [0] * N_RANKS
+            for r in ranks:
+                counts[r] += 1
+            if max(counts) > 4 or max(counts) == 1:
+                continue
+            key = 1
+            for r in ranks:
+                key *= PRIMES[r]
+            product_table[key] = pack(_counts_value(counts))
+
+    _flush_table = flush_table
+    _unique_table = unique_table
+    _product_table = product_table
+
+def tables():
+    """Return (flush, unique, product) tables, building them on first use."""
+    if _product_table is None:
+        _build_tables()
+    return _flush_table, _unique_table, _product_table
+
+
+def evaluate(codes):
+    """Packed strength of the best 5-card hand in 5-7 card codes."""
+    if _product_table is None:
+        _build_tables()
+
+    s0 = s1 = s2 = s3 = 0
+    key = 1
+    for code in codes:
+        r = code >> 2
+        bit = 1 << r
+        suit = code & 3
+        if suit == 0:
+            s0 |= bit
+        elif suit == 1:
+            s1 |= bit
+        elif suit == 2:
+            s2 |= bit
+        else:
+            s3 |= bit
+        key *= PRIMES[r]
+
+    for suit_mask in (s0, s1, s2, s3):
+        strength = _flush_table[suit_mask]
+        if strength:
+            return strength
+
+    rank_mask = s0 | s1 | s2 | s3
+    if rank_mask.bit_count() == len(codes):
+        return _unique_table[rank_mask]
+    return _product_table[key]
+
+def hand_value(codes):
+    """Comparable value tuple (same format as HandEvaluator) for 5-7 card codes."""
+    return unpack(evaluate(codes))
+
+
+class BoardEvaluator:
+    """
+    Scores many hole card sets against one shared board.
+
+    The board's suit masks and prime product are built once; each evaluate()
+    call only folds in the hole cards before the table lookups.
+    """
+
+    def __init__(self, board_codes):
+        if _product_table is None:
+            _build_tables()
+
+        self.board = list(board_codes)
+        self.suit_masks = [0, 0, 0, 0]
+        self.key = 1
+        for code in self.board:
+            self.suit_masks[code & 3] |= 1 << (code >> 2)
+            self.key *= PRIMES[code >> 2]
+
+    def evaluate(self, hole_codes):
+        """Packed strength of the best hand in board + hole_codes."""
+        suit_masks = self.suit_masks.copy()
+        key = self.key
+        for code in hole_codes:
+            r = code >> 2
+            suit_masks[code & 3] |= 1 << r
+            key *= PRIMES[r]
+
+        for suit_mask in suit_masks:
+            strength = _flush_table[suit_mask]
+            if strength:
+                return strength
+
+        rank_mask = suit_masks[0] | suit_masks[1] | suit_masks[2] | suit_masks[3]
+        if rank_mask.bit_count() == len(self.board) + len(hole_codes):
+            return _unique_table[rank_mask]
+        return _product_table[key]
+
+    def hand_value(self, hole_codes):
+        return unpack(self.evaluate(hole_codes))
+
+
+def best_five_indices(codes, value):
+    """
+    Indices (in input order) of five codes that make up `value`.
+    When several cards could fill a slot the earliest one is used.
+    """
+    hand_category = value[0]
+    used = []
+
+    if hand_category in (STRAIGHT_FLUSH, FLUSH):
+        suit_counts = [0, 0, 0, 0]
+        for code in codes:
+            suit_counts[code & 3] += 1
+        flush_suit = suit_counts.index(max(suit_counts))
+        ranks = _straight_values(value[1]) if hand_category == STRAIGHT_FLUSH else value[1:]
+        for v in ranks:
+            used.append(codes.index((v - 2) * 4 + flush_suit))
+        return sorted(used)
+
+    if hand_category == STRAIGHT:
+        slots = [(v, 1) for v in _straight_values(value[1])]
+    elif hand_category == QUADS:
+        slots = [(value[1], 4), (value[2], 1)]
+    elif hand_category == FULL_HOUSE:
+        slots = [(value[1], 3), (value[2], 2)]
+    elif hand_category == TRIPLES:
+        slots = [(value[1], 3), (value[2], 1), (value[3], 1)]
+    elif hand_category == TWO_PAIR:
+        slots = [(value[1], 2), (value[2], 2), (value[3], 1)]
+    elif hand_category == PAIR:
+        slots = [(value[1], 2)] + [(v, 1) for v in value[2:]]
+    else:
+        slots = [(v, 1) for v in value[1:]]
+
+    for v, n in slots:
+        for i, code in enumerate(codes):
+            if n and (code >> 2) + 2 == v and i not in used:
+                used.append(i)
+                n -= 1
+    return sorted(used)
+
+def _straight_values(high):
+    if high == 5:
+        return [5, 4, 3, 2, 14]
+    return [high - i for i in range(5)]
+
+
+_class_strengths = None
+_class_index = None
+
+def _build_classes():
+    global _class_strengths, _class_index
+
+    flush_table, unique_table, product_table = tables()
+    strengths = set()
+    for rank_mask in range(1 << N_RANKS):
+        if rank_mask.bit_count() == 5:
+            strengths.add(flush_table[rank_mask])
+            strengths.add(unique_table[rank_mask])
+    for ranks in combinations_with_replacement(range(N_RANKS), 5):
+        if len(set(ranks)) < 5 and max(ranks.count(r) for r in ranks) <= 4:
+            key = 1
+            for r in ranks:
+                key *= PRIMES[r]
+            strengths.add(product_table[key])
+
+    _class_strengths = sorted(strengths, reverse=True)
+    _class_index = {s: i + 1 for i, s in enumerate(_class_strengths)}
+
+def class_strengths():
+    """All 7462 distinct hand strengths, best first (index 0 = royal flush)."""
+    if _class_strengths is None:
+        _build_classes()
+    return _class_strengths
+
+def equivalence_class(strength):
+    """
+    Equivalence class 1 (royal flush) .. 7462 (7-5-4-3-2 high) of a strength.
+    This is the same numbering phevaluator returns, lower = stronger.
+    """
+    if _class_index is None:
+        _build_classes()
+    return _class_index[strength]
@@ -0,0 +1,21 @@
+#########
+# PHEVALUATOR BACKEND
+#########
+
+# Wraps phevaluator (pip install phevaluator). Its integer card ids use the
+# same layout as core.card_codes, so codes are passed straight through.
+# phevaluator returns an equivalence class (1 = royal flush, lower = stronger);
+# it is mapped back onto the shared packed strength scale so results compare
+# equal across backends.
+
+from phevaluator import evaluate_cards
+
+from core.evaluators.lookup import class_strengths
+
+_strength_by_class = None
+
+def evaluate(codes):
+    global _strength_by_class
+    if _strength_by_class is None:
+        _strength_by_class = [0] + class_strengths()
+    return _strength_by_class[evaluate_cards(*codes)]
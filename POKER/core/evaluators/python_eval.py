@@ -0,0 +1,152 @@
+#########
+# PURE PYTHON EVALUATOR
+#########
+
+# Reference backend: scores every 5-card subset and keeps the best.
+# Slow, dependency free, and easy to read -- the other backends are checked
+# against it.
+
+from collections import Counter
+from functools import lru_cache
+from itertools import combinations
+
+from core.evaluators.lookup import pack
+
+HAND_RANKS = {
+    "HIGH": 1,
+    "PAIR": 2,
+    "TWO_PAIR": 3,
+    "TRIPLES": 4,
+    "STRAIGHT": 5,
+    "FLUSH": 6,
+    "FULL_HOUSE": 7,
+    "QUADS": 8,
+    "STRAIGHT_FLUSH": 9
+}
+
+@lru_cache(maxsize=16384)
+def evaluate_5_cached(code_tuple):
+    """
+    Returns a flat tuple of ints for every hand type so that
+    Python's tuple > comparison works correctly in all cases.
+    code_tuple must be sorted so equal hands share a cache entry.
+
+    Formats:
+        STRAIGHT_FLUSH : (9, high)
+        QUADS          : (8, quad_rank, kicker)
+        FULL_HOUSE     : (7, trips_rank, pair_rank)
+        FLUSH          : (6, c1, c2, c3, c4, c5)   -- cards high→low
+        STRAIGHT       : (5, high)
+        TRIPLES        : (4, trips_rank, k1, k2)
+        TWO_PAIR       : (3, high_pair, low_pair, kicker)
+        PAIR           : (2, pair_rank, k1, k2, k3)
+        HIGH           : (1, c1, c2, c3, c4, c5)   -- cards high→low
+    """
+
+    values = []
+    suits = []
+
+    for code in code_tuple:
+        values.append((code >> 2) + 2)
+        suits.append(code & 3)
+
+    values.sort(reverse=True)
+    value_counter = Counter(values)
+
+    # Flush check
+    is_flush = len(set(suits)) == 1
+
+    # Straight check (Ace high or low)
+    unique_values = sorted(set(values), reverse=True)
+    is_straight = False
+    straight_high = 0
+
+    for i in range(len(unique_values) - 4):
+        if unique_values[i] - unique_values[i + 4] == 4:
+            is_straight = True
+            straight_high = unique_values[i]
+            break
+
+    if not is_straight:
+        if set([14, 2, 3, 4, 5]).issubset(unique_values):
+            is_straight = True
+            straight_high = 5
+
+    # Straight Flush
+    if is_straight and is_flush:
+        return (HAND_RANKS["STRAIGHT_FLUSH"], straight_high)
+
+    # Grouped values sorted by count desc, then rank desc
+    grouped_values = sorted(
+        value_counter.items(),
+        key=lambda x: (-x[1], -x[0])
+    )
+
+    # Four of a Kind
+    if grouped_values[0][1] == 4:
+        return (
+            HAND_RANKS["QUADS"],
+            grouped_values[0][0],
+            grouped_values[1][0]
+        )
+
+    # Full House
+    if grouped_values[0][1] == 3 and grouped_values[1][1] == 2:
+        return (
+            HAND_RANKS["FULL_HOUSE"],
+            grouped_values[0][0],
+            grouped_values[1][0]
+        )
+
+    # Flush — flat tuple of all 5 card values high→low
+    if is_flush:
+        return (HAND_RANKS["FLUSH"], values[0], values[1], values[2], values[3], values[4])
+
+    # Straight
+    if is_straight:
+        return (HAND_RANKS["STRAIGHT"], straight_high)
+
+    # Three of a Kind — two kickers
+    if grouped_values[0][1] == 3:
+        kickers = [gv[0] for gv in grouped_values[1:]]
+        return (
+            HAND_RANKS["TRIPLES"],
+            grouped_values[0][0],
+            kickers[0],
+            kickers[1]
+        )
+
+    # Two Pair
+    if grouped_values[0][1] == 2 and grouped_values[1][1] == 2:
+        high_pair = max(grouped_values[0][0], grouped_values[1][0])
+        low_pair  = min(grouped_values[0][0], grouped_values[1][0])
+        kicker    = grouped_values[2][0]
+        return (
+            HAND_RANKS["TWO_PAIR"],
+            high_pair,
+            low_pair,
+            kicker
+        )
+
+    # One Pair — three kickers
+    if grouped_values[0][1] == 2:
+        kickers = [gv[0] for gv in grouped_values[1:]]
+        return (
+            HAND_RANKS["PAIR"],
+            grouped_values[0][0],
+            kickers[0],
+            kickers[1],
+            kickers[2]
+        )
+
+    # High Card — flat tuple of all 5 card values high→low
+    return (HAND_RANKS["HIGH"], values[0], values[1], values[2], values[3], values[4])
+
+def evaluate(codes):
+    """Packed strength of the best 5-card subset of 5-7 card codes."""
+    best = 0
+    for combo in combinations(sorted(codes), 5):
+        strength = pack(evaluate_5_cached(combo))
+        if strength > best:
+            best = strength
+    return best
@@ -1,11 +1,15 @@
-from collections import Counter
 from itertools import combinations
-import random
+from math import comb
+
+import numpy as np
 
-from functools import lru_cache
 from core.card import CARD_VALUE, VALUE_NAME
 from core.card import Card
-from core.deck import Deck
+from core.bit_deck import BitDeck
+from core.card_codes import cards_to_codes
+from core import evaluators
+from core.evaluators import lookup, python_eval
+from core.evaluators.batch import categories, evaluate_batch, with_fixed
 from core.table_state import TableState
 from engine.game_state import GamePhase
 
@@ -47,141 +51,61 @@ HAND_RANK_NAMES = {
     HAND_RANKS["STRAIGHT_FLUSH"]: "Straight Flush"
 }
 
-@lru_cache(maxsize=16384) 
-def _evaluate_5_card_hand_cached(card_tuple):
-    """
-    Returns a flat tuple of ints for every hand type so that
-    Python's tuple > comparison works correctly in all cases.
-
-    Formats:
-        STRAIGHT_FLUSH : (9, high)
-        QUADS          : (8, quad_rank, kicker)
-        FULL_HOUSE     : (7, trips_rank, pair_rank)
-        FLUSH          : (6, c1, c2, c3, c4, c5)   -- cards high→low
-        STRAIGHT       : (5, high)
-        TRIPLES        : (4, trips_rank, k1, k2)
-        TWO_PAIR       : (3, high_pair, low_pair, kicker)
-        PAIR           : (2, pair_rank, k1, k2, k3)
-        HIGH           : (1, c1, c2, c3, c4, c5)   -- cards high→low
-    """
-
-    values = []
-    suits = []
-
-    for value, suit in card_tuple:
-        values.append(value)
-        suits.append(suit)
-
-    values.sort(reverse=True)
-    value_counter = Counter(values)
-
-    # Flush check
-    is_flush = len(set(suits)) == 1
-
-    # Straight check (Ace high or low)
-    unique_values = sorted(set(values), reverse=True)
-    is_straight = False
-    straight_high = 0
-
-    for i in range(len(unique_values) - 4):
-        if unique_values[i] - unique_values[i + 4] == 4:
-            is_straight = True
-            straight_high = unique_values[i]
-            break
-
-    if not is_straight:
-        if set([14, 2, 3, 4, 5]).issubset(unique_values):
-            is_straight = True
-            straight_high = 5
-
-    # Straight Flush
-    if is_straight and is_flush:
-        return (HAND_RANKS["STRAIGHT_FLUSH"], straight_high)
-
-    # Grouped values sorted by count desc, then rank desc
-    grouped_values = sorted(
-        value_counter.items(),
-        key=lambda x: (-x[1], -x[0])
-    )
-
-    # Four of a Kind
-    if grouped_values[0][1] == 4:
-        return (
-            HAND_RANKS["QUADS"],
-            grouped_values[0][0],
-            grouped_values[1][0]
-        )
-
-    # Full House
-    if grouped_values[0][1] == 3 and grouped_values[1][1] == 2:
-        return (
-            HAND_RANKS["FULL_HOUSE"],
-            grouped_values[0][0],
-            grouped_values[1][0]
-        )
-
-    # Flush — flat tuple of all 5 card values high→low
-    if is_flush:
-        return (HAND_RANKS["FLUSH"], values[0], values[1], values[2], values[3], values[4])
-
-    # Straight
-    if is_straight:
-        return (HAND_RANKS["STRAIGHT"], straight_high)
-
-    # Three of a Kind — two kickers
-    if grouped_values[0][1] == 3:
-        kickers = [gv[0] for gv in grouped_values[1:]]
-        return (
-            HAND_RANKS["TRIPLES"],
-            grouped_values[0][0],
-            kickers[0],
-            kickers[1]
-        )
-
-    # Two Pair
-    if grouped_values[0][1] == 2 and grouped_values[1][1] == 2:
-        high_pair = max(grouped_values[0][0], grouped_values[1][0])
-        low_pair  = min(grouped_values[0][0], grouped_values[1][0])
-        kicker    = grouped_values[2][0]
-        return (
-            HAND_RANKS["TWO_PAIR"],
-            high_pair,
-            low_pair,
-            kicker
-        )
-
-    # One Pair — three kickers
-    if grouped_values[0][1] == 2:
-        kickers = [gv[0] for gv in grouped_values[1:]]
-        return (
-            HAND_RANKS["PAIR"],
-            grouped_values[0][0],
-            kickers[0],
-            kickers[1],
-            kickers[2]
-        )
-
-    # High Card — flat tuple of all 5 card values high→low
-    return (HAND_RANKS["HIGH"], values[0], values[1], values[2], values[3], values[4])
-
 class HandEvaluator:
 
-    def __init__(self):
-        pass
+    def __init__(self, backend=None):
+        # backend: name from core.evaluators.BACKENDS, None = the configured default
+        self.backend = backend
+        self._evaluate = evaluators.evaluate if backend is None else evaluators.get_backend(backend)
 
     def evaluate_5_card_hand(self, cards: list[Card]):
 
-        # Convert cards to a sorted tuple of (value, suit) pairs for consistent caching
-        card_tuple = tuple(sorted(
-            ((CARD_VALUE[card.value], card.suit) for card in cards),
-            reverse=True
-        ))
+        # Sorted codes so equal hands share one cache entry
+        code_tuple = tuple(sorted(cards_to_codes(cards)))
 
-        result = _evaluate_5_card_hand_cached(card_tuple)
+        result = python_eval.evaluate_5_cached(code_tuple)
         return result
     
     def evaluate_7_card_hand(self, cards):
 
+        # Scores 5-7 cards with the selected evaluator backend, then picks the
+        # five cards that make up the value for display / Player.assign_hand.
+        if len(cards) < 5:
+            return None, []
+
+        cards = list(cards)
+        codes = cards_to_codes(cards)
+        best_hand_value = lookup.unpack(self._evaluate(codes))
+        best_5_card_combo = tuple(cards[i] for i in lookup.best_five_indices(codes, best_hand_value))
+
+        return best_hand_value, best_5_card_combo
+
+    def evaluate_board_hands(self, board_cards, hands):
+
+        # (hand value, best five) for each hole card list in hands against one
+        # shared board. The board is preprocessed once and each hand only adds
+        # its hole cards, so showdowns don't rescore the board per player.
+        board = list(board_cards)
+        if len(board) + 2 < 5:
+            return [(None, []) for _ in hands]
+
+        board_codes = cards_to_codes(board)
+        scorer = evaluators.board_evaluator(board_codes, self.backend)
+
+        results = []
+        for hole in hands:
+            hole = list(hole)
+            hole_codes = cards_to_codes(hole)
+            hand_value = lookup.unpack(scorer.evaluate(hole_codes))
+            cards = board + hole
+            best_5_card_combo = tuple(cards[i] for i in lookup.best_five_indices(board_codes + hole_codes, hand_value))
+            results.append((hand_value, best_5_card_combo))
+
+        return results
+
+    def evaluate_7_card_hand_subsets(self, cards):
+
+        # Reference implementation: best of all 5-card subsets.
         best_hand_value = None
         best_5_card_combo = []
 
@@ -195,9 +119,11 @@ class HandEvaluator:
         return best_hand_value, best_5_card_combo
     
     # Calculate player hand probabailities at flop and turn
-    def evaluate_monte_carlo_hand_probabilities(self, phase, table, player):
+    def evaluate_monte_carlo_hand_probabilities(self, phase, table, player, exact=None):
 
-        num_unknown_cards = 52 - 2 - len(table.community_cards)
+        # exact: True enumerates every runout, False samples num_simulations of
+        # them, None (default) enumerates whenever there are fewer runouts than
+        # samples -- C(47,2) = 1081 on the flop, 46 on the turn, 1 on the river.
         num_simulations = 5000
 
         if phase == GamePhase.FLOP:
@@ -209,45 +135,27 @@ class HandEvaluator:
         else:
             raise ValueError(f"Invalid phase: {phase}")
 
-        known_cards = []
-        for card in player.hand:
-            known_cards.append(Card(card.id, card.suit, card.value))
-        for card in table.community_cards:
-            known_cards.append(Card(card.id, card.suit, card.value))
-
-        unknown_cards = Deck()
-
-        for card in known_cards:
-            unknown_cards.cards.remove(card)
-
-        hand_outs = {
-            "HIGH": 0,
-            "PAIR": 0,
-            "TWO_PAIR": 0,
-            "TRIPLES": 0,
-            "STRAIGHT": 0,
-            "FLUSH": 0,
-            "FULL_HOUSE": 0,
-            "QUADS": 0,
-            "STRAIGHT_FLUSH": 0
-        }
-
-        for sim in range(num_simulations):
-            # Randomly sample future cards
-            sampled_cards = random.sample(unknown_cards.cards, cards_to_deal)
-            full_hand = known_cards + sampled_cards
-            
-            # Evaluate best 5-card hand
-            best_hand_value, _ = self.evaluate_7_card_hand(full_hand)
-            hand_rank = best_hand_value[0]
-            
-            #Increment the appropriate counter
-            for rank_name, rank_value in HAND_RANKS.items():
-                if hand_rank == rank_value:
-                    hand_outs[rank_name] += 1
-                    break
+        # Cards are shared immutable objects, so no defensive copies needed
+        known_codes = cards_to_codes(list(player.hand) + list(table.community_cards))
+        unknown_cards = BitDeck.without(known_codes)
+
+        if exact is None:
+            exact = comb(len(unknown_cards), cards_to_deal) <= num_simulations
+
+        # Every runout (or a sample of them) scored in one vectorized call
+        if exact:
+            runouts = np.array(list(combinations(unknown_cards, cards_to_deal)), dtype=np.int64).reshape(-1, cards_to_deal)
+        else:
+            runouts = unknown_cards.sample_batch(num_simulations, cards_to_deal)
+        num_runouts = len(runouts)
+
+        hand_ranks = categories(evaluate_batch(with_fixed(known_codes, runouts)))
+        rank_counts = np.bincount(hand_ranks, minlength=len(HAND_RANKS) + 1)
+
+        hand_outs = {rank_name: int(rank_counts[rank_value]) for rank_name, rank_value in HAND_RANKS.items()}
+
         try:
-            hand_probabilities = self.calculate_hand_probabilities(hand_outs, num_simulations) # from num unknown cards..
+            hand_probabilities = self.calculate_hand_probabilities(hand_outs, num_runouts) # from num unknown cards..
         except Exception as e:
             print("Calculate Hand Probs Error occured")
             print(e)
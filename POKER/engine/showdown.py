@@ -49,6 +49,19 @@ class Showdown():
 
         self.winners_pots = []
 
+        # Score every contender once against the shared board; side pots
+        # reuse these instead of re-evaluating per pot.
+        contenders = {}
+        for pot in self.table.pots:
+            for player in pot["eligible"]:
+                if player.playing and not player.folded:
+                    contenders[player.id] = player
+        hand_results = dict(zip(
+            contenders,
+            self.hand_evaluator.evaluate_board_hands(
+                self.table.community_cards, [player.hand for player in contenders.values()])
+        ))
+
         # Distribute live_money (folded chips) into the first eligible pot only.
         remaining_live_money = self.table.live_money
 
@@ -74,8 +87,7 @@ class Showdown():
             pot_winners = []
 
             for player in eligible_players:
-                seven_card_hand = list(self.table.community_cards) + list(player.hand)
-                hand_value, best_five_card_combo = self.hand_evaluator.evaluate_7_card_hand(seven_card_hand)
+                hand_value, best_five_card_combo = hand_results[player.id]
 
                 if not player.hand_value or hand_value > player.hand_value:
                     player.assign_hand(hand_value, sorted(best_five_card_combo))
@@ -2,16 +2,35 @@ import random
 from collections import Counter
 from itertools import combinations
 import sys
+import tempfile
+
+import numpy as np
 
 sys.path.append('POKER')
 from core.card import Card, VALUE_NAME, CARD_VALUE, SUIT_VALUE
+from core.card_codes import to_codes
 from core.hand_evaluator import HAND_RANK_NAMES, HAND_RANKS, RANK_HANDS
 from core.deck import Deck
+from core.bit_deck import BitDeck
 from core.hand_evaluator import HandEvaluator
+from core import evaluators
+from core.evaluators.batch import evaluate_batch, sample_without_replacement
+from bots.cfr_bots.cfr import preflop_equity_table
+from bots.cfr_bots.cfr.hand_indexer import HandIndexer
+from bots.cfr_bots.cfr.suit_isomorphism import canonicalize
+from bots.cfr_bots.cfr.equity_cache import EquityCache
+from bots.cfr_bots.cfr.regret_tables import RegretTables
+from bots.cfr_bots.cfr.update_rules import make_update_rule
+from bots.cfr_bots.cfr.preflop_abstraction import PreflopAbstraction, RANKS, SUITS, hand_to_bucket, postflop_equity_bucket
+from bots.cfr_bots.cfr import postflop_bucket_table
 from core.player import Player
 from core.table_state import TableState
 
 from engine.hand_controller import HandController, GamePhase
+from bots.cfr_bots.neural.cfr_net import CFRNet
+from bots.cfr_bots.neural.combined_state_encoder import encode_state, encode_state_holdings, N_FEATURES, N_ACTIONS, ALL_ACTIONS
+from bots.game_bots.hybrid_bot import HybridPokerBot
+from bots.game_bots.lbr_eval import LBRPlayer, _QuietHandController, summarize
 
 TEST_PASS = {
     True: 'PASS',
@@ -60,6 +79,7 @@ class tests:
                 })
 
                 hc.deck.shuffle()
+                hc.load_phh()
                 hc._deal_hole_cards()
 
                 # FLOP
@@ -209,8 +229,8 @@ class tests:
                 total_turn+=prediction
 
             print(f"PERCENT SUCCESSFULL PAIR TESTS = %{(total_num_tests_pass_hands['PAIR']/total_num_tests_hands['PAIR'])*100} ({total_num_tests_pass_hands['PAIR']}/{total_num_tests_hands['PAIR']})")
-            print(f"AVERAGE PAIR FLOP PREDICTION = {(total_flop/total_num_tests_pass_hands['PAIR'])}")
-            print(f"AVERAGE PAIR TURN PREDICTION = {(total_turn/total_num_tests_pass_hands['PAIR'])}")
+            print(f"AVERAGE PAIR FLOP PREDICTION = {(total_flop/max(total_num_tests_pass_hands['PAIR'], 1))}")
+            print(f"AVERAGE PAIR TURN PREDICTION = {(total_turn/max(total_num_tests_pass_hands['PAIR'], 1))}")
             print('\n')
 
         if total_num_tests_hands['TWO_PAIR'] != 0:
@@ -222,8 +242,8 @@ class tests:
                 total_turn+=prediction
  
             print(f"PERCENT SUCCESSFULL TWO_PAIR TESTS = %{(total_num_tests_pass_hands['TWO_PAIR']/total_num_tests_hands['TWO_PAIR'])*100} ({total_num_tests_pass_hands['TWO_PAIR']}/{total_num_tests_hands['TWO_PAIR']})")
-            print(f"AVERAGE TWO_PAIR FLOP PREDICTION = {(total_flop/total_num_tests_pass_hands['TWO_PAIR'])}")
-            print(f"AVERAGE TWO_PAIR TURN PREDICTION = {(total_turn/total_num_tests_pass_hands['TWO_PAIR'])}")
+            print(f"AVERAGE TWO_PAIR FLOP PREDICTION = {(total_flop/max(total_num_tests_pass_hands['TWO_PAIR'], 1))}")
+            print(f"AVERAGE TWO_PAIR TURN PREDICTION = {(total_turn/max(total_num_tests_pass_hands['TWO_PAIR'], 1))}")
             print('\n')
  
         if total_num_tests_hands['TRIPLES'] != 0:
@@ -235,8 +255,8 @@ class tests:
                 total_turn+=prediction
 
             print(f"PERCENT SUCCESSFULL TRIPLES TESTS = %{(total_num_tests_pass_hands['TRIPLES']/total_num_tests_hands['TRIPLES'])*100} ({total_num_tests_pass_hands['TRIPLES']}/{total_num_tests_hands['TRIPLES']})")
-            print(f"AVERAGE TRIPLES FLOP PREDICTION = {(total_flop/total_num_tests_pass_hands['TRIPLES'])}")
-            print(f"AVERAGE TRIPLES TURN PREDICTION = {(total_turn/total_num_tests_pass_hands['TRIPLES'])}")
+            print(f"AVERAGE TRIPLES FLOP PREDICTION = {(total_flop/max(total_num_tests_pass_hands['TRIPLES'], 1))}")
+            print(f"AVERAGE TRIPLES TURN PREDICTION = {(total_turn/max(total_num_tests_pass_hands['TRIPLES'], 1))}")
             print('\n')        
         
         if total_num_tests_hands['STRAIGHT'] != 0:
@@ -248,8 +268,8 @@ class tests:
                 total_turn+=prediction
 
             print(f"PERCENT SUCCESSFULL STRAIGHT TESTS = %{(total_num_tests_pass_hands['STRAIGHT']/total_num_tests_hands['STRAIGHT'])*100} ({total_num_tests_pass_hands['STRAIGHT']}/{total_num_tests_hands['STRAIGHT']})")
-            print(f"AVERAGE STRAIGHT FLOP PREDICTION = {(total_flop/total_num_tests_pass_hands['STRAIGHT'])}")
-            print(f"AVERAGE STRAIGHT TURN PREDICTION = {(total_turn/total_num_tests_pass_hands['STRAIGHT'])}")
+            print(f"AVERAGE STRAIGHT FLOP PREDICTION = {(total_flop/max(total_num_tests_pass_hands['STRAIGHT'], 1))}")
+            print(f"AVERAGE STRAIGHT TURN PREDICTION = {(total_turn/max(total_num_tests_pass_hands['STRAIGHT'], 1))}")
             print('\n')          
         
         if total_num_tests_hands['FLUSH'] != 0:
@@ -261,8 +281,8 @@ class tests:
                 total_turn+=prediction
 
             print(f"PERCENT SUCCESSFULL FLUSH TESTS = %{(total_num_tests_pass_hands['FLUSH']/total_num_tests_hands['FLUSH'])*100} ({total_num_tests_pass_hands['FLUSH']}/{total_num_tests_hands['FLUSH']})")
-            print(f"AVERAGE FLUSH FLOP PREDICTION = {(total_flop/total_num_tests_pass_hands['FLUSH'])}")
-            print(f"AVERAGE FLUSH TURN PREDICTION = {(total_turn/total_num_tests_pass_hands['FLUSH'])}")
+            print(f"AVERAGE FLUSH FLOP PREDICTION = {(total_flop/max(total_num_tests_pass_hands['FLUSH'], 1))}")
+            print(f"AVERAGE FLUSH TURN PREDICTION = {(total_turn/max(total_num_tests_pass_hands['FLUSH'], 1))}")
             print('\n')         
         
         if total_num_tests_hands['FULL_HOUSE'] != 0:
@@ -274,8 +294,8 @@ class tests:
                 total_turn+=prediction
 
             print(f"PERCENT SUCCESSFULL FULL_HOUSE TESTS = %{(total_num_tests_pass_hands['FULL_HOUSE']/total_num_tests_hands['FULL_HOUSE'])*100} ({total_num_tests_pass_hands['FULL_HOUSE']}/{total_num_tests_hands['FULL_HOUSE']})")
-            print(f"AVERAGE FULL_HOUSE FLOP PREDICTION = {(total_flop/total_num_tests_pass_hands['FULL_HOUSE'])}")
-            print(f"AVERAGE FULL_HOUSE TURN PREDICTION = {(total_turn/total_num_tests_pass_hands['FULL_HOUSE'])}")
+            print(f"AVERAGE FULL_HOUSE FLOP PREDICTION = {(total_flop/max(total_num_tests_pass_hands['FULL_HOUSE'], 1))}")
+            print(f"AVERAGE FULL_HOUSE TURN PREDICTION = {(total_turn/max(total_num_tests_pass_hands['FULL_HOUSE'], 1))}")
             print('\n')         
         
         if total_num_tests_hands['QUADS'] != 0:
@@ -287,8 +307,8 @@ class tests:
                 total_turn+=prediction
 
             print(f"PERCENT SUCCESSFULL QUADS TESTS = %{(total_num_tests_pass_hands['QUADS']/total_num_tests_hands['QUADS'])*100} ({total_num_tests_pass_hands['QUADS']}/{total_num_tests_hands['QUADS']})")
-            print(f"AVERAGE QUADS FLOP PREDICTION = {(total_flop/total_num_tests_pass_hands['QUADS'])}")
-            print(f"AVERAGE QUADS TURN PREDICTION = {(total_turn/total_num_tests_pass_hands['QUADS'])}")
+            print(f"AVERAGE QUADS FLOP PREDICTION = {(total_flop/max(total_num_tests_pass_hands['QUADS'], 1))}")
+            print(f"AVERAGE QUADS TURN PREDICTION = {(total_turn/max(total_num_tests_pass_hands['QUADS'], 1))}")
             print('\n')         
         
         if total_num_tests_hands['STRAIGHT_FLUSH'] != 0:
@@ -300,8 +320,8 @@ class tests:
                 total_turn+=prediction
 
             print(f"PERCENT SUCCESSFULL STRAIGHT_FLUSH TESTS = %{(total_num_tests_pass_hands['STRAIGHT_FLUSH']/total_num_tests_hands['STRAIGHT_FLUSH'])*100} ({total_num_tests_pass_hands['STRAIGHT_FLUSH']}/{total_num_tests_hands['STRAIGHT_FLUSH']})")
-            print(f"AVERAGE STRAIGHT_FLUSH FLOP PREDICTION = {(total_flop/total_num_tests_pass_hands['STRAIGHT_FLUSH'])}")
-            print(f"AVERAGE STRAIGHT_FLUSH TURN PREDICTION = {(total_turn/total_num_tests_pass_hands['STRAIGHT_FLUSH'])}")
+            print(f"AVERAGE STRAIGHT_FLUSH FLOP PREDICTION = {(total_flop/max(total_num_tests_pass_hands['STRAIGHT_FLUSH'], 1))}")
+            print(f"AVERAGE STRAIGHT_FLUSH TURN PREDICTION = {(total_turn/max(total_num_tests_pass_hands['STRAIGHT_FLUSH'], 1))}")
             print('\n')         
         
         return
@@ -456,6 +476,744 @@ class tests:
 
         return passed
 
+    def test_lookup_matches_subsets(self):
+
+        deck = Deck()
+        mismatches = 0
+
+        # lookup evaluator vs best-of-21-subsets on random 5, 6 and 7 card hands
+        for i in range(3000):
+            cards = random.sample(deck.cards, random.randint(5, 7))
+            hand_value, best_five_card_combo = self.handevaluator.evaluate_7_card_hand(cards)
+            subset_value, _ = self.handevaluator.evaluate_7_card_hand_subsets(cards)
+
+            if hand_value != subset_value or self.handevaluator.evaluate_5_card_hand(best_five_card_combo) != hand_value:
+                mismatches += 1
+                hand = ""
+                for card in cards:
+                    hand += card.id + " "
+                print(f"MISMATCH HAND: {hand}   LOOKUP: {hand_value}   SUBSETS: {subset_value}")
+
+        print(f"LOOKUP VS SUBSET MISMATCHES: {mismatches}/3000")
+        return mismatches == 0
+
+    def test_evaluator_backends_agree(self):
+
+        deck = Deck()
+        mismatches = 0
+        backends = evaluators.available_backends()
+        handevaluators = [HandEvaluator(backend) for backend in backends]
+
+        # every installed backend must give the same value on the same hand
+        for i in range(1000):
+            cards = random.sample(deck.cards, random.randint(5, 7))
+            values = [handevaluator.evaluate_7_card_hand(cards)[0] for handevaluator in handevaluators]
+
+            if len(set(values)) != 1:
+                mismatches += 1
+                hand = ""
+                for card in cards:
+                    hand += card.id + " "
+                print(f"MISMATCH HAND: {hand}   VALUES: {dict(zip(backends, values))}")
+
+        print(f"BACKENDS {backends} MISMATCHES: {mismatches}/1000")
+        return mismatches == 0
+
+    def test_batch_matches_scalar(self):
+
+        passed = True
+
+        # vectorized batch evaluator vs scalar evaluate() for 5, 6 and 7 card hands
+        for n_cards in (5, 6, 7):
+            hands = sample_without_replacement(range(52), 2000, n_cards)
+            batch_values = evaluate_batch(hands)
+            scalar_values = [evaluators.evaluate(list(hand)) for hand in hands]
+            mismatches = sum(1 for b, s in zip(batch_values, scalar_values) if b != s)
+            print(f"{n_cards} CARD BATCH VS SCALAR MISMATCHES: {mismatches}/2000")
+            if mismatches:
+                passed = False
+
+        # the batch path follows the selected backend; draws follow random.seed()
+        hands = sample_without_replacement(range(52), 200, 7)
+        active = evaluators.backend_name()
+        for backend in evaluators.available_backends():
+            evaluators.set_backend(backend)
+            agrees = np.array_equal(evaluate_batch(hands), [evaluators.evaluate(hand) for hand in hands.tolist()])
+            print(f"BATCH FOLLOWS {backend.upper()} BACKEND: {agrees}")
+            passed = passed and agrees
+        evaluators.set_backend(active)
+
+        random.seed(11)
+        first = sample_without_replacement(range(52), 50, 5)
+        random.seed(11)
+        seeded = np.array_equal(first, sample_without_replacement(range(52), 50, 5))
+        print(f"SAMPLES REPRODUCIBLE FROM random.seed: {seeded}")
+
+        return passed and seeded
+
+    def test_preflop_equity_table(self):
+
+        table = preflop_equity_table.get_table()
+        if table is None:
+            print(f"MISSING TABLE: {preflop_equity_table.TABLE_PATH}")
+            return False
+        vs_random, vs_class = table
+
+        # class vs class must be zero sum, and table vs random within MC noise of a fresh estimate
+        symmetric = abs(vs_class + vs_class.T - 1.0).max() < 1e-3
+        print(f"CLASS VS CLASS ZERO SUM: {symmetric}")
+
+        passed = symmetric
+        for name in ("AA", "AKs", "72o", "T9s"):
+            index = [preflop_equity_table.class_name(i) for i in range(preflop_equity_table.N_CLASSES)].index(name)
+            hole = preflop_equity_table.class_combos(index)[0]
+            table_equity = preflop_equity_table.equity_vs_random(hole)
+            mc_equity = preflop_equity_table._estimate_vs_random(index, 20000, np.random.default_rng(0))
+            print(f"{name}: TABLE {table_equity:.4f}   MC {mc_equity:.4f}")
+            if abs(table_equity - mc_equity) > 0.015:
+                passed = False
+
+        return passed
+
+    def test_hand_indexer(self):
+
+        indexer = HandIndexer((2, 3))
+        failures = 0
+
+        # same index under any suit relabelling, and unindex(index(h)) stays in the class
+        for i in range(2000):
+            cards = random.sample(range(52), 5)
+            hole, board = cards[:2], cards[2:]
+            index = indexer.index([hole, board])
+
+            suits = random.sample(range(4), 4)
+            relabelled = [[(c & ~3) | suits[c & 3] for c in hole], [(c & ~3) | suits[c & 3] for c in board]]
+            if indexer.index(relabelled) != index or indexer.index(indexer.unindex(index)) != index:
+                failures += 1
+
+        print(f"FLOP INDEXER SIZE: {indexer.size:,}   FAILURES: {failures}/2000")
+        return indexer.size == 1286792 and failures == 0
+
+    def test_suit_canonicalizer(self):
+
+        indexer = HandIndexer((2, 3))
+        classes = {}
+        failures = 0
+
+        # canonical keys must split hands exactly like the isomorphism index does
+        for i in range(5000):
+            cards = random.sample(range(52), 5)
+            key = canonicalize([cards[:2], cards[2:]])
+            index = indexer.index([cards[:2], cards[2:]])
+            if classes.setdefault(index, key) != key or indexer.index([list(key[0]), list(key[1])]) != index:
+                failures += 1
+
+        same = canonicalize([[('A', 's'), ('K', 's')], [('Q', 's'), ('J', 's'), ('2', 'c')]]) == \
+               canonicalize([[('A', 'h'), ('K', 'h')], [('Q', 'h'), ('J', 'h'), ('2', 'd')]])
+        print(f"AsKs QsJs2c == AhKh QhJh2d: {same}   FAILURES: {failures}/5000")
+        return same and failures == 0
+
+    def test_exact_hand_probabilities(self):
+
+        table = TableState(2, 100, 100)
+        hc = HandController(table, HandEvaluator())
+        hc.deck.shuffle()
+        hc.load_phh()
+        hc._deal_hole_cards()
+        hc._deal_burn()
+        hc._deal_community(3)
+        player = hc.table.players[0]
+        results = []
+
+        # exact mode vs scoring every remaining runout one hand at a time
+        for phase, n_cards in ((GamePhase.FLOP, 2), (GamePhase.TURN, 1)):
+            if phase == GamePhase.TURN:
+                hc._deal_burn()
+                hc._deal_community(1)
+
+            known = list(player.hand) + list(hc.table.community_cards)
+            unknown = [card for card in Deck().cards if card.id not in {c.id for c in known}]
+            hand_outs = Counter({name: 0 for name in HAND_RANKS})
+            runouts = list(combinations(unknown, n_cards))
+            for runout in runouts:
+                hand_value, _ = self.handevaluator.evaluate_7_card_hand(known + list(runout))
+                hand_outs[RANK_HANDS[hand_value[0]]] += 1
+            expected = self.handevaluator.calculate_hand_probabilities(hand_outs, len(runouts))
+
+            exact = self.handevaluator.evaluate_monte_carlo_hand_probabilities(phase, hc.table, player)
+            sampled = self.handevaluator.evaluate_monte_carlo_hand_probabilities(phase, hc.table, player, exact=False)
+
+            exact_ok = all(abs(exact[k] - expected[k]) < 1e-9 for k in expected)
+            sampled_ok = all(abs(sampled[k] - expected[k]) < 0.05 for k in expected)
+            print(f"{phase.name} RUNOUTS: {len(runouts)}   EXACT MATCH: {exact_ok}   SAMPLED WITHIN 0.05: {sampled_ok}")
+            results.append(exact_ok and sampled_ok)
+
+        return all(results)
+
+    def test_board_hands(self):
+
+        deck = Deck()
+        mismatches = 0
+
+        # shared-board scoring vs full 7 card evaluation, 3-6 players per board
+        for i in range(500):
+            n_players = random.randint(3, 6)
+            cards = random.sample(deck.cards, 5 + 2 * n_players)
+            board = cards[:5]
+            hands = [cards[5 + 2 * p: 7 + 2 * p] for p in range(n_players)]
+
+            for hand, (hand_value, best_five) in zip(hands, self.handevaluator.evaluate_board_hands(board, hands)):
+                full_value, _ = self.handevaluator.evaluate_7_card_hand(board + hand)
+                if hand_value != full_value or self.handevaluator.evaluate_5_card_hand(best_five) != hand_value:
+                    mismatches += 1
+
+        print(f"BOARD HANDS VS 7 CARD MISMATCHES: {mismatches}")
+        return mismatches == 0
+
+    def test_card_flyweight(self):
+
+        first, second = Deck(), Deck()
+        shared = all(a is b for a, b in zip(first.cards, second.cards))
+        interned = Card('HA', 'HEARTS', 'A') is first.cards[first.cards.index(Card('HA', 'HEARTS', 'A'))]
+
+        try:
+            first.cards[0].value = '2'
+            immutable = False
+        except AttributeError:
+            immutable = True
+
+        first.cards.remove(Card('C7', 'CLUBS', '7'))
+        removed = len(first.cards) == 51 and Card('C7', 'CLUBS', '7') not in first.cards
+        ordered = [card.code for card in sorted(second.cards)] == list(range(52))
+
+        print(f"SHARED: {shared}   INTERNED: {interned}   IMMUTABLE: {immutable}   REMOVE: {removed}   ORDER: {ordered}")
+        return shared and interned and immutable and removed and ordered
+
+    def test_int_code_deals(self):
+
+        abstraction = PreflopAbstraction(n_players=6)
+        failures = 0
+
+        # deals are plain 0-51 codes; buckets agree with the (rank, suit) spelling
+        for i in range(500):
+            deal = abstraction.sample_deal()
+            cards = [c for hand in deal['hole_cards'] for c in hand]
+            if sorted(deal['full_deck']) != list(range(52)) or not all(type(c) is int for c in cards):
+                failures += 1
+            for (c1, c2), bucket in zip(deal['hole_cards'], deal['buckets']):
+                (r1, s1), (r2, s2) = (RANKS[c1 // 4], SUITS[c1 % 4]), (RANKS[c2 // 4], SUITS[c2 % 4])
+                if bucket != hand_to_bucket(r1, r2, suited=(s1 == s2)):
+                    failures += 1
+
+        print(f"INT CODE DEAL FAILURES: {failures}/500")
+        return failures == 0
+
+    def test_bit_deck(self):
+
+        dead = random.sample(range(52), 9)
+        deck = BitDeck.without(dead)
+        listed = len(deck) == 43 and deck.codes() == [c for c in range(52) if c not in dead]
+
+        # single draws: distinct, never dead, every live card reachable
+        seen = Counter()
+        bad_draws = 0
+        for i in range(4000):
+            drawn = deck.sample(3)
+            if len(set(drawn)) != 3 or any(c in dead for c in drawn):
+                bad_draws += 1
+            seen.update(drawn)
+        uniform = set(seen) == set(deck.codes()) and max(seen.values()) < 2 * min(seen.values())
+
+        batch = deck.sample_batch(2000, 5)
+        bad_rows = sum(len(set(row)) != 5 or any(c in dead for c in row) for row in batch.tolist())
+
+        deck.remove(deck.codes()[0])
+        print(f"LISTED: {listed}   BAD DRAWS: {bad_draws}   UNIFORM: {uniform}   BAD BATCH ROWS: {bad_rows}   LEN AFTER REMOVE: {len(deck)}")
+        return listed and bad_draws == 0 and uniform and bad_rows == 0 and len(deck) == 42
+
+    def test_equity_cache(self):
+
+        # LRU: touching 'a' makes 'b' the oldest entry
+        lru = EquityCache(capacity=2, policy="lru")
+        lru.put("a", 1); lru.put("b", 2)
+        lru.get("a")
+        lru.put("c", 3)
+        lru_ok = "a" in lru and "b" not in lru and "c" in lru
+
+        # LFU: 'a' used twice, 'b' once, so 'b' goes first
+        lfu = EquityCache(capacity=2, policy="lfu")
+        lfu.put("a", 1); lfu.put("b", 2)
+        lfu.get("a"); lfu.get("a"); lfu.get("b")
+        lfu.put("c", 3)
+        lfu_ok = "a" in lfu and "b" not in lfu and "c" in lfu
+
+        stats = lru.stats()
+        print(f"LRU evict: {lru_ok}   LFU evict: {lfu_ok}   LRU stats: {stats}")
+        return lru_ok and lfu_ok and stats["hits"] == 1 and stats["evictions"] == 1 and len(lru) == 2
+
+    def test_postflop_bucket_table(self):
+
+        # (hole, flop) spots on a few fixed boards, from the nuts down to air
+        spots = [
+            ([('A', 'h'), ('A', 's')], [('A', 'd'), ('7', 'c'), ('2', 'h')]),
+            ([('K', 'c'), ('Q', 'd')], [('A', 'd'), ('7', 'c'), ('2', 'h')]),
+            ([('8', 'd'), ('3', 's')], [('A', 'd'), ('7', 'c'), ('2', 'h')]),
+            ([('J', 'h'), ('T', 'h')], [('9', 'h'), ('8', 'h'), ('2', 'c')]),
+            ([('A', 'c'), ('K', 'c')], [('9', 'h'), ('8', 'h'), ('2', 'c')]),
+            ([('4', 'd'), ('4', 's')], [('K', 's'), ('K', 'd'), ('4', 'c')]),
+            ([('6', 'c'), ('5', 'd')], [('K', 's'), ('K', 'd'), ('4', 'c')]),
+        ]
+        indexer = postflop_bucket_table.get_indexer(1)
+        cached  = postflop_bucket_table._tables.get(1)
+
+        with tempfile.TemporaryDirectory() as table_dir:
+            # an empty flop table with just the tested classes filled in by the generator
+            path = postflop_bucket_table.table_path(1, table_dir)
+            with open(path, "wb") as f:
+                f.write(postflop_bucket_table._HEADER.pack(postflop_bucket_table.TABLE_MAGIC,
+                                                           postflop_bucket_table.TABLE_VERSION, 1, 4000, indexer.size))
+                f.truncate(postflop_bucket_table._HEADER.size + indexer.size)
+            for hole, board in spots:
+                index = indexer.index([to_codes(hole), to_codes(board)])
+                postflop_bucket_table._fill_chunk((str(path), 1, index, index + 1, 4000, 0))
+
+            postflop_bucket_table._tables[1] = postflop_bucket_table.load(1, table_dir)
+            try:
+                # lookups agree with the Monte Carlo bucket up to one bucket of sampling noise,
+                # and a suit-swapped copy of a spot reads the same entry
+                random.seed(6)
+                table = [postflop_bucket_table.lookup_bucket(hole, board) for hole, board in spots]
+                mc    = [postflop_equity_bucket(to_codes(hole), to_codes(board), n_simulations=4000) for hole, board in spots]
+                swapped = postflop_bucket_table.lookup_bucket([('A', 'd'), ('A', 's')], [('A', 'h'), ('7', 'c'), ('2', 'd')])
+            finally:
+                postflop_bucket_table._tables[1] = cached
+
+        agree = all(abs(t - m) <= 1 for t, m in zip(table, mc)) and table[0] == mc[0] == 0
+        print(f"TABLE: {table}   MC: {mc}   SUIT SWAP: {swapped == table[0]}")
+        return agree and swapped == table[0]
+
+    def test_compact_game_state(self):
+
+        from bots.cfr_bots.cfr.nlh_gamestate import (NLHChanceNode, StreetChanceNode, SeatMask, NO_SEATS,
+                                                     ActionHistory, EMPTY_HISTORY, FOLD, CALL, RAISE_2)
+
+        random.seed(5)
+        deal  = PreflopAbstraction(n_players=3).sample_deal()
+        deal['board'] = deal['full_deck'][6:11]
+        root  = NLHChanceNode([deal], 200.0, 10.0, 3).play(0)
+
+        # every node class is slotted: no per-instance __dict__, no stray attributes
+        street = root.play(CALL).play(CALL).play("CHECK")
+        nodes  = [root, street, street.sample_one(), root.ctx, EMPTY_HISTORY]
+        slotted = isinstance(street, StreetChanceNode) and all(not hasattr(node, "__dict__") for node in nodes)
+        try:
+            root.scratch = 1
+            slotted = False
+        except AttributeError:
+            pass
+
+        # children share the deal context and their parent's history instead of copying it
+        raised, folded = root.play(RAISE_2), root.play(FOLD)
+        shared = (raised.ctx is root.ctx is folded.ctx and raised.play(CALL).action_history.prev is raised.action_history
+                  and root.play(RAISE_2) is raised and folded.folded == root.folded.with_seat(root.to_move))
+
+        # SeatMask behaves as an immutable set of seats
+        mask  = SeatMask.of([0, 2])
+        wider = mask.with_seat(1)
+        seats = (2 in mask and 1 not in mask and len(mask) == 2 and list(mask) == [0, 2] and not NO_SEATS
+                 and list(wider) == [0, 1, 2] and list(mask) == [0, 2] and mask == 0b101)
+
+        # ActionHistory: oldest first, shared tails, seats / code maintained per push
+        entries = [(0, RAISE_2), (1, CALL), (2, FOLD)]
+        history = ActionHistory.of(entries)
+        branch  = history.prev.push(2, CALL)
+        histories = (list(history) == entries and len(history) == 3 and history[1] == (1, CALL)
+                     and branch.prev is history.prev and history.seats == 0b111
+                     and history.code == ActionHistory.of(entries).code != branch.code and not len(EMPTY_HISTORY))
+
+        print(f"SLOTTED: {slotted}   SHARED CONTEXT/HISTORY: {shared}   SEAT MASK: {seats}   ACTION HISTORY: {histories}")
+        return slotted and shared and seats and histories
+
+    def test_tree_cache(self):
+
+        from bots.cfr_bots.cfr.nlh_gamestate import NLHChanceNode
+
+        random.seed(3)
+        deals = []
+        for _ in range(3):
+            deal = PreflopAbstraction(n_players=2).sample_deal()
+            deal['board'] = deal['full_deck'][4:9]
+            deals.append(deal)
+
+        # info sets, actions, pots and payoffs of the first few actions, through the turn
+        def signature(state, depth=5):
+            if state.is_chance():
+                return signature(state.sample_one(), depth)
+            if state.is_terminal():
+                return [tuple(state.evaluation())]
+            rows = [(state.inf_set(), tuple(state.actions), state.pot)]
+            for action in state.actions if depth else ():
+                rows += signature(state.play(action), depth - 1)
+            return rows
+
+        reference = signature(NLHChanceNode(deals, 200.0, 10.0, 2, tree_cache="none").play(0))
+
+        def replay(policy, capacity=None):
+            root  = NLHChanceNode(deals, 200.0, 10.0, 2, tree_cache=policy, max_cached_deals=capacity)
+            first = root.play(0)
+            root.play(1), root.play(2)
+            return root, first
+
+        # "all" keeps every deal subtree
+        root, first = replay("all")
+        keep_all = root.play(0) is first and root.cache_stats()["size"] == 3 and root.cache_stats()["evictions"] == 0
+
+        # "lru" with room for 2 evicts deal 0, then deal 1 to make room for it again
+        root, first = replay("lru", capacity=2)
+        evicted = root.cache_stats()["evictions"] == 1
+        rebuilt = root.play(0)
+        lru = (evicted and rebuilt is not first and root.cache_stats()["evictions"] == 2
+               and root.cache_stats()["size"] == 2 and signature(rebuilt) == reference)
+
+        # "iteration" keeps subtrees until new_iteration()
+        root, first = replay("iteration")
+        kept = root.play(0) is first
+        root.new_iteration()
+        cleared = root.cache_stats()["size"] == 0
+        rebuilt = root.play(0)
+        iteration = kept and cleared and rebuilt is not first and signature(rebuilt) == reference
+
+        # "none" builds a fresh subtree on every visit
+        root, first = replay("none")
+        none = root.play(0) is not first and root.cache_stats()["size"] == 0 and signature(first) == reference
+
+        errors = 0
+        for policy, capacity in (("lru", None), ("lru", 0), ("sometimes", None)):
+            try:
+                NLHChanceNode(deals, 200.0, 10.0, 2, tree_cache=policy, max_cached_deals=capacity)
+            except ValueError:
+                errors += 1
+
+        print(f"NODES: {len(reference)}   ALL: {keep_all}   LRU: {lru}   ITERATION: {iteration}   NONE: {none}   BAD POLICIES REJECTED: {errors}/3")
+        return keep_all and lru and iteration and none and errors == 3
+
+    def test_inf_set_keys(self):
+
+        from bots.cfr_bots.cfr.nlh_gamestate import (NLHChanceNode, describe_inf_set, inf_set_key_from_str,
+                                                     inf_set_street, STREET_NAMES)
+
+        def keys(state, depth, found):
+            if state.is_chance():
+                return keys(state.sample_one(), depth, found)
+            if state.is_terminal():
+                return found
+            found.add(state.inf_set())
+            for action in state.actions if depth else ():
+                keys(state.play(action), depth - 1, found)
+            return found
+
+        found = set()
+        for n_players in (2, 3):
+            random.seed(n_players)
+            for _ in range(2):
+                deal = PreflopAbstraction(n_players=n_players).sample_deal()
+                deal['board'] = deal['full_deck'][2 * n_players:2 * n_players + 5]
+                keys(NLHChanceNode([deal], 200.0, 10.0, n_players).play(0), 6, found)
+
+        # packed key -> string -> packed key, on every street, with one string per key
+        names      = {key: describe_inf_set(key) for key in found}
+        round_trip = sum(inf_set_key_from_str(name) != key for key, name in names.items())
+        distinct   = len(set(names.values())) == len(found)
+        streets    = {STREET_NAMES[inf_set_street(key)] for key in found}
+        streets_ok = all(STREET_NAMES[inf_set_street(key)] in names[key].split(".") for key in found)
+
+        # string keys as older CFR tables saved them
+        legacy = ["UTG.3.PRE.VS_OPEN.OOP.DEPTH_MID.0R2_1C",
+                  "HJ.11.PRE.UNOPENED.IP.DEPTH_MID.0C_1C",
+                  "BB.0.PRE.VS_3BET.IP.DEPTH_DEEP.0R2_1R4_0AI",
+                  "SB.7.PRE.UNOPENED.OOP.DEPTH_SHORT.",
+                  "UTG1.FLP.4.9.1X_2R2_0R4",
+                  "UTG.TRN.2.3.0R2_1R4",
+                  "UTG.RVR.0.11."]
+        legacy_ok = all(describe_inf_set(inf_set_key_from_str(name)) == name for name in legacy)
+        legacy_ok = legacy_ok and len({inf_set_key_from_str(name) for name in legacy}) == len(legacy)
+
+        print(f"KEYS: {len(found)}   STREETS: {sorted(streets, key=list(STREET_NAMES.values()).index)}   "
+              f"ROUND TRIP FAILURES: {round_trip}   DISTINCT: {distinct}   STREET BITS: {streets_ok}   LEGACY STRINGS: {legacy_ok}")
+        return round_trip == 0 and distinct and streets_ok and legacy_ok and len(streets) >= 3
+
+    def test_regret_tables(self):
+
+        actions = ["FOLD", "CHECK", "CALL", "RAISE_2"]
+        tables = RegretTables(actions, capacity=2)
+
+        # rows grow past the initial capacity and start uniform over their legal actions
+        rows = [tables.row(key, ["FOLD", "CALL", "RAISE_2"]) for key in range(5)]
+        uniform = np.allclose(tables.sigma[rows][:, [0, 2, 3]], 1 / 3) and not tables.legal[rows, 1].any()
+
+        # regret matching: positive regrets normalized, uniform fallback when none are positive;
+        # refresh_dirty only touches rows marked dirty
+        tables.regrets[0, [0, 2, 3]] = [-1.0, 3.0, 1.0]
+        tables.regrets[1, [0, 2, 3]] = [1.0, 0.0, 0.0]
+        tables.dirty.add(0)
+        refreshed = tables.refresh_dirty()
+        matched = (refreshed == 1 and not tables.dirty
+                   and np.allclose(tables.sigma[0, [0, 2, 3]], [0.0, 0.75, 0.25]) and np.allclose(tables.sigma[1, [0, 2, 3]], 1 / 3)
+                   and tables.action_regrets(0, ["RAISE_2", "FOLD"]) == [1.0, -1.0])
+
+        tables.cum_sigma[0, [0, 2, 3]] = [1.0, 1.0, 2.0]
+        tables.compute_average()
+        averaged = tables.row_dict("average", 0) == {"FOLD": 0.25, "CALL": 0.25, "RAISE_2": 0.5}
+
+        # state round trip keeps rows, values and legal masks
+        copy = RegretTables(actions)
+        copy.load_state_dict(tables.state_dict())
+        round_trip = len(copy) == 5 and copy.row(4, ["FOLD"]) == 4 and np.array_equal(copy.sigma[:5], tables.sigma[:5])
+
+        # worker sync: mirror the first rows, then merge deltas back (new keys get new rows, regrets floored once)
+        worker = RegretTables(actions)
+        worker.row("stale", ["FOLD"])
+        worker.sync_keys(0, tables.keys[:3])
+        worker.load_rows(tables.sigma[:3], tables.average[:3], tables.legal[:3])
+        synced = worker.keys == [0, 1, 2] and "stale" not in worker and np.array_equal(worker.sigma[:3], tables.sigma[:3])
+        tables.merge([0, "new"], np.array([[True, False, True, True], [False, True, False, False]]),
+                     np.array([[2.0, 0.0, -5.0, 0.0], [1.0, 0.0, 0.0, 0.0]], np.float32),
+                     np.zeros((2, 4), np.float32))
+        merged = (len(tables) == 6 and tables.row_dict("regrets", 0) == {"FOLD": 1.0, "CALL": 0.0, "RAISE_2": 1.0}
+                  and tables.dirty == {0, 5})
+
+        print(f"UNIFORM START: {uniform}   REGRET MATCHING: {matched}   AVERAGE: {averaged}   ROUND TRIP: {round_trip}   SYNC/MERGE: {synced and merged}")
+        return uniform and matched and averaged and round_trip and synced and merged
+
+    def test_update_rules(self):
+
+        actions = ["FOLD", "CALL", "RAISE_2"]
+        rng = np.random.default_rng(0)
+
+        # lazy per-row catch-up matches discounting every row after every iteration
+        rule = make_update_rule("dcfr")
+        lazy, eager = RegretTables(actions), RegretTables(actions)
+        for key in range(5):
+            lazy.row(key, actions)
+            eager.row(key, actions)
+        for t in range(1, 60):
+            for row in rng.choice(5, 2, replace=False):
+                regret, weight = rng.normal(size=3).astype(np.float32), rng.random(3).astype(np.float32)
+                if lazy.stamp[row] < t - 1:
+                    lazy.discount(row, *rule.factors(lazy.stamp[[row]], t - 1), t - 1)
+                lazy.regrets[row, :3] += regret
+                lazy.cum_sigma[row, :3] += weight
+                eager.regrets[row, :3] += regret
+                eager.cum_sigma[row, :3] += weight
+            eager.discount(np.arange(5), *rule.factors(np.full(5, t - 1), t), t)
+        rows = np.arange(5)
+        lazy.discount(rows, *rule.factors(lazy.stamp[rows], 59), 59)
+        lazy_matches = (np.allclose(lazy.regrets[:5], eager.regrets[:5], atol=1e-5)
+                        and np.allclose(lazy.cum_sigma[:5], eager.cum_sigma[:5], atol=1e-5))
+
+        # alternating regret matching on biased rock-paper-scissors: the discounted
+        # rules end up less exploitable than legacy in the same number of iterations
+        payoff = np.array([[0, -1, 2], [1, 0, -1], [-2, 1, 0]], float)
+
+        def exploitability(name, iterations=300):
+            rule   = make_update_rule(name)
+            tables = RegretTables(actions)
+            for player in (0, 1):
+                tables.row(player, actions)
+            for t in range(1, iterations + 1):
+                for player in (0, 1):
+                    if rule.discounts and tables.stamp[player] < t - 1:
+                        tables.discount(player, *rule.factors(tables.stamp[[player]], t - 1), t - 1)
+                    x, y  = tables.sigma[0, :3].astype(float), tables.sigma[1, :3].astype(float)
+                    utils = payoff @ y if player == 0 else -(x @ payoff)
+                    own   = x if player == 0 else y
+                    tables.regrets[player, :3] += utils - own @ utils
+                    if rule.floor:
+                        tables.regrets[player, :3] = np.maximum(tables.regrets[player, :3], 0.0)
+                    tables.cum_sigma[player, :3] += own
+                    tables.refresh_sigma([player])
+            tables.compute_average()
+            x, y = tables.average[0, :3].astype(float), tables.average[1, :3].astype(float)
+            return (payoff @ y).max() - (x @ payoff).min()
+
+        results = {name: exploitability(name) for name in ("legacy", "cfr+", "linear", "dcfr")}
+        faster  = all(results[name] < results["legacy"] for name in ("cfr+", "linear", "dcfr"))
+
+        print(f"LAZY == EAGER: {lazy_matches}   EXPLOITABILITY @300: "
+              + ", ".join(f"{name}={value:.4f}" for name, value in results.items()))
+        return lazy_matches and faster
+
+    def test_regret_pruning(self):
+
+        actions = ["FOLD", "CALL", "RAISE_2"]
+        rng = np.random.default_rng(0)
+
+        # stale sigma still puts weight on an action whose regret is now negative: never pruned
+        tables = RegretTables(actions)
+        row = tables.row("stale", actions)
+        tables.regrets[row, :3] = [-2.0, 3.0, -1.0]
+        stale = tables.prunable(row, actions, tables.sigma[row, :3].tolist(), 0.0) == [False, False, False]
+        tables.refresh_sigma([row])
+        fresh = tables.prunable(row, actions, tables.sigma[row, :3].tolist(), 0.0) == [True, False, True]
+
+        # small tree (3 actions, depth 3, random leaf utilities and regrets): node values
+        # with pruned children skipped match the full traversal at every threshold
+        tables = RegretTables(actions)
+        leaves = rng.normal(size=27)
+
+        def value(path, threshold):
+            if len(path) == 3:
+                return leaves[int("".join(map(str, path)), 3)]
+            row    = tables.row(tuple(path), actions)
+            probs  = tables.sigma[row, :3].tolist()
+            pruned = tables.prunable(row, actions, probs, threshold) if threshold is not None else [False] * 3
+            return sum(p * value(path + [i], threshold) for i, p in enumerate(probs) if not pruned[i])
+
+        for path in [[], [0], [1], [2]] + [[i, j] for i in range(3) for j in range(3)]:
+            row = tables.row(tuple(path), actions)
+            tables.regrets[row, :3] = rng.normal(size=3)
+        tables.refresh_sigma()
+        skipped = sum(sum(tables.prunable(row, actions, tables.sigma[row, :3].tolist(), 0.0)) for row in range(len(tables)))
+        full    = value([], None)
+        matched = skipped > 0 and all(np.isclose(value([], threshold), full) for threshold in (0.0, -0.5, 1.0))
+
+        # a worker round (rows synced, parent regrets as base, round-local deltas) prunes the
+        # same actions as the serial tables after the same updates, negative thresholds included
+        serial = RegretTables(actions)
+        for key in range(8):
+            serial.row(key, actions)
+        serial.regrets[:8, :3] = rng.normal(size=(8, 3)) * 2
+        serial.refresh_sigma()
+        worker = RegretTables(actions)
+        worker.sync_keys(0, serial.keys)
+        worker.load_rows(serial.sigma[:8], serial.average[:8], serial.legal[:8], serial.regrets[:8])
+        deltas = rng.normal(size=(8, 3)).astype(np.float32)
+        serial.regrets[:8, :3] += deltas
+        worker.regrets[:8, :3] += deltas
+        worker.row("new", actions)
+        decisions = [tables.prunable(row, actions, serial.sigma[row, :3].tolist(), threshold)
+                     for threshold in (0.0, -0.5, -2.0) for row in range(8) for tables in (serial, worker)]
+        same = decisions[0::2] == decisions[1::2] and any(any(d) for d in decisions[0::2])
+        fresh_row = worker.action_regrets(worker.index["new"], actions) == [0.0, 0.0, 0.0]
+
+        print(f"STALE SIGMA KEPT: {stale}   ZERO PROB PRUNED: {fresh}   NODE VALUES MATCH: {matched} ({skipped} prunable)"
+              f"   WORKER == SERIAL: {same and fresh_row}")
+        return stale and fresh and matched and same and fresh_row
+
+    def test_best_response(self):
+
+        from bots.cfr_bots.cfr.best_response import BestResponse
+        from bots.cfr_bots.cfr.nlh_gamestate import NLHChanceNode, NLHMutableState, ALL_ACTIONS, FOLD, CHECK
+
+        random.seed(3)
+        rng = np.random.default_rng(3)
+        abstraction = PreflopAbstraction(n_players=2)
+        deals = []
+        for _ in range(3):
+            deal = abstraction.sample_deal()
+            deal['board'] = deal['full_deck'][4:9]
+            deals.append(deal)
+        root = NLHChanceNode(deals, 200.0, 10.0, 2)
+        br   = BestResponse(root)
+
+        # average strategy per info set from pick(actions), over every node of every deal
+        def strategy(pick):
+            tables = RegretTables(ALL_ACTIONS)
+
+            def walk(state):
+                if state.is_terminal():
+                    return
+                if state.is_chance():
+                    state.deal()
+                    walk(state)
+                    state.undo()
+                    return
+                actions = list(state.actions)
+                row = tables.row(state.inf_set(), actions)
+                tables.average[row, tables.columns(actions)] = pick(actions)
+                for action in actions:
+                    state.apply(action)
+                    walk(state)
+                    state.undo()
+
+            for d in range(len(deals)):
+                walk(NLHMutableState.from_state(root.play(d)))
+            return tables
+
+        # uniform and random strategies: best responses never lose to the policy
+        results = [br.exploitability(RegretTables(ALL_ACTIONS)),
+                   br.exploitability(strategy(lambda actions: rng.random(len(actions))))]
+        bounded = all(r["exploitability"] >= 0 and all(b >= v - 1e-9 for b, v in zip(r["best_response"], r["values"]))
+                      for r in results)
+
+        # hand-checked: everyone folds when they can, else checks / calls.  The small blind
+        # (seat 0 heads-up) folds at once: values [-5, +5].  Best responses: seat 0 raises and
+        # the big blind folds, +10; seat 1 never acts and keeps the small blind, +5.  nash_conv 15.
+        def passive(actions):
+            keep = FOLD if FOLD in actions else CHECK if CHECK in actions else actions[0]
+            return [float(a == keep) for a in actions]
+
+        folds = br.exploitability(strategy(passive))
+        exact = (np.allclose(folds["values"], [-5.0, 5.0]) and np.allclose(folds["best_response"], [10.0, 5.0])
+                 and np.isclose(folds["exploitability"], 7.5))
+
+        print("EXPLOITABILITY: " + ", ".join(f"{r['exploitability']:.2f}" for r in results)
+              + f"   BR >= POLICY: {bounded}   FOLD-ALWAYS GAME: {folds['best_response']} / {folds['values']}")
+        return bounded and exact
+
+    def test_lbr_range_tracking(self):
+
+        import torch
+        torch.manual_seed(0)
+        random.seed(0)
+        rng = np.random.default_rng(0)
+        net = CFRNet(N_FEATURES, N_ACTIONS)
+
+        table = TableState(2, 10, 200)
+        hc = _QuietHandController(table, HandEvaluator())
+        bots = {seat: HybridPokerBot(net, seat, table, GamePhase.PREFLOP) for seat in range(2)}
+        table.players[0].is_bot, table.players[0].bot = True, bots[0]
+
+        # per-holding batch encoding == encode_state with the holding swapped in, and the
+        # tracked range always keeps the bot's real holding (its choice == decide())
+        encoded = tracked = True
+        for hand in range(6):
+            for player in table.players:
+                player.cash, player.playing = 200, True
+            table.dealer_index = hand % 2
+            hc.start_hand()
+            lbr = LBRPlayer(1, rng, n_samples=64)
+            lbr.new_hand(table)
+            while hc.phase not in (GamePhase.SHOWDOWN, GamePhase.GAMEOVER):
+                seat = hc.betting_round.current_index
+                if seat == 1:
+                    name, action = lbr.decide(hc, bots)
+                else:
+                    proxy = bots[0]._state_proxy()
+                    live = [c for c in range(52) if c not in proxy.community_cards]
+                    holdings = np.array([rng.choice(live, 2, replace=False) for _ in range(20)])
+                    buckets = rng.integers(0, 16, size=20)
+                    batch = encode_state_holdings(proxy, holdings, buckets).numpy()
+                    for row, (holding, bucket) in enumerate(zip(holdings, buckets)):
+                        proxy.hole_cards[0], proxy.hands = holding.tolist(), [int(bucket), proxy.hands[1]]
+                        encoded = encoded and np.allclose(encode_state(proxy).numpy(), batch[row])
+
+                    policy = lbr.range_policy(bots[0])
+                    name, action = bots[0].decide()
+                    lbr.observe(0, policy, name)
+                    own = sorted(card.code for card in table.players[0].hand)
+                    row = own[0] * 51 - own[0] * (own[0] - 1) // 2 + own[1] - own[0] - 1
+                    tracked = tracked and lbr.ranges[0][row] > 0
+                hc.apply_action(action)
+                bots[0].notify_action(name)
+
+        # mbb/hand and a 95% interval that shrinks with more hands
+        small, large = summarize([10, -10] * 50, 10), summarize([10, -10] * 5000, 10)
+        summary = small["mbb_per_hand"] == 0 and np.isclose(small["ci95"], 1.96 * small["std"] / 10) and large["ci95"] < small["ci95"]
+
+        print(f"BATCH ENCODING: {encoded}   RANGE KEEPS REAL HAND: {tracked}   MBB/CI: {summary}")
+        return encoded and tracked and summary
+
     def run_hand_evaluator_tests(self):
         print("\033c", end="", flush=True)
         print("- - - - - - - - - - - EVALUATOR TESTS RESULTS - - - - - - - - - - - -\n")
@@ -464,6 +1222,27 @@ class tests:
         print(f"\nTEST QUAD RESULT: {TEST_PASS[self.test_quad()]}\n")
         print(f"\nTEST FULLER HOUSES: {TEST_PASS[self.test_fuller_houses()]}\n")
         print(f"\nTEST FLUSH: {TEST_PASS[self.test_flush()]}\n")
+        print(f"\nTEST LOOKUP MATCHES SUBSETS: {TEST_PASS[self.test_lookup_matches_subsets()]}\n")
+        print(f"\nTEST EVALUATOR BACKENDS AGREE: {TEST_PASS[self.test_evaluator_backends_agree()]}\n")
+        print(f"\nTEST BATCH MATCHES SCALAR: {TEST_PASS[self.test_batch_matches_scalar()]}\n")
+        print(f"\nTEST PREFLOP EQUITY TABLE: {TEST_PASS[self.test_preflop_equity_table()]}\n")
+        print(f"\nTEST HAND INDEXER: {TEST_PASS[self.test_hand_indexer()]}\n")
+        print(f"\nTEST SUIT CANONICALIZER: {TEST_PASS[self.test_suit_canonicalizer()]}\n")
+        print(f"\nTEST EXACT HAND PROBABILITIES: {TEST_PASS[self.test_exact_hand_probabilities()]}\n")
+        print(f"\nTEST BOARD HANDS: {TEST_PASS[self.test_board_hands()]}\n")
+        print(f"\nTEST CARD FLYWEIGHT: {TEST_PASS[self.test_card_flyweight()]}\n")
+        print(f"\nTEST INT CODE DEALS: {TEST_PASS[self.test_int_code_deals()]}\n")
+        print(f"\nTEST BIT DECK: {TEST_PASS[self.test_bit_deck()]}\n")
+        print(f"\nTEST EQUITY CACHE: {TEST_PASS[self.test_equity_cache()]}\n")
+        print(f"\nTEST POSTFLOP BUCKET TABLE: {TEST_PASS[self.test_postflop_bucket_table()]}\n")
+        print(f"\nTEST COMPACT GAME STATE: {TEST_PASS[self.test_compact_game_state()]}\n")
+        print(f"\nTEST TREE CACHE: {TEST_PASS[self.test_tree_cache()]}\n")
+        print(f"\nTEST INF SET KEYS: {TEST_PASS[self.test_inf_set_keys()]}\n")
+        print(f"\nTEST REGRET TABLES: {TEST_PASS[self.test_regret_tables()]}\n")
+        print(f"\nTEST UPDATE RULES: {TEST_PASS[self.test_update_rules()]}\n")
+        print(f"\nTEST REGRET PRUNING: {TEST_PASS[self.test_regret_pruning()]}\n")
+        print(f"\nTEST BEST RESPONSE: {TEST_PASS[self.test_best_response()]}\n")
+        print(f"\nTEST LBR RANGE TRACKING: {TEST_PASS[self.test_lbr_range_tracking()]}\n")
 
         print("- - - - - - - - - - - PREDICTION TESTS RESULTS - - - - - - - - - - - -\n")
         self.test_hand_prediction()